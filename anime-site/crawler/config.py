@@ -19,7 +19,8 @@ CRAWLER_CONFIG = {
     
     # 重试配置
     'MAX_RETRIES': 3,
-    'RETRY_DELAY': 2.0,
+    'RETRY_DELAY': 2.0,  # 指数退避的基准时间，实际等待在 [0, RETRY_DELAY * 2^n] 内随机
+    'RETRY_MAX_DELAY': 30.0,  # 单次退避（包括Retry-After）的上限
     
     # 超时配置
     'REQUEST_TIMEOUT': 10,
@@ -30,13 +31,71 @@ CRAWLER_CONFIG = {
     # 并发限制
     'MAX_CONCURRENT': 5,
     
+    # 限速：每个站点的令牌桶容量（允许的突发请求数），
+    # 速率取 DATA_SOURCES 中的 rate_limit，未配置的站点使用 REQUEST_DELAY
+    'RATE_LIMIT_BURST': 5,
+    
+    # 解析第k集视频地址后，在后台预先解析第k+1~k+n集并写入缓存（0为关闭）
+    'PREFETCH_EPISODES': 3,
+    
+    # HTML解析后端 ('lxml' / 'html.parser' / 'html5lib')，未安装时回退到 html.parser
+    'HTML_PARSER': 'lxml',
+    
+    # 连接池配置（每个主机保持的长连接数）
+    'POOL_CONNECTIONS': 10,
+    'POOL_MAXSIZE': 10,
+    
+    # 异步抓取引擎（需安装 aiohttp 或 httpx，未安装时使用线程池）
+    # 批量请求在一个事件循环中多路复用，在途请求数与连接数上限如下，实际速率仍受站点限速约束
+    'ASYNC_ENGINE': True,
+    'ASYNC_MAX_CONNECTIONS': 100,
+    'ASYNC_MAX_IN_FLIGHT': 200,
+    
+    # 完整目录爬取的解析进程池：进程数（0为CPU核心数），页面数少于PARSE_POOL_MIN_PAGES时在当前进程解析
+    'PARSE_WORKERS': 0,
+    'PARSE_POOL_MIN_PAGES': 20,
+    
+    # 深度爬取每批提交的动漫数（在途详情页请求上限）
+    'DEEP_CRAWL_BATCH': 50,
+    
+    # 本地搜索索引命中少于该条数时仍在线搜索（本地目录可能不完整）
+    'LOCAL_SEARCH_MIN_RESULTS': 5,
+    
     # 缓存配置
     'CACHE_ENABLED': True,
-    'CACHE_TTL': 3600  # 1小时
+    'CACHE_TTL': 3600,  # 1小时
+    'CACHE_TTL_BY_TYPE': {
+        'search': 1800,
+        'episodes': 3600,
+        'video': 3600,
+        'all_anime': 86400
+    },
+    'CACHE_MEMORY_ENTRIES': 256,
+    'CACHE_DISK_ENTRIES': 5000,
+    
+    # 首页快照（最新更新、每周更新）的 stale-while-revalidate 有效期(秒)
+    # 超过软TTL先返回快照再后台刷新，超过硬TTL时等待刷新完成
+    'SNAPSHOT_SOFT_TTL': {
+        'latest': 300,
+        'weekly': 1800
+    },
+    'SNAPSHOT_HARD_TTL': {
+        'latest': 3600,
+        'weekly': 86400
+    },
+    
+    # 常驻模式下定时抓取首页、刷新所有首页快照的间隔(秒)，0为关闭（改为按快照年龄在请求时刷新）
+    'HOME_REFRESH_INTERVAL': 300
 }
 
 # 数据源配置
+# rate_limit: 同一站点两次请求的最小间隔(秒)
 DATA_SOURCES = {
+    'yinghua': {
+        'base_url': 'http://www.iyinghua.com',
+        'enabled': True,
+        'rate_limit': 0.2
+    },
     'yhdm': {
         'base_url': 'https://www.yhdm.tv',
         'enabled': True,
@@ -1,15 +1,125 @@
 import { NextRequest, NextResponse } from 'next/server';
-import { spawn } from 'child_process';
-import path from 'path';
+import { crawlerWorker, CrawlerResult } from '@/lib/crawler-worker';
 
-// 获取特定动漫详情
+// eslint-disable-next-line @typescript-eslint/no-explicit-any
+function formatEpisode(episode: any, animeInfo: CrawlerResult, animeTitle: string) {
+  return {
+    id: episode.episode,
+    title: episode.title,
+    duration: '24分钟',
+    airDate: animeInfo.release_date || `2024年${Math.floor((episode.episode-1) / 4) + 1}月${((episode.episode-1) % 4) * 7 + 1}日`,
+    thumbnail: episode.cover_image || animeInfo.cover_image || `http://www.iyinghua.com/show/${episode.episode}`,
+    description: `${animeTitle} 第${episode.episode}集`,
+    url: episode.url || episode.relative_url,
+    videoUrl: episode.video_url || episode.url || episode.relative_url
+  };
+}
+
+// 格式化数据以匹配前端需求
+function formatAnime(animeId: string, result: CrawlerResult, episodeCount: number) {
+  const animeInfo = result.anime_info || {};
+  return {
+    id: animeId,
+    title: animeInfo.title || result.anime_title || '未知动漫',
+    titleEn: '',
+    episodes: result.total_episodes || episodeCount,
+    coverImage: animeInfo.cover_image || `https://via.placeholder.com/400x600/8B5CF6/FFFFFF?text=${encodeURIComponent(animeInfo.title || result.anime_title || 'Anime')}`,
+    description: animeInfo.description || `${animeInfo.title || result.anime_title}`,
+    fullDescription: animeInfo.description || `${animeInfo.title || result.anime_title}`,
+    type: 'TV动画',
+    year: animeInfo.release_date ? new Date(animeInfo.release_date).getFullYear() : 2024,
+    season: '春季',
+    studio: '未知工作室',
+    genres: animeInfo.genres || ['动画', '冒险', '剧情'],
+    rating: animeInfo.rating || 8.5,
+    duration: '24分钟/集',
+    status: animeInfo.status || '连载中',
+    broadcastDay: '周日',
+    region: animeInfo.region || '日本',
+    tags: animeInfo.tags || []
+  };
+}
+
+// 爬取失败时从目录存储读取上次爬到的数据，转换为episodes爬虫的返回格式
+async function getStoredAnime(animeId: string): Promise<CrawlerResult | null> {
+  try {
+    const stored = await crawlerWorker.run('catalogue', { query: 'series', series_id: animeId }, 5000);
+    if (!stored.success || !stored.data?.episodes?.length) {
+      return null;
+    }
+    const { episodes, ...animeInfo } = stored.data;
+    return { success: true, anime_info: animeInfo, episodes, total_episodes: animeInfo.total_episodes };
+  } catch {
+    return null;
+  }
+}
+
+// 流式响应：每解析完一集输出一行 episode 记录，最后输出一行 anime 汇总记录（不含episodesList）
+function streamAnime(animeId: string): Response {
+  const encoder = new TextEncoder();
+  // 客户端中途断开后不再写入，write在爬虫进程的输出回调中执行，不能抛出异常
+  let closed = false;
+  const stream = new ReadableStream({
+    async start(controller) {
+      const write = (record: Record<string, unknown>) => {
+        if (closed) {
+          return;
+        }
+        try {
+          controller.enqueue(encoder.encode(JSON.stringify(record) + '\n'));
+        } catch {
+          closed = true;
+        }
+      };
+
+      try {
+        const result = await crawlerWorker.run('episodes', { anime_id: animeId }, undefined, (episode) => {
+          write({ type: 'episode', data: formatEpisode(episode, {}, episode.anime_title || '') });
+        });
+        if (result.success) {
+          write({ type: 'anime', success: true, data: formatAnime(animeId, result, result.streamed || 0) });
+        } else {
+          write({ type: 'anime', success: false, error: result.error || 'Failed to fetch anime data', id: animeId });
+        }
+      } catch (error) {
+        write({
+          type: 'anime',
+          success: false,
+          error: 'Python crawler failed',
+          details: error instanceof Error ? error.message : 'Unknown crawler error'
+        });
+      } finally {
+        if (!closed) {
+          closed = true;
+          try {
+            controller.close();
+          } catch {
+            // 客户端已断开
+          }
+        }
+      }
+    },
+    cancel() {
+      closed = true;
+    }
+  });
+
+  return new Response(stream, {
+    headers: {
+      'Content-Type': 'application/x-ndjson; charset=utf-8',
+      'Cache-Control': 'no-store'
+    }
+  });
+}
+
+// 获取特定动漫详情，?stream=1 时以NDJSON逐集返回
 export async function GET(
   request: NextRequest,
   { params }: { params: Promise<{ id: string }> }
-): Promise<NextResponse> {
+): Promise<Response> {
   try {
     const { id: animeId } = await params;
-    
+
     if (!animeId) {
       return NextResponse.json({
         success: false,
@@ -17,109 +127,51 @@ export async function GET(
       }, { status: 400 });
     }
 
-    // 调用Python爬虫脚本获取真实数据
-    const pythonScript = path.join(process.cwd(), 'src', 'app', 'python', 'crawler_episodes.py');
-    
-    return new Promise((resolve) => {
-      const pythonProcess = spawn('python', ['-X', 'utf8', pythonScript, animeId], {
-        cwd: process.cwd(),
-        env: {
-          ...process.env,
-          PYTHONIOENCODING: 'utf-8'
-        }
-      });
+    if (request.nextUrl.searchParams.get('stream') === '1') {
+      return streamAnime(animeId);
+    }
 
-      let output = '';
-      let error = '';
+    // 通过常驻Python爬虫进程获取真实数据
+    let result;
+    try {
+      result = await crawlerWorker.run('episodes', { anime_id: animeId });
+    } catch (crawlerError) {
+      result = await getStoredAnime(animeId);
+      if (!result) {
+        return NextResponse.json({
+          success: false,
+          error: 'Python crawler failed',
+          details: crawlerError instanceof Error ? crawlerError.message : 'Unknown crawler error'
+        }, { status: 500 });
+      }
+    }
 
-      pythonProcess.stdout.on('data', (data) => {
-        output += data.toString('utf8');
-      });
+    if (!result.success) {
+      result = (await getStoredAnime(animeId)) || result;
+    }
 
-      pythonProcess.stderr.on('data', (data) => {
-        error += data.toString('utf8');
-      });
+    if (result.success) {
+      const animeInfo = result.anime_info || {};
+      const episodes = result.episodes || [];
+      const animeTitle = animeInfo.title || result.anime_title;
 
-      pythonProcess.on('close', (code) => {
-        if (code === 0) {
-          try {
-            const result = JSON.parse(output);
-            
-            if (result.success) {
-              // 使用新的数据结构
-            const animeInfo = result.anime_info || {};
-            const episodes = result.episodes || [];
-            
-            // 格式化数据以匹配前端需求
-            const formattedData = {
-                id: animeId,
-                title: animeInfo.title || result.anime_title || '未知动漫',
-                titleEn: '',
-                episodes: result.total_episodes || episodes.length,
-                coverImage: animeInfo.cover_image || `https://via.placeholder.com/400x600/8B5CF6/FFFFFF?text=${encodeURIComponent(animeInfo.title || result.anime_title || 'Anime')}`,
-                description: animeInfo.description || `${animeInfo.title || result.anime_title}`,
-                fullDescription: animeInfo.description || `${animeInfo.title || result.anime_title}`,
-                type: 'TV动画',
-                year: animeInfo.release_date ? new Date(animeInfo.release_date).getFullYear() : 2024,
-                season: '春季',
-                studio: '未知工作室',
-                genres: animeInfo.genres || ['动画', '冒险', '剧情'],
-                rating: animeInfo.rating || 8.5,
-                duration: '24分钟/集',
-                status: animeInfo.status || '连载中',
-                broadcastDay: '周日',
-                region: animeInfo.region || '日本',
-                tags: animeInfo.tags || [],
-                episodesList: episodes.map((episode: any) => ({
-                    id: episode.episode,
-                    title: episode.title,
-                    duration: '24分钟',
-                    airDate: animeInfo.release_date || `2024年${Math.floor((episode.episode-1) / 4) + 1}月${((episode.episode-1) % 4) * 7 + 1}日`,
-                    thumbnail: episode.cover_image || animeInfo.cover_image || `http://www.iyinghua.com/show/${episode.episode}`,
-                    description: `${animeInfo.title || result.anime_title} 第${episode.episode}集`,
-                    url: episode.url || episode.relative_url,
-                    videoUrl: episode.video_url || episode.url || episode.relative_url
-                }))
-            };
-              
-              resolve(NextResponse.json({
-                success: true,
-                data: formattedData
-              }));
-            } else {
-              resolve(NextResponse.json({
-                success: false,
-                error: result.error || 'Failed to fetch anime data',
-                id: animeId
-              }, { status: 404 }));
-            }
-          } catch (parseError) {
-            resolve(NextResponse.json({
-              success: false,
-              error: 'Failed to parse crawler response',
-              details: parseError instanceof Error ? parseError.message : 'Unknown parse error',
-              rawOutput: output,
-              errorLog: error
-            }, { status: 500 }));
-          }
-        } else {
-          resolve(NextResponse.json({
-            success: false,
-            error: 'Python crawler failed',
-            details: error || `Process exited with code ${code}`,
-            rawOutput: output
-          }, { status: 500 }));
-        }
-      });
+      const formattedData = {
+        ...formatAnime(animeId, result, episodes.length),
+        // eslint-disable-next-line @typescript-eslint/no-explicit-any
+        episodesList: episodes.map((episode: any) => formatEpisode(episode, animeInfo, animeTitle))
+      };
 
-      pythonProcess.on('error', (err) => {
-        resolve(NextResponse.json({
-          success: false,
-          error: 'Failed to spawn Python process',
-          details: err.message
-        }, { status: 500 }));
+      return NextResponse.json({
+        success: true,
+        data: formattedData
       });
-    });
+    }
+
+    return NextResponse.json({
+      success: false,
+      error: result.error || 'Failed to fetch anime data',
+      id: animeId
+    }, { status: 404 });
 
   } catch (error) {
     return NextResponse.json({
@@ -128,4 +180,4 @@ export async function GET(
       details: error instanceof Error ? error.message : 'Unknown error'
     }, { status: 500 });
   }
-}
\ No newline at end of file
+}
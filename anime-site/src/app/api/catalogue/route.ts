@@ -0,0 +1,37 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { crawlerWorker } from '@/lib/crawler-worker';
+
+// 查询目录存储（不发起爬取）
+// ?id=6594          按ID查询动漫及分集
+// ?q=标题           按标题查询
+// ?view=latest      最近一次最新更新列表
+// ?view=weekly      每周更新表
+export async function GET(request: NextRequest): Promise<NextResponse> {
+  const { searchParams } = request.nextUrl;
+  const id = searchParams.get('id');
+  const q = searchParams.get('q');
+  const view = searchParams.get('view');
+  const limit = parseInt(searchParams.get('limit') || '20');
+
+  let params: Record<string, unknown>;
+  if (id) {
+    params = { query: 'series', series_id: id };
+  } else if (q) {
+    params = { query: 'search', title: q, limit };
+  } else if (view === 'latest' || view === 'weekly') {
+    params = { query: view, limit };
+  } else {
+    return NextResponse.json({ success: false, error: '缺少id、q或view参数' }, { status: 400 });
+  }
+
+  try {
+    const result = await crawlerWorker.run('catalogue', params, 5000);
+    return NextResponse.json(result, { status: result.success ? 200 : 404 });
+  } catch (error) {
+    return NextResponse.json({
+      success: false,
+      error: '查询目录存储失败',
+      details: error instanceof Error ? error.message : 'Unknown error'
+    }, { status: 500 });
+  }
+}
@@ -1,7 +1,7 @@
 import { NextRequest, NextResponse } from 'next/server';
-import { spawn } from 'child_process';
 import { promises as fs } from 'fs';
 import path from 'path';
+import { crawlerWorker } from '@/lib/crawler-worker';
 
 // 定义响应类型
 interface LatestUpdateItem {
@@ -63,92 +63,55 @@ function getMockLatestUpdates(): LatestUpdateItem[] {
   ];
 }
 
-// 调用Python爬虫获取最新更新
-async function getRealLatestUpdates(limit: number = 50): Promise<LatestUpdateItem[]> {
-  return new Promise((resolve, reject) => {
-    const pythonPath = path.join(process.cwd(), 'src', 'app', 'python', 'crawler_manager.py');
-    const pythonExecutable = process.platform === 'win32' ? 'python' : 'python3';
-    
-    const pythonProcess = spawn(pythonExecutable, [pythonPath, 'latest', limit.toString()], {
-      cwd: path.join(process.cwd(), 'src', 'app', 'python'),
-      env: { ...process.env, PYTHONIOENCODING: 'utf-8' }
-    });
-
-    let stdout = '';
-    let stderr = '';
-
-    pythonProcess.stdout.on('data', (data) => {
-      stdout += data.toString();
-    });
-
-    pythonProcess.stderr.on('data', (data) => {
-      stderr += data.toString();
-    });
-
-    pythonProcess.on('close', (code) => {
-      if (code !== 0) {
-        console.error('Python爬虫执行错误:', stderr);
-        // 如果爬虫失败，使用模拟数据作为回退
-        console.log('使用模拟数据作为回退');
-        resolve(getMockLatestUpdates());
-        return;
-      }
-
-      try {
-        // 清理输出，只提取JSON部分
-        const lines = stdout.trim().split('\n');
-        let jsonStr = '';
-        let jsonStarted = false;
-        
-        for (const line of lines) {
-          if (line.trim().startsWith('{') || line.trim().startsWith('[')) {
-            jsonStarted = true;
-          }
-          if (jsonStarted) {
-            jsonStr += line;
-          }
-        }
-        
-        if (!jsonStr) {
-          jsonStr = stdout.trim();
-        }
-
-        const result = JSON.parse(jsonStr);
-        if (result.success && result.data) {
-          // 转换数据格式以匹配接口定义
-          const formattedData = result.data.map((item: any) => ({
-            title: item.title || '未知标题',
-            cover_image: item.cover_image || '',
-            detail_url: item.detail_url || '',
-            episode_info: item.episode_info || '',
-            anime_type: item.anime_type || '',
-            current_episode: item.current_episode || 1
-          }));
-          resolve(formattedData);
-        } else {
-          console.log('爬虫返回格式错误，使用模拟数据');
-          resolve(getMockLatestUpdates());
-        }
-      } catch (error) {
-        console.error('解析爬虫数据失败:', error);
-        console.log('使用模拟数据作为回退');
-        resolve(getMockLatestUpdates());
-      }
-    });
+// 读取目录存储中最近一次成功爬取的最新更新，存储为空时返回空数组
+async function getStoredLatestUpdates(limit: number): Promise<LatestUpdateItem[]> {
+  try {
+    const result = await crawlerWorker.run('catalogue', { query: 'latest', limit }, 5000);
+    if (!result.success || !Array.isArray(result.data)) {
+      return [];
+    }
+    // eslint-disable-next-line @typescript-eslint/no-explicit-any
+    return result.data.map((item: any) => ({
+      title: item.title,
+      cover_image: item.cover_image || '',
+      detail_url: item.detail_url || '',
+      episode_info: item.episode_info || ''
+    }));
+  } catch {
+    return [];
+  }
+}
 
-    pythonProcess.on('error', (error) => {
-      console.error('启动Python进程失败:', error);
-      console.log('使用模拟数据作为回退');
-      resolve(getMockLatestUpdates());
-    });
+// 调用常驻Python爬虫进程获取最新更新，失败时依次回退到目录存储和模拟数据
+// Python侧按快照年龄返回：未过软TTL直接返回快照，过软TTL返回快照并后台刷新，过硬TTL才等待源站
+// refresh=true 时跳过快照强制爬取
+async function getRealLatestUpdates(limit: number = 50, refresh = false): Promise<LatestUpdateItem[]> {
+  try {
+    const result = await crawlerWorker.run('latest', { limit, refresh }, 15000);
+    if (result.success && result.data) {
+      // 转换数据格式以匹配接口定义
+      return result.data.map((item: any) => ({
+        title: item.title || '未知标题',
+        cover_image: item.cover_image || '',
+        detail_url: item.detail_url || '',
+        episode_info: item.episode_info || '',
+        anime_type: item.anime_type || '',
+        current_episode: item.current_episode || 1
+      }));
+    }
+    console.log('爬虫返回格式错误，尝试目录存储');
+  } catch (error) {
+    console.error('Python爬虫执行错误:', error);
+  }
 
-    // 设置超时
-    setTimeout(() => {
-      pythonProcess.kill();
-      console.log('Python爬虫超时，使用模拟数据');
-      resolve(getMockLatestUpdates());
-    }, 15000);
-  });
+  const stored = await getStoredLatestUpdates(limit);
+  if (stored.length > 0) {
+    console.log(`使用目录存储中的 ${stored.length} 条最新更新`);
+    return stored;
+  }
+  // 目录存储为空时使用模拟数据作为回退
+  console.log('使用模拟数据作为回退');
+  return getMockLatestUpdates();
 }
 
 // 保存数据到JSON文件
@@ -258,7 +221,7 @@ export async function POST(request: NextRequest): Promise<NextResponse> {
     if (useRealData) {
       try {
         console.log('正在调用Python爬虫获取最新更新...');
-        data = await getRealLatestUpdates(limit);
+        data = await getRealLatestUpdates(limit, true);
         console.log(`成功获取 ${data.length} 条最新更新数据`);
         
         // 保存到文件
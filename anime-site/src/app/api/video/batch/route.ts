@@ -0,0 +1,99 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { crawlerWorker, CrawlerResult } from '@/lib/crawler-worker';
+import { buildPlayUrl } from '@/lib/video-url';
+
+// 批量解析整部动漫的视频地址
+// 请求体: { urls: string[] } 或 { animeId: string, start: number, end: number }
+// 响应为NDJSON流：每解析完一集立即输出一行 episode 记录，最后输出一行 summary 记录
+
+interface BatchRequest {
+  urls?: string[];
+  animeId?: string;
+  start?: number;
+  end?: number;
+}
+
+const BATCH_TIMEOUT = 120000;
+
+function toEpisodeRecord(item: CrawlerResult) {
+  const pageUrl: string = item.page_url;
+  if (!item.success) {
+    return { type: 'episode', success: false, pageUrl, error: item.error || '获取视频URL失败' };
+  }
+  const { videoUrl, episode } = buildPlayUrl(item.url, pageUrl);
+  return { type: 'episode', success: true, pageUrl, episode, videoUrl };
+}
+
+export async function POST(request: NextRequest): Promise<Response> {
+  let body: BatchRequest;
+  try {
+    body = await request.json();
+  } catch {
+    return NextResponse.json({ success: false, error: '请求格式错误' }, { status: 400 });
+  }
+
+  const params: Record<string, unknown> = body.urls
+    ? { urls: body.urls }
+    : { anime_id: body.animeId, start: body.start ?? 1, end: body.end ?? body.start ?? 1 };
+
+  if (!body.urls && !body.animeId) {
+    return NextResponse.json({ success: false, error: '缺少urls或animeId参数' }, { status: 400 });
+  }
+
+  const encoder = new TextEncoder();
+  // 客户端中途断开后不再写入，write在爬虫进程的输出回调中执行，不能抛出异常
+  let closed = false;
+  const stream = new ReadableStream({
+    async start(controller) {
+      const write = (record: Record<string, unknown>) => {
+        if (closed) {
+          return;
+        }
+        try {
+          controller.enqueue(encoder.encode(JSON.stringify(record) + '\n'));
+        } catch {
+          closed = true;
+        }
+      };
+
+      try {
+        const result = await crawlerWorker.run('video_batch', params, BATCH_TIMEOUT, (item) => {
+          write(toEpisodeRecord(item));
+        });
+        write({
+          type: 'summary',
+          success: Boolean(result.success),
+          total: result.total ?? 0,
+          failed: result.failed ?? 0,
+          cached: result.cached ?? 0,
+          error: result.error
+        });
+      } catch (error) {
+        write({
+          type: 'summary',
+          success: false,
+          error: error instanceof Error ? error.message : '批量解析失败'
+        });
+      } finally {
+        if (!closed) {
+          closed = true;
+          try {
+            controller.close();
+          } catch {
+            // 客户端已断开
+          }
+        }
+      }
+    },
+    cancel() {
+      closed = true;
+    }
+  });
+
+  return new Response(stream, {
+    headers: {
+      'Content-Type': 'application/x-ndjson; charset=utf-8',
+      'Cache-Control': 'no-store'
+    }
+  });
+}
@@ -1,6 +1,6 @@
 import { NextRequest, NextResponse } from 'next/server';
-import { spawn } from 'child_process';
-import path from 'path';
+import { crawlerWorker } from '@/lib/crawler-worker';
+import { buildPlayUrl } from '@/lib/video-url';
 
 interface PlayRequest {
   url: string;
@@ -39,54 +39,14 @@ export async function GET(request: NextRequest): Promise<NextResponse> {
   }
 
   try {
-    // 调用Python爬虫脚本
-    const pythonScript = path.join(process.cwd(), 'src', 'app', 'python', 'crawler_video.py');
-    
-    const result = await new Promise<string>((resolve, reject) => {
-      const pythonProcess = spawn('python', [pythonScript, url], {
-        stdio: ['pipe', 'pipe', 'pipe'],
-        env: {
-          ...process.env,
-          PYTHONIOENCODING: 'utf-8'
-        }
-      });
-
-      let output = '';
-      let error = '';
-
-      pythonProcess.stdout.on('data', (data) => {
-        output += data.toString();
-      });
-
-      pythonProcess.stderr.on('data', (data) => {
-        error += data.toString();
-      });
-
-      pythonProcess.on('close', (code) => {
-        if (code !== 0) {
-          reject(new Error(error || 'Python脚本执行失败'));
-        } else {
-          resolve(output.trim());
-        }
-      });
-
-      pythonProcess.on('error', (err) => {
-        reject(err);
-      });
-    });
-
-    // 解析Python脚本的输出
-    const data = JSON.parse(result);
-    
-    // 从URL中提取集数信息
-    const episodeMatch = url.match(/\/v\/(\d+)-(\d+)\.html/);
-    let episodeNum = episodeMatch ? parseInt(episodeMatch[2]) : 1;
-    
-    // 格式化为两位数，如01, 02, 12等
-    const formattedEpisode = episodeNum.toString().padStart(2, '0');
+    // 通过常驻Python爬虫进程解析视频地址
+    const data = await crawlerWorker.run('video', { url });
+    if (!data.success) {
+      throw new Error(data.error || '获取视频URL失败');
+    }
     
-    // 拼接最终的视频URL
-    const videoUrl = `https://tup.iyinghua.com/?vid=${data.url}/第${formattedEpisode}集/index.m3u8$mp4`;
+    // 拼接最终的视频URL，集数取自页面URL
+    const { videoUrl, episode: formattedEpisode } = buildPlayUrl(data.url, url);
     
     return NextResponse.json<PlayResponse>({
       success: true,
@@ -0,0 +1,38 @@
+import { NextResponse } from 'next/server';
+import path from 'path';
+import { crawlerWorker } from '@/lib/crawler-worker';
+import { readSnapshot } from '@/lib/snapshot';
+
+// 每周更新表（首页侧边栏 .tlist）
+// Python侧按快照年龄返回 data/crawler_daily_update.json：未过软TTL直接返回，过软TTL返回快照并后台刷新，
+// 过硬TTL才等待源站；爬虫进程不可用时直接读取快照文件
+interface WeeklyUpdatesSnapshot {
+  updated_at: string;
+  source_url: string;
+  weekly_updates: Record<string, { name: string; url: string; episode: string }[]>;
+}
+
+export async function GET(): Promise<NextResponse> {
+  try {
+    const result = await crawlerWorker.run('weekly', {}, 30000);
+    if (result.success) {
+      return NextResponse.json({
+        updated_at: result.updated_at,
+        source_url: result.source_url,
+        weekly_updates: result.data,
+        cache_status: result.cache_status
+      }, {
+        headers: { 'Cache-Control': 'public, s-maxage=300, stale-while-revalidate=1800' }
+      });
+    }
+    console.error('获取每周更新失败:', result.error);
+  } catch (error) {
+    console.error('Python爬虫执行错误:', error);
+  }
+
+  const snapshot = readSnapshot<WeeklyUpdatesSnapshot>(path.join(process.cwd(), 'data', 'crawler_daily_update.json'));
+  if (snapshot) {
+    return NextResponse.json({ ...snapshot, cache_status: 'stale' });
+  }
+  return NextResponse.json({ success: false, error: '暂无每周更新数据' }, { status: 503 });
+}
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+樱花动漫异步抓取引擎
+后台线程中运行一个常驻事件循环，所有爬虫的批量页面请求（分集视频地址、批量视频解析、
+完整目录的详情页）都提交到这一个循环，由异步HTTP客户端多路复用，
+不再为每次批量抓取创建 MAX_CONCURRENT 个线程。
+页面解析仍使用各爬虫原有的同步解析函数，在解析线程池（传入解析进程池时在进程池）中执行；
+结果回调（缓存、目录存储写入、流式输出）在每次批量抓取专用的回调线程中按完成顺序执行，
+事件循环只负责I/O，不会被解析和磁盘写入阻塞。
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from async_http_client import BACKEND, AsyncHttpClient
+from http_client import CRAWLER_CONFIG
+from parse_pool import ParsePool
+
+# (解析结果, 异常)，二者有且只有一个不为None
+FetchOutcome = Tuple[Optional[Any], Optional[BaseException]]
+
+def async_engine_enabled() -> bool:
+    """配置开启且安装了 aiohttp/httpx 时使用异步引擎"""
+    return bool(CRAWLER_CONFIG['ASYNC_ENGINE']) and BACKEND is not None
+
+class AsyncCrawlerEngine:
+    """在后台事件循环中并发抓取页面"""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._client: Optional[AsyncHttpClient] = None
+        self._parse_executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=loop.run_forever, name='async-crawler', daemon=True)
+                self._thread.start()
+                self._loop = loop
+                self._parse_executor = ThreadPoolExecutor(
+                    max_workers=CRAWLER_CONFIG['MAX_CONCURRENT'], thread_name_prefix='async-parse'
+                )
+            return self._loop
+
+    def run(self, coro):
+        """在引擎的事件循环中运行协程并等待结果（不能在事件循环线程内调用）"""
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError('不能在异步引擎的事件循环线程中同步等待')
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result()
+
+    def _get_client(self) -> AsyncHttpClient:
+        # 只在事件循环线程中调用，客户端绑定该循环
+        if self._client is None:
+            self._client = AsyncHttpClient()
+        return self._client
+
+    async def _fetch(self, url: str, parse: Callable[[str, str], Any], headers: Optional[Dict],
+                     timeout: Optional[float], retries: Optional[int], parse_pool: Optional[ParsePool]) -> Any:
+        response = await self._get_client().get(url, headers=headers, timeout=timeout, retries=retries)
+        response.raise_for_status()
+        if parse_pool is not None:
+            # 直接传原始字节，解码也放到解析进程中
+            return await parse_pool.parse_async(parse, url, response.content)
+        return await asyncio.get_running_loop().run_in_executor(self._parse_executor, parse, url, response.text)
+
+    async def _fetch_all(self, urls: List[str], parse: Callable[[str, str], Any],
+                         on_result: Optional[Callable[[int, Any, Optional[BaseException]], None]],
+                         headers: Optional[Dict], timeout: Optional[float], retries: Optional[int],
+                         parse_pool: Optional[ParsePool]) -> List[FetchOutcome]:
+        outcomes: List[FetchOutcome] = [(None, None)] * len(urls)
+        loop = asyncio.get_running_loop()
+        # 单个回调线程：同一批的回调仍然串行执行，调用方无需额外加锁
+        callbacks = ThreadPoolExecutor(max_workers=1, thread_name_prefix='async-callback') if on_result else None
+
+        async def fetch_one(index: int, url: str):
+            try:
+                outcome = (await self._fetch(url, parse, headers, timeout, retries, parse_pool), None)
+            except Exception as e:
+                outcome = (None, e)
+            outcomes[index] = outcome
+            if callbacks is not None:
+                await loop.run_in_executor(callbacks, on_result, index, *outcome)
+
+        try:
+            await asyncio.gather(*(fetch_one(index, url) for index, url in enumerate(urls)))
+        finally:
+            if callbacks is not None:
+                callbacks.shutdown(wait=False)
+        return outcomes
+
+    def fetch_all(self, urls: List[str], parse: Callable[[str, str], Any],
+                  on_result: Optional[Callable[[int, Any, Optional[BaseException]], None]] = None,
+                  headers: Optional[Dict] = None, timeout: Optional[float] = None,
+                  retries: Optional[int] = None, parse_pool: Optional[ParsePool] = None) -> List[FetchOutcome]:
+        """并发请求所有URL并用 parse(url, html) 解析
+
+        Args:
+            urls: 页面URL列表
+            parse: 解析函数，在解析线程池中执行
+            on_result: 可选回调 on_result(下标, 解析结果, 异常)，按完成顺序在本批专用的回调线程中串行调用
+            headers: 额外请求头
+            timeout: 单次请求超时(秒)
+            retries: 单个URL最多重试次数，默认 MAX_RETRIES
+            parse_pool: 可选解析进程池，parse须为模块级函数并接受字节形式的html
+
+        Returns:
+            与urls顺序一致的 [(解析结果, 异常)]
+        """
+        if not urls:
+            return []
+        return self.run(self._fetch_all(urls, parse, on_result, headers, timeout, retries, parse_pool))
+
+    def close(self):
+        """关闭连接池并停止事件循环"""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        if self._client is not None:
+            asyncio.run_coroutine_threadsafe(self._client.close(), loop).result()
+            self._client = None
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join()
+        loop.close()
+        if self._parse_executor is not None:
+            self._parse_executor.shutdown(wait=True)
+            self._parse_executor = None
+
+_engine: Optional[AsyncCrawlerEngine] = None
+_engine_lock = threading.Lock()
+
+def get_engine() -> AsyncCrawlerEngine:
+    """获取进程内共享的异步抓取引擎"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = AsyncCrawlerEngine()
+    return _engine
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+樱花动漫爬虫异步HTTP客户端
+基于 aiohttp（优先）或 httpx 的连接池，在一个事件循环中同时保持大量请求在途，
+限速和重试规则与同步的 HttpClient 相同，并与其共享按站点的令牌桶。
+两者都未安装时 BACKEND 为 None，调用方继续使用线程池 + 同步客户端
+"""
+
+import asyncio
+from typing import Dict, Optional
+
+import requests
+
+from http_client import ACCEPT_ENCODING, CRAWLER_CONFIG, OVERLOAD_STATUSES, RETRY_STATUSES, get_client
+from rate_limiter import backoff_delay, parse_retry_after
+
+# aiohttp / httpx 为可选依赖
+try:
+    import aiohttp
+    BACKEND = 'aiohttp'
+except ImportError:
+    aiohttp = None
+    try:
+        import httpx
+        BACKEND = 'httpx'
+    except ImportError:
+        httpx = None
+        BACKEND = None
+
+class AsyncResponse:
+    """异步请求的响应（正文已读取完毕，连接已归还连接池）"""
+
+    def __init__(self, url: str, status_code: int, headers: Dict[str, str], content: bytes):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+
+    def raise_for_status(self):
+        """与 requests 保持一致，4xx/5xx 抛出 requests.HTTPError"""
+        if self.status_code >= 400:
+            raise requests.HTTPError(f'{self.status_code} Error for url: {self.url}')
+
+class AsyncHttpClient:
+    """带连接池、按站点限速和自动重试的异步HTTP客户端（只能在创建它的事件循环中使用）"""
+
+    def __init__(self, config: Optional[Dict] = None):
+        if BACKEND is None:
+            raise RuntimeError('异步HTTP客户端需要安装 aiohttp 或 httpx')
+        self.config = config or CRAWLER_CONFIG
+        self.timeout = self.config['REQUEST_TIMEOUT']
+        # 与同步客户端共享令牌桶，两种客户端同时工作时对源站的总速率仍受限
+        self.rate_limiter = get_client().rate_limiter
+        self.default_headers = {
+            'User-Agent': self.config['USER_AGENT'],
+            'Accept-Encoding': ACCEPT_ENCODING,
+            'Connection': 'keep-alive',
+        }
+        self._in_flight = asyncio.Semaphore(self.config['ASYNC_MAX_IN_FLIGHT'])
+
+        max_connections = self.config['ASYNC_MAX_CONNECTIONS']
+        if BACKEND == 'aiohttp':
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=max_connections),
+                headers=self.default_headers,
+            )
+        else:
+            self._session = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+                headers=self.default_headers,
+            )
+
+    async def _acquire(self, url: str):
+        """非阻塞地等待站点令牌"""
+        while True:
+            wait = self.rate_limiter.try_acquire(url)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def _retry_delay(self, attempt: int, response: Optional[AsyncResponse] = None) -> float:
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                return min(retry_after, self.config['RETRY_MAX_DELAY'])
+        return backoff_delay(attempt, self.config['RETRY_DELAY'], self.config['RETRY_MAX_DELAY'])
+
+    async def _send(self, url: str, headers: Optional[Dict], timeout: float) -> AsyncResponse:
+        """发送一次请求并读取正文，超时统一抛出 asyncio.TimeoutError，连接错误抛出 ConnectionError"""
+        if BACKEND == 'aiohttp':
+            try:
+                async with self._session.get(
+                    url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)
+                ) as response:
+                    content = await response.read()
+                    return AsyncResponse(url, response.status, dict(response.headers), content)
+            except aiohttp.ClientConnectionError as e:
+                if isinstance(e, aiohttp.ServerTimeoutError):
+                    raise asyncio.TimeoutError(str(e))
+                raise ConnectionError(str(e))
+
+        try:
+            response = await self._session.get(url, headers=headers, timeout=timeout)
+        except httpx.TimeoutException as e:
+            raise asyncio.TimeoutError(str(e))
+        except httpx.TransportError as e:
+            raise ConnectionError(str(e))
+        return AsyncResponse(url, response.status_code, dict(response.headers), response.content)
+
+    async def get(self, url: str, headers: Optional[Dict] = None, timeout: Optional[float] = None,
+                  retries: Optional[int] = None) -> AsyncResponse:
+        """发送GET请求，重试规则同 HttpClient.get：429/503让整个站点降速暂停，超时等其余错误只让当前请求等待"""
+        timeout = timeout if timeout is not None else self.timeout
+        max_retries = self.config['MAX_RETRIES'] if retries is None else retries
+
+        async with self._in_flight:
+            for attempt in range(max_retries + 1):
+                await self._acquire(url)
+                try:
+                    response = await self._send(url, headers, timeout)
+                except asyncio.TimeoutError as e:
+                    if attempt == max_retries:
+                        raise requests.Timeout(str(e) or f'请求超时: {url}')
+                    await asyncio.sleep(self._retry_delay(attempt))
+                    continue
+                except ConnectionError as e:
+                    if attempt == max_retries:
+                        raise requests.ConnectionError(str(e))
+                    await asyncio.sleep(self._retry_delay(attempt))
+                    continue
+
+                if response.status_code not in RETRY_STATUSES:
+                    self.rate_limiter.succeeded(url)
+                    return response
+                if attempt == max_retries:
+                    return response
+
+                delay = self._retry_delay(attempt, response)
+                if response.status_code in OVERLOAD_STATUSES:
+                    self.rate_limiter.throttled(url, delay)
+                else:
+                    await asyncio.sleep(delay)
+
+        return response
+
+    async def close(self):
+        if BACKEND == 'aiohttp':
+            await self._session.close()
+        else:
+            await self._session.aclose()
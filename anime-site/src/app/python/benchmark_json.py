@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON序列化后端基准测试
+以完整动漫列表（all_anime）的响应为负载，比较各个可用后端的序列化/反序列化耗时和输出大小，
+基线为原先命令行使用的 json.dumps(..., ensure_ascii=False, indent=2)
+
+负载来源（按优先级）：
+    data/all_anime_catalogue.json（catalogue_sync 生成的完整目录）
+    old-python/ALL.html 解析结果
+
+用法:
+    python benchmark_json.py
+    python benchmark_json.py --rounds 50 --scale 10   # 负载条目复制10倍，模拟更大的目录
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+from typing import Callable, Dict
+
+import json_codec
+from crawler_all_anime import AllAnimeCrawler
+from crawler_catalogue import CATALOGUE_PATH
+from snapshot import read_snapshot
+
+PYTHON_DIR = os.path.dirname(os.path.abspath(__file__))
+ALL_HTML_PATH = os.path.join(PYTHON_DIR, '..', '..', '..', '..', 'old-python', 'ALL.html')
+
+def load_payload(scale: int) -> Dict:
+    """构造与 get_all_anime 相同结构的响应"""
+    catalogue = read_snapshot(CATALOGUE_PATH)
+    if catalogue and catalogue.get('data'):
+        data, source = catalogue['data'], CATALOGUE_PATH
+    else:
+        with open(ALL_HTML_PATH, 'r', encoding='utf-8') as f:
+            data, source = AllAnimeCrawler()._parse_all_anime(f.read(), 0), ALL_HTML_PATH
+    print(f"负载来源: {os.path.normpath(source)}  条目数: {len(data)} x {scale}")
+
+    data = data * scale
+    return {
+        'success': True,
+        'total_count': len(data),
+        'data': data,
+        'timestamp': datetime.now().isoformat()
+    }
+
+def timed(func: Callable[[], object], rounds: int) -> float:
+    """平均耗时(ms)"""
+    func()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) * 1000 / rounds
+
+def run_benchmark(payload: Dict, rounds: int) -> Dict[str, Dict]:
+    results = {}
+    baseline_text = json.dumps(payload, ensure_ascii=False, indent=2)
+    results['json indent=2'] = {
+        'dumps_ms': timed(lambda: json.dumps(payload, ensure_ascii=False, indent=2), rounds),
+        'loads_ms': timed(lambda: json.loads(baseline_text), rounds),
+        'bytes': len(baseline_text.encode('utf-8')),
+    }
+
+    original_backend = json_codec.get_backend()
+    try:
+        for backend in json_codec.BACKENDS:
+            json_codec.set_backend(backend)
+            encoded = json_codec.dumps_bytes(payload)
+            if json_codec.loads(encoded) != payload:
+                raise AssertionError(f'{backend} 往返结果与原数据不一致')
+            results[f'{backend} compact'] = {
+                'dumps_ms': timed(lambda: json_codec.dumps(payload), rounds),
+                'loads_ms': timed(lambda: json_codec.loads(encoded), rounds),
+                'bytes': len(encoded),
+            }
+    finally:
+        json_codec.set_backend(original_backend)
+    return results
+
+def print_report(results: Dict[str, Dict]):
+    baseline = results['json indent=2']
+    print(f"{'方式':<18}{'序列化(ms)':>12}{'反序列化(ms)':>14}{'大小(KB)':>12}{'序列化加速':>12}")
+    for name, stats in results.items():
+        speedup = baseline['dumps_ms'] / stats['dumps_ms'] if stats['dumps_ms'] else float('inf')
+        print(f"{name:<18}{stats['dumps_ms']:>12.2f}{stats['loads_ms']:>14.2f}"
+              f"{stats['bytes'] / 1024:>12.1f}{speedup:>11.1f}x")
+    print(f"\n当前默认后端: {json_codec.get_backend()}")
+
+def main():
+    parser = argparse.ArgumentParser(description='JSON序列化后端基准测试')
+    parser.add_argument('--rounds', type=int, default=20, help='每种方式的重复次数')
+    parser.add_argument('--scale', type=int, default=1, help='负载条目复制倍数')
+    args = parser.parse_args()
+
+    payload = load_payload(max(1, args.scale))
+    print(f"可用后端: {', '.join(json_codec.BACKENDS)}\n")
+    print_report(run_benchmark(payload, args.rounds))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTML解析后端基准测试
+对每种页面的样本文件，分别用各个可用后端执行"解析+提取"，
+比较耗时、峰值内存(tracemalloc，仅统计Python侧分配)以及输出是否与 html.parser 一致
+
+用法:
+    python benchmark_parsers.py                 # 使用仓库中已保存的样本页面
+    python benchmark_parsers.py --fetch         # 先从源站下载各类页面到 fixtures/ 再测试
+    python benchmark_parsers.py --rounds 20
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import html_parser
+from crawler_all_anime import AllAnimeCrawler
+from crawler_daily_update import DailyUpdateCrawler
+from crawler_episodes import EpisodesCrawler
+from crawler_latest import LatestCrawler
+from crawler_search import SearchCrawler
+from crawler_video import parse_video_base_url
+from http_client import get_client
+
+PYTHON_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.join(PYTHON_DIR, '..', '..', '..', '..')
+FIXTURES_DIR = os.path.join(PYTHON_DIR, 'fixtures')
+
+# 仓库中已保存的样本页面
+SAVED_FIXTURES = {
+    'all_anime': os.path.join(REPO_ROOT, 'old-python', 'ALL.html'),
+    'search': os.path.join(REPO_ROOT, '搜索动漫列表', '搜索.html'),
+    'episodes': os.path.join(REPO_ROOT, 'yhdmlist.html'),
+}
+
+# --fetch 时下载的页面
+FETCH_URLS = {
+    'latest': 'http://www.iyinghua.com/',
+    'daily_update': 'http://www.iyinghua.com/',
+    'all_anime': 'http://m.iyinghua.com/all/',
+    'search': 'http://www.iyinghua.com/search/%E5%8F%B2%E8%8E%B1%E5%A7%86/',
+    'episodes': 'http://www.iyinghua.com/show/6594.html',
+    'video': 'http://www.iyinghua.com/v/6594-1.html',
+}
+
+def _extract_episodes_page(html: str):
+    return EpisodesCrawler()._parse_detail_page(html)
+
+def _extract_search_page(html: str):
+    results = SearchCrawler()._parse_search_results(html, 'benchmark', 50)
+    # 搜索时间每次都不同，比较前去掉
+    for item in results:
+        item.pop('search_time', None)
+    return results
+
+def _extract_daily_page(html: str):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return DailyUpdateCrawler().parse_daily_updates(html)
+
+# 页面类型 -> 解析+提取函数
+EXTRACTORS: Dict[str, Callable[[str], object]] = {
+    'latest': lambda html: LatestCrawler()._parse_latest_updates(html, 50),
+    'daily_update': _extract_daily_page,
+    'all_anime': lambda html: AllAnimeCrawler()._parse_all_anime(html, 0),
+    'search': _extract_search_page,
+    'episodes': _extract_episodes_page,
+    'video': parse_video_base_url,
+}
+
+def fetch_fixtures(fixtures_dir: str):
+    """从源站下载各类页面作为样本"""
+    os.makedirs(fixtures_dir, exist_ok=True)
+    client = get_client()
+    for page_type, url in FETCH_URLS.items():
+        try:
+            response = client.get(url)
+            response.raise_for_status()
+            response.encoding = 'utf-8'
+        except Exception as e:
+            print(f"下载 {page_type} 样本失败: {e}")
+            continue
+        with open(os.path.join(fixtures_dir, f'{page_type}.html'), 'w', encoding='utf-8') as f:
+            f.write(response.text)
+        print(f"已保存 {page_type} 样本: {url}")
+
+def load_fixtures(fixtures_dir: str) -> Dict[str, str]:
+    """读取样本页面，fixtures/ 中下载的样本优先于仓库中保存的样本"""
+    fixtures = {}
+    for page_type in EXTRACTORS:
+        candidates = [os.path.join(fixtures_dir, f'{page_type}.html')]
+        if page_type in SAVED_FIXTURES:
+            candidates.append(SAVED_FIXTURES[page_type])
+        for path in candidates:
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    fixtures[page_type] = f.read()
+                break
+    return fixtures
+
+def measure(extractor: Callable[[str], object], html: str, rounds: int) -> Dict:
+    """测量平均耗时和峰值内存"""
+    output = extractor(html)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        extractor(html)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / rounds
+
+    tracemalloc.start()
+    extractor(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'ms': elapsed_ms, 'peak_kb': peak / 1024, 'output': output}
+
+def run_benchmark(fixtures: Dict[str, str], backends: List[str], rounds: int) -> Dict[str, Dict[str, Dict]]:
+    """对每种页面、每个后端执行测试"""
+    results = {}
+    original_backend = html_parser.get_backend()
+    try:
+        for page_type, html in fixtures.items():
+            results[page_type] = {}
+            for backend in backends:
+                html_parser.set_backend(backend)
+                results[page_type][backend] = measure(EXTRACTORS[page_type], html, rounds)
+    finally:
+        html_parser.set_backend(original_backend)
+    return results
+
+def print_report(results: Dict[str, Dict[str, Dict]], backends: List[str]):
+    """输出对比表格并给出推荐后端"""
+    baseline = html_parser.FALLBACK_BACKEND
+    identical_everywhere = {backend: True for backend in backends}
+    total_ms = {backend: 0.0 for backend in backends}
+
+    print(f"{'页面':<14}{'后端':<14}{'耗时(ms)':>10}{'峰值内存(KB)':>14}  与{baseline}一致")
+    for page_type, by_backend in results.items():
+        expected = by_backend[baseline]['output']
+        for backend in backends:
+            stats = by_backend[backend]
+            identical = stats['output'] == expected
+            identical_everywhere[backend] &= identical
+            total_ms[backend] += stats['ms']
+            print(f"{page_type:<14}{backend:<14}{stats['ms']:>10.2f}{stats['peak_kb']:>14.1f}  {'是' if identical else '否'}")
+
+    candidates = [backend for backend in backends if identical_everywhere[backend]]
+    fastest = min(candidates, key=lambda backend: total_ms[backend])
+    print(f"\n推荐后端: {fastest} (所有样本输出一致且总耗时最短 {total_ms[fastest]:.2f}ms)")
+
+def main():
+    parser = argparse.ArgumentParser(description='HTML解析后端基准测试')
+    parser.add_argument('--fetch', action='store_true', help='先从源站下载样本页面')
+    parser.add_argument('--fixtures-dir', default=FIXTURES_DIR, help='样本页面目录')
+    parser.add_argument('--rounds', type=int, default=10, help='每个后端的重复次数')
+    args = parser.parse_args()
+
+    if args.fetch:
+        fetch_fixtures(args.fixtures_dir)
+
+    fixtures = load_fixtures(args.fixtures_dir)
+    if not fixtures:
+        print("没有可用的样本页面，请使用 --fetch 下载")
+        sys.exit(1)
+
+    backends = html_parser.available_backends()
+    print(f"可用后端: {', '.join(backends)}  样本: {', '.join(fixtures)}\n")
+    print_report(run_benchmark(fixtures, backends, args.rounds), backends)
+
+if __name__ == "__main__":
+    main()
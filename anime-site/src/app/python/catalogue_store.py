@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+樱花动漫目录存储
+所有爬虫的结果统一写入一个带索引的SQLite库（data/catalogue.db）：
+  series          动漫（按ID主键，标题有索引）
+  episodes        分集
+  video_urls      播放页 -> 视频地址
+  weekly_schedule 每周更新表
+  crawl_runs      每次爬取的记录
+写入均为upsert，部分来源缺少的字段不会覆盖已有值；API按ID或标题查询时走索引，不再整文件读取JSON
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'data', 'catalogue.db')
+
+SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS series ('
+    'id TEXT PRIMARY KEY, title TEXT NOT NULL, detail_url TEXT, cover_image TEXT, description TEXT, '
+    'episode_info TEXT, category TEXT, status TEXT, region TEXT, release_date TEXT, rating REAL, '
+    'genres TEXT, tags TEXT, total_episodes INTEGER, latest_rank INTEGER, updated_at TEXT)',
+    'CREATE INDEX IF NOT EXISTS idx_series_title ON series(title)',
+    'CREATE INDEX IF NOT EXISTS idx_series_latest ON series(latest_rank)',
+    'CREATE TABLE IF NOT EXISTS episodes ('
+    'series_id TEXT NOT NULL, episode INTEGER NOT NULL, title TEXT, url TEXT, updated_at TEXT, '
+    'PRIMARY KEY (series_id, episode))',
+    'CREATE TABLE IF NOT EXISTS video_urls ('
+    'page_url TEXT PRIMARY KEY, series_id TEXT, episode INTEGER, video_url TEXT, resolved_at TEXT)',
+    'CREATE INDEX IF NOT EXISTS idx_video_urls_series ON video_urls(series_id, episode)',
+    'CREATE TABLE IF NOT EXISTS weekly_schedule ('
+    'weekday TEXT NOT NULL, position INTEGER NOT NULL, series_id TEXT, title TEXT, url TEXT, '
+    'episode_info TEXT, updated_at TEXT, PRIMARY KEY (weekday, position))',
+    'CREATE TABLE IF NOT EXISTS crawl_runs ('
+    'id INTEGER PRIMARY KEY AUTOINCREMENT, crawler_type TEXT, params TEXT, success INTEGER, '
+    'item_count INTEGER, error TEXT, started_at TEXT, duration_ms INTEGER)',
+    'CREATE INDEX IF NOT EXISTS idx_crawl_runs_type ON crawl_runs(crawler_type, started_at)',
+]
+
+SERIES_COLUMNS = (
+    'title', 'detail_url', 'cover_image', 'description', 'episode_info', 'category', 'status',
+    'region', 'release_date', 'rating', 'genres', 'tags', 'total_episodes'
+)
+
+# 以列表形式保存为JSON文本的列
+JSON_COLUMNS = ('genres', 'tags')
+
+WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+
+def series_id_from_url(url: str) -> Optional[str]:
+    """从详情页或播放页URL中取动漫ID（/show/6594.html 或 /v/6594-1.html）"""
+    match = re.search(r'/(?:show|v)/(\d+)', urlsplit(url or '').path)
+    return match.group(1) if match else None
+
+def episode_from_url(url: str) -> Optional[int]:
+    """从播放页URL中取集数"""
+    match = re.search(r'/v/\d+-(\d+)\.html', url or '')
+    return int(match.group(1)) if match else None
+
+class CatalogueStore:
+    """动漫目录SQLite存储"""
+
+    def __init__(self, db_path: Optional[str] = DEFAULT_DB_PATH):
+        """
+        Args:
+            db_path: SQLite文件路径，传入 ':memory:' 使用内存库
+        """
+        self._lock = threading.Lock()
+        self._db = None
+        # 本进程内动漫表的写入次数（其他进程的写入由 PRAGMA data_version 反映）
+        self._series_writes = 0
+        try:
+            if db_path != ':memory:':
+                os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.row_factory = sqlite3.Row
+            for statement in SCHEMA:
+                self._db.execute(statement)
+            self._db.commit()
+        except (OSError, sqlite3.Error) as e:
+            # 存储不可用时爬虫照常工作，只是不落库
+            print(f"目录存储不可用: {e}")
+            self._db = None
+
+    @property
+    def available(self) -> bool:
+        return self._db is not None
+
+    @property
+    def series_version(self):
+        """动漫表版本，变化时依赖动漫表的索引需要重建"""
+        rows = self._read('PRAGMA data_version')
+        return (rows[0][0] if rows else None, self._series_writes)
+
+    def _write_series(self, statements) -> bool:
+        if not self._write(statements):
+            return False
+        self._series_writes += 1
+        return True
+
+    def _write(self, statements):
+        """在一个事务中执行 [(sql, params), ...]，失败时回滚"""
+        if self._db is None:
+            return False
+        with self._lock:
+            try:
+                with self._db:
+                    for sql, params in statements:
+                        self._db.execute(sql, params)
+                return True
+            except sqlite3.Error as e:
+                print(f"写入目录存储失败: {e}")
+                return False
+
+    def _read(self, sql: str, params=()) -> List[sqlite3.Row]:
+        if self._db is None:
+            return []
+        with self._lock:
+            try:
+                return self._db.execute(sql, params).fetchall()
+            except sqlite3.Error:
+                return []
+
+    # ---------- 写入 ----------
+
+    @staticmethod
+    def _series_upsert(series_id: str, fields: Dict, now: str):
+        """生成动漫upsert语句，值为None的字段保留已有值"""
+        values = {column: fields.get(column) for column in SERIES_COLUMNS}
+        for column in JSON_COLUMNS:
+            if values[column] is not None:
+                values[column] = json.dumps(values[column], ensure_ascii=False)
+        columns = ', '.join(SERIES_COLUMNS)
+        placeholders = ', '.join('?' for _ in SERIES_COLUMNS)
+        updates = ', '.join(f'{column} = COALESCE(excluded.{column}, series.{column})' for column in SERIES_COLUMNS)
+        sql = (
+            f'INSERT INTO series (id, {columns}, updated_at) VALUES (?, {placeholders}, ?) '
+            f'ON CONFLICT(id) DO UPDATE SET {updates}, updated_at = excluded.updated_at'
+        )
+        return sql, (series_id, *values.values(), now)
+
+    def upsert_series(self, items: List[Dict]) -> int:
+        """批量写入动漫基本信息，返回写入条数（无法识别ID或缺少标题的条目跳过）"""
+        now = datetime.now().isoformat()
+        statements = []
+        for item in items:
+            series_id = item.get('id') or series_id_from_url(item.get('detail_url', ''))
+            if series_id and item.get('title'):
+                statements.append(self._series_upsert(series_id, item, now))
+        return len(statements) if statements and self._write_series(statements) else 0
+
+    def record_latest(self, updates: List[Dict]) -> int:
+        """写入最新更新列表，latest_rank记录本次列表中的顺序，返回实际写入的条数（无法识别ID或缺少标题的跳过）"""
+        now = datetime.now().isoformat()
+        statements = [('UPDATE series SET latest_rank = NULL WHERE latest_rank IS NOT NULL', ())]
+        count = 0
+        for rank, update in enumerate(updates, 1):
+            series_id = series_id_from_url(update.get('detail_url', ''))
+            if not series_id or not update.get('title'):
+                continue
+            count += 1
+            episode_info = update.get('episode_info')
+            if not episode_info and update.get('current_episode'):
+                episode_info = f"第{update['current_episode']}集"
+            statements.append(self._series_upsert(series_id, {
+                'title': update['title'],
+                'detail_url': update.get('detail_url'),
+                'cover_image': update.get('cover_image') or None,
+                'episode_info': episode_info,
+            }, now))
+            statements.append(('UPDATE series SET latest_rank = ? WHERE id = ?', (rank, series_id)))
+        return count if self._write_series(statements) else 0
+
+    def record_series_detail(self, anime_url: str, anime_info: Dict, episodes: List[Dict]) -> bool:
+        """写入详情页：动漫信息、分集以及分集已解析的视频地址"""
+        return self.record_series_details([(anime_url, anime_info, episodes)]) > 0
+
+    def record_series_details(self, details: List[tuple]) -> int:
+        """在一个事务中批量写入详情页 [(anime_url, anime_info, episodes), ...]，返回写入的动漫数
+        整批只使动漫表版本变化一次，搜索索引按批重建而不是每部动漫重建一次
+        """
+        now = datetime.now().isoformat()
+        statements = []
+        count = 0
+        for anime_url, anime_info, episodes in details:
+            series_statements = self._series_detail_statements(anime_url, anime_info, episodes, now)
+            if series_statements:
+                statements.extend(series_statements)
+                count += 1
+        return count if statements and self._write_series(statements) else 0
+
+    def _series_detail_statements(self, anime_url: str, anime_info: Dict, episodes: List[Dict], now: str) -> List:
+        series_id = series_id_from_url(anime_url)
+        if not series_id or not anime_info.get('title'):
+            return []
+
+        statements = [self._series_upsert(series_id, {
+            **anime_info,
+            'detail_url': anime_url,
+            'total_episodes': len(episodes),
+        }, now)]
+        for episode in episodes:
+            statements.append((
+                'INSERT INTO episodes (series_id, episode, title, url, updated_at) VALUES (?, ?, ?, ?, ?) '
+                'ON CONFLICT(series_id, episode) DO UPDATE SET '
+                'title = excluded.title, url = excluded.url, updated_at = excluded.updated_at',
+                (series_id, episode['episode'], episode.get('title'), episode.get('url'), now)
+            ))
+            # 解析失败时video_url回退为页面地址，不写入
+            video_url = episode.get('video_url')
+            if video_url and video_url != episode.get('url') and not episode.get('video_error'):
+                statements.append(self._video_upsert(episode['url'], video_url, now))
+        return statements
+
+    @staticmethod
+    def _video_upsert(page_url: str, video_url: str, now: str):
+        return (
+            'INSERT INTO video_urls (page_url, series_id, episode, video_url, resolved_at) VALUES (?, ?, ?, ?, ?) '
+            'ON CONFLICT(page_url) DO UPDATE SET video_url = excluded.video_url, resolved_at = excluded.resolved_at',
+            (page_url, series_id_from_url(page_url), episode_from_url(page_url), video_url, now)
+        )
+
+    def record_videos(self, results: List[Dict]) -> int:
+        """写入视频地址解析结果（crawler_video.get_video_url 的返回值）"""
+        now = datetime.now().isoformat()
+        statements = [
+            self._video_upsert(result['page_url'], result['url'], now)
+            for result in results if result.get('success') and result.get('url')
+        ]
+        return len(statements) if statements and self._write(statements) else 0
+
+    def replace_weekly_schedule(self, weekly_updates: Dict[str, List[Dict]]) -> bool:
+        """整体替换每周更新表（每日更新爬虫的 weekly_updates）"""
+        now = datetime.now().isoformat()
+        statements = [('DELETE FROM weekly_schedule', ())]
+        for weekday, animes in weekly_updates.items():
+            for position, anime in enumerate(animes):
+                statements.append((
+                    'INSERT INTO weekly_schedule (weekday, position, series_id, title, url, episode_info, updated_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (weekday, position, series_id_from_url(anime.get('url', '')), anime.get('name'),
+                     anime.get('url'), anime.get('episode'), now)
+                ))
+        return self._write(statements)
+
+    def ingest(self, crawler_type: str, params: Dict, result: Dict) -> int:
+        """按爬虫类型把成功的结果写入对应的表，返回写入的条目数"""
+        if not result.get('success'):
+            return 0
+        if crawler_type == 'latest':
+            return self.record_latest(result.get('data') or [])
+        if crawler_type == 'search':
+            return self.upsert_series([
+                {**item, 'episode_info': item.get('episodes'), 'genres': item.get('genres') or None}
+                for item in result.get('data') or []
+            ])
+        if crawler_type == 'all_anime':
+            return self.upsert_series(result.get('data') or [])
+        if crawler_type == 'catalogue_sync':
+            return self.upsert_series(result.get('added', []) + result.get('changed', []))
+        if crawler_type == 'episodes':
+            episodes = result.get('episodes') or []
+            return len(episodes) if self.record_series_detail(params.get('url', ''), result.get('anime_info') or {}, episodes) else 0
+        if crawler_type == 'video':
+            return self.record_videos([result])
+        # video_batch 在逐集解析完成时已经写入
+        return 0
+
+    def record_run(self, crawler_type: str, params: Dict, result: Dict, started_at: str, duration_ms: int):
+        """记录一次爬取"""
+        item_count = result.get('total_count', result.get('total_episodes', result.get('total')))
+        self._write([(
+            'INSERT INTO crawl_runs (crawler_type, params, success, item_count, error, started_at, duration_ms) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (crawler_type, json.dumps(params, ensure_ascii=False), int(bool(result.get('success'))),
+             item_count, result.get('error'), started_at, duration_ms)
+        )])
+
+    # ---------- 查询 ----------
+
+    @staticmethod
+    def _series_dict(row: sqlite3.Row) -> Dict:
+        series = dict(row)
+        for column in JSON_COLUMNS:
+            series[column] = json.loads(series[column]) if series[column] else []
+        return series
+
+    def get_series(self, series_id: str) -> Optional[Dict]:
+        """按ID查询动漫及其分集（附带已解析的视频地址）"""
+        rows = self._read('SELECT * FROM series WHERE id = ?', (series_id,))
+        if not rows:
+            return None
+        series = self._series_dict(rows[0])
+        series['episodes'] = [dict(row) for row in self._read(
+            'SELECT e.episode, e.title, e.url, v.video_url, v.resolved_at FROM episodes e '
+            'LEFT JOIN video_urls v ON v.page_url = e.url '
+            'WHERE e.series_id = ? ORDER BY e.episode', (series_id,)
+        )]
+        return series
+
+    def find_series(self, title: str, limit: int = 20) -> List[Dict]:
+        """按标题查询：完全匹配和前缀匹配走标题索引，不足时再做包含匹配"""
+        title = (title or '').strip()
+        if not title:
+            return []
+        # 前缀匹配用范围条件，SQLite才能使用 idx_series_title
+        rows = self._read(
+            'SELECT * FROM series WHERE title >= ? AND title < ? ORDER BY title = ? DESC, title LIMIT ?',
+            (title, title + '\U0010ffff', title, limit)
+        )
+        if len(rows) < limit:
+            seen = {row['id'] for row in rows}
+            escaped = title.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            rows += [row for row in self._read(
+                "SELECT * FROM series WHERE title LIKE ? ESCAPE '\\' LIMIT ?",
+                (f'%{escaped}%', limit + len(seen))
+            ) if row['id'] not in seen][:limit - len(rows)]
+        return [self._series_dict(row) for row in rows]
+
+    def all_series(self) -> List[Dict]:
+        """全部动漫（不含分集）"""
+        return [self._series_dict(row) for row in self._read('SELECT * FROM series')]
+
+    def latest(self, limit: int = 50) -> List[Dict]:
+        """最近一次最新更新列表"""
+        rows = self._read(
+            'SELECT * FROM series WHERE latest_rank IS NOT NULL ORDER BY latest_rank LIMIT ?', (limit,)
+        )
+        return [self._series_dict(row) for row in rows]
+
+    def weekly_schedule(self) -> Dict[str, List[Dict]]:
+        """每周更新表，格式与每日更新爬虫的 weekly_updates 相同"""
+        schedule = {}
+        rows = self._read('SELECT * FROM weekly_schedule ORDER BY weekday, position')
+        for row in rows:
+            schedule.setdefault(row['weekday'], []).append({
+                'name': row['title'],
+                'url': row['url'],
+                'episode': row['episode_info'],
+                'series_id': row['series_id'],
+            })
+        return {day: schedule[day] for day in sorted(schedule, key=lambda d: WEEKDAYS.index(d) if d in WEEKDAYS else 99)}
+
+    def recent_runs(self, crawler_type: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """最近的爬取记录"""
+        if crawler_type:
+            rows = self._read(
+                'SELECT * FROM crawl_runs WHERE crawler_type = ? ORDER BY id DESC LIMIT ?', (crawler_type, limit)
+            )
+        else:
+            rows = self._read('SELECT * FROM crawl_runs ORDER BY id DESC LIMIT ?', (limit,))
+        return [dict(row) for row in rows]
+
+_store: Optional[CatalogueStore] = None
+_store_lock = threading.Lock()
+
+def get_store() -> CatalogueStore:
+    """获取进程内共享的目录存储"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = CatalogueStore()
+    return _store
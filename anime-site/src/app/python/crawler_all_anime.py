@@ -6,13 +6,18 @@
 """
 
 import requests
-from bs4 import BeautifulSoup
-import json
 import time
 from urllib.parse import urljoin
 from typing import List, Dict
 from datetime import datetime
 
+from http_client import get_client
+from html_parser import make_soup, TagStrainer
+from json_codec import print_json
+
+# 列表页只需要构建各分类的 mlist 区域
+MLIST_STRAINER = TagStrainer(classes=('mlist',))
+
 class AllAnimeCrawler:
     """完整动漫列表爬虫"""
     
@@ -24,6 +29,7 @@ class AllAnimeCrawler:
             'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
             'Connection': 'keep-alive',
         }
+        self.client = get_client()
     
     def crawl_all_anime(self, delay: float = 0.1) -> List[Dict]:
         """爬取所有分类的动漫列表
@@ -37,7 +43,7 @@ class AllAnimeCrawler:
         url = f"{self.base_url}/all/"
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=15)
+            response = self.client.get(url, headers=self.headers)
             response.encoding = 'utf-8'
             
             if response.status_code != 200:
@@ -50,7 +56,7 @@ class AllAnimeCrawler:
     
     def _parse_all_anime(self, html_content: str, delay: float) -> List[Dict]:
         """解析所有动漫数据"""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = make_soup(html_content, parse_only=MLIST_STRAINER)
         all_anime_data = []
         
         # 查找所有分类
@@ -154,4 +160,4 @@ def get_all_anime(delay: float = 0.1) -> Dict:
 if __name__ == "__main__":
     # 测试函数
     result = get_all_anime(delay=0.05)
-    print(json.dumps(result, ensure_ascii=False, indent=2))
\ No newline at end of file
+    print_json(result)
\ No newline at end of file
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+樱花动漫爬虫结果缓存
+内存LRU + SQLite磁盘两级缓存，按爬虫类型设置TTL，超出容量时淘汰最久未访问的条目
+"""
+
+import copy
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from http_client import CRAWLER_CONFIG
+import json_codec
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'data', 'crawler_cache.db')
+
+def normalize_url(url: str) -> str:
+    """标准化URL，使同一页面的不同写法得到相同的缓存键"""
+    url = (url or '').strip()
+    if not url:
+        return ''
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', parts.query, ''))
+
+class CrawlerCache:
+    """爬虫结果两级缓存"""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, config: Optional[Dict] = None):
+        """
+        Args:
+            db_path: SQLite缓存文件路径，传入None则只使用内存缓存
+            config: 爬虫配置，默认使用 CRAWLER_CONFIG
+        """
+        config = config or CRAWLER_CONFIG
+        self.enabled = config['CACHE_ENABLED']
+        self.default_ttl = config['CACHE_TTL']
+        self.ttl_by_type = config['CACHE_TTL_BY_TYPE']
+        self.max_memory_entries = config['CACHE_MEMORY_ENTRIES']
+        self.max_disk_entries = config['CACHE_DISK_ENTRIES']
+
+        self._memory: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+
+        if self.enabled and db_path:
+            try:
+                os.makedirs(os.path.dirname(db_path), exist_ok=True)
+                self._db = sqlite3.connect(db_path, check_same_thread=False)
+                self._db.execute(
+                    'CREATE TABLE IF NOT EXISTS cache ('
+                    'key TEXT PRIMARY KEY, crawler_type TEXT, value TEXT, '
+                    'expires_at REAL, accessed_at REAL)'
+                )
+                self._db.execute('CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache(accessed_at)')
+                self._db.commit()
+            except (OSError, sqlite3.Error):
+                # 磁盘不可写时退化为纯内存缓存
+                self._db = None
+
+    def ttl_for(self, crawler_type: str) -> float:
+        """获取指定爬虫类型的缓存有效期(秒)"""
+        return self.ttl_by_type.get(crawler_type, self.default_ttl)
+
+    @staticmethod
+    def make_key(crawler_type: str, params: Dict[str, Any]) -> str:
+        """根据爬虫类型和标准化参数生成缓存键"""
+        return crawler_type + ':' + json.dumps(params, ensure_ascii=False, sort_keys=True)
+
+    def get(self, crawler_type: str, params: Dict[str, Any]) -> Optional[Dict]:
+        """读取缓存，未命中或已过期返回None"""
+        if not self.enabled:
+            return None
+
+        key = self.make_key(crawler_type, params)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    return copy.deepcopy(value)
+                del self._memory[key]
+
+            if self._db is None:
+                return None
+
+            try:
+                row = self._db.execute(
+                    'SELECT value, expires_at FROM cache WHERE key = ?', (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                if row[1] <= now:
+                    self._db.execute('DELETE FROM cache WHERE key = ?', (key,))
+                    self._db.commit()
+                    return None
+                self._db.execute('UPDATE cache SET accessed_at = ? WHERE key = ?', (now, key))
+                self._db.commit()
+                value = json_codec.loads(row[0])
+            except (sqlite3.Error, ValueError):
+                return None
+
+            # 磁盘命中后提升到内存
+            self._remember(key, row[1], value)
+            return copy.deepcopy(value)
+
+    def set(self, crawler_type: str, params: Dict[str, Any], value: Dict):
+        """写入缓存"""
+        if not self.enabled:
+            return
+
+        ttl = self.ttl_for(crawler_type)
+        if ttl <= 0:
+            return
+
+        key = self.make_key(crawler_type, params)
+        now = time.time()
+        expires_at = now + ttl
+        value = copy.deepcopy(value)
+
+        with self._lock:
+            self._remember(key, expires_at, value)
+
+            if self._db is None:
+                return
+
+            try:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO cache (key, crawler_type, value, expires_at, accessed_at) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (key, crawler_type, json_codec.dumps(value), expires_at, now)
+                )
+                self._db.execute('DELETE FROM cache WHERE expires_at <= ?', (now,))
+                self._db.execute(
+                    'DELETE FROM cache WHERE key IN ('
+                    'SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)',
+                    (self.max_disk_entries,)
+                )
+                self._db.commit()
+            except sqlite3.Error:
+                pass
+
+    def clear(self):
+        """清空所有缓存"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                try:
+                    self._db.execute('DELETE FROM cache')
+                    self._db.commit()
+                except sqlite3.Error:
+                    pass
+
+    def _remember(self, key: str, expires_at: float, value: Dict):
+        """写入内存LRU，超出容量时淘汰最久未访问的条目（调用方需持有锁）"""
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+樱花动漫完整动漫列表增量同步
+与上次保存的目录按 detail_url 对比，只输出新增/变化/删除的条目，
+并且只为新增和变化的动漫请求详情页，使每晚刷新的开销与变化量成正比而不是目录大小
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from crawler_all_anime import AllAnimeCrawler
+from crawler_episodes import EpisodesCrawler
+from http_client import CRAWLER_CONFIG
+from async_crawler import async_engine_enabled, get_engine
+from parse_pool import get_parse_pool, parse_detail_summary
+from json_codec import print_json
+from snapshot import read_snapshot, write_snapshot
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'data')
+CATALOGUE_PATH = os.path.join(DATA_DIR, 'all_anime_catalogue.json')
+DETAILS_PATH = os.path.join(DATA_DIR, 'all_anime_details.json')
+
+# 用于判断条目是否变化的字段（full_text包含序号，排序变化时会误判，不参与比较）
+CATALOGUE_FIELDS = ('title', 'episode_info', 'episode_url', 'category')
+
+DETAIL_BASE_URL = "http://www.iyinghua.com"
+
+def diff_catalogue(previous: List[Dict], current: List[Dict]) -> Dict[str, List[Dict]]:
+    """按 detail_url 对比新旧目录
+
+    Returns:
+        {'added': [...], 'changed': [...], 'removed': [...], 'unchanged': [...]}
+        changed中的条目附带 'previous' 字段记录变化前的值
+    """
+    previous_by_url = {anime['detail_url']: anime for anime in previous if anime.get('detail_url')}
+    current_by_url = {anime['detail_url']: anime for anime in current if anime.get('detail_url')}
+
+    added, changed, unchanged = [], [], []
+    for url, anime in current_by_url.items():
+        old = previous_by_url.get(url)
+        if old is None:
+            added.append(anime)
+        elif any(old.get(field) != anime.get(field) for field in CATALOGUE_FIELDS):
+            changed.append({
+                **anime,
+                'previous': {field: old.get(field) for field in CATALOGUE_FIELDS}
+            })
+        else:
+            unchanged.append(anime)
+
+    removed = [anime for url, anime in previous_by_url.items() if url not in current_by_url]
+
+    return {'added': added, 'changed': changed, 'removed': removed, 'unchanged': unchanged}
+
+def _load_json(path: str, default):
+    return read_snapshot(path, default)
+
+def _save_json(path: str, data):
+    write_snapshot(path, data)
+
+def _detail_page_url(detail_url: str) -> str:
+    """目录中的移动版链接转换为桌面版详情页（分集爬虫按桌面版结构解析）"""
+    return DETAIL_BASE_URL + urlsplit(detail_url).path
+
+def fetch_details(animes: List[Dict], max_workers: Optional[int] = None,
+                  on_detail: Optional[Callable[[Dict, Dict], None]] = None) -> Dict[str, Dict]:
+    """并发请求动漫详情页，返回 {detail_url: 详情}，失败的条目带 'error' 字段
+
+    页面较多时解析交给解析进程池，请求和解析分别由I/O和各个CPU核心并行处理。
+    on_detail(动漫, 详情) 在每部动漫完成时立即回调（按完成顺序）
+    """
+    crawler = EpisodesCrawler()
+    max_workers = max_workers or CRAWLER_CONFIG['MAX_CONCURRENT']
+    parse_pool = get_parse_pool(len(animes))
+
+    def record(anime: Dict, summary: Optional[Dict], error: Optional[BaseException]) -> Dict:
+        if error is not None:
+            return {'error': str(error), 'updated_at': datetime.now().isoformat()}
+        episodes = summary['episodes']
+        return {
+            'title': summary['title'] if episodes else anime.get('title', ''),
+            'cover_image': summary['cover_image'] if episodes else '',
+            'total_episodes': len(episodes),
+            'episodes': episodes,
+            'updated_at': datetime.now().isoformat()
+        }
+
+    def fetch(anime: Dict) -> Dict:
+        url = _detail_page_url(anime['detail_url'])
+        try:
+            response = crawler.client.get(url, headers=crawler.headers)
+            response.raise_for_status()
+            if parse_pool is not None:
+                summary = parse_pool.parse(parse_detail_summary, url, response.content)
+            else:
+                summary = parse_detail_summary(url, response.content)
+        except Exception as e:
+            return record(anime, None, e)
+        return record(anime, summary, None)
+
+    if not animes:
+        return {}
+
+    details = {}
+
+    def finish(anime: Dict, detail: Dict):
+        details[anime['detail_url']] = detail
+        if on_detail:
+            on_detail(anime, detail)
+
+    if async_engine_enabled():
+        # 所有详情页在异步引擎中同时请求
+        get_engine().fetch_all(
+            [_detail_page_url(anime['detail_url']) for anime in animes],
+            parse_detail_summary, headers=crawler.headers, parse_pool=parse_pool,
+            on_result=lambda index, summary, error: finish(animes[index], record(animes[index], summary, error))
+        )
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(animes))) as executor:
+            futures = {executor.submit(fetch, anime): anime for anime in animes}
+            for future in as_completed(futures):
+                finish(futures[future], future.result())
+
+    # 与输入顺序一致
+    return {anime['detail_url']: details[anime['detail_url']] for anime in animes}
+
+def sync_all_anime(with_details: bool = True, catalogue_path: str = CATALOGUE_PATH,
+                   details_path: str = DETAILS_PATH) -> Dict:
+    """增量同步完整动漫列表
+
+    Args:
+        with_details: 是否为新增和变化的动漫请求详情页
+        catalogue_path: 目录文件路径
+        details_path: 详情文件路径
+
+    Returns:
+        只包含新增/变化/删除条目的响应字典
+    """
+    try:
+        current = AllAnimeCrawler().crawl_all_anime(delay=0)
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e),
+            'added': [],
+            'changed': [],
+            'removed': [],
+            'timestamp': datetime.now().isoformat()
+        }
+
+    previous = _load_json(catalogue_path, {}).get('data', [])
+    diff = diff_catalogue(previous, current)
+
+    details = {}
+    detail_errors = []
+    if with_details:
+        # 快照读取结果是共享缓存，复制后再修改
+        details = dict(_load_json(details_path, {}))
+        for anime in diff['removed']:
+            details.pop(anime['detail_url'], None)
+
+        fetched = fetch_details(diff['added'] + diff['changed'])
+        for url, detail in fetched.items():
+            if 'error' in detail:
+                detail_errors.append({'detail_url': url, 'error': detail['error']})
+            else:
+                details[url] = detail
+
+    timestamp = datetime.now().isoformat()
+    changed_count = len(diff['added']) + len(diff['changed']) + len(diff['removed'])
+
+    # 详情页获取失败的条目按旧值保存（新增的不保存），下次同步时仍会被判为新增/变化并重试
+    saved = current
+    if detail_errors:
+        failed = {error['detail_url'] for error in detail_errors}
+        previous_by_url = {anime['detail_url']: anime for anime in previous if anime.get('detail_url')}
+        saved = [
+            previous_by_url[anime['detail_url']] if anime.get('detail_url') in failed else anime
+            for anime in current
+            if anime.get('detail_url') not in failed or anime['detail_url'] in previous_by_url
+        ]
+
+    # 目录没有变化时不重写文件
+    if changed_count or not os.path.exists(catalogue_path):
+        _save_json(catalogue_path, {
+            'updated_at': timestamp,
+            'total_count': len(saved),
+            'data': saved
+        })
+    if with_details and (changed_count or detail_errors):
+        _save_json(details_path, details)
+
+    return {
+        'success': True,
+        'total_count': len(current),
+        'added': diff['added'],
+        'changed': diff['changed'],
+        'removed': diff['removed'],
+        'unchanged_count': len(diff['unchanged']),
+        'details_fetched': len(diff['added']) + len(diff['changed']) - len(detail_errors) if with_details else 0,
+        'detail_errors': detail_errors,
+        'timestamp': timestamp
+    }
+
+if __name__ == "__main__":
+    import sys
+    sys.stdout.reconfigure(encoding='utf-8')
+    result = sync_all_anime(with_details='--no-details' not in sys.argv)
+    print_json(result)
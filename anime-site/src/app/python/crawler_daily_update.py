@@ -4,14 +4,20 @@
 爬取 http://www.iyinghua.com/ 的每日更新数据
 """
 
-import requests
-from bs4 import BeautifulSoup
-import json
 import os
-from datetime import datetime, timedelta
-import time
+from datetime import datetime
 import re
 
+from http_client import get_client
+from html_parser import make_soup, TagStrainer
+from catalogue_store import get_store
+from snapshot import read_snapshot, write_snapshot
+
+# 首页侧边栏（每日更新 .tlist 所在区域）
+SIDE_STRAINER = TagStrainer(classes=('side',))
+
+DAILY_UPDATE_PATH = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'data', 'crawler_daily_update.json')
+
 class DailyUpdateCrawler:
     def __init__(self):
         self.base_url = "http://www.iyinghua.com"
@@ -19,15 +25,15 @@ class DailyUpdateCrawler:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         }
+        self.client = get_client()
         
     def fetch_page(self, url):
         """获取页面内容"""
         try:
-            response = requests.get(url, headers=self.headers, timeout=30)
+            response = self.client.get(url, headers=self.headers)
             response.encoding = 'utf-8'
             if response.status_code == 200:
                 return response.text
@@ -40,16 +46,18 @@ class DailyUpdateCrawler:
     
     def parse_daily_updates(self, html_content):
         """解析每日更新数据 - 按照指定选择器规则爬取"""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        # 每日更新位于侧边栏，先只构建 .side 区域
+        soup = make_soup(html_content, parse_only=SIDE_STRAINER)
         
         # 根据新的选择器规则定位区域
         # .area .side r .bg .tlist ul
-        daily_update_section = soup.select_one('.area .side .r .bg')
+        daily_update_section = soup.select_one('.side .r .bg') or soup.select_one('.side .bg')
         
         if not daily_update_section:
-            print("未找到每日更新区域，尝试其他选择器...")
+            print("未找到每日更新区域，尝试完整解析页面...")
             # 尝试其他可能的选择器
-            daily_update_section = soup.select_one('.side .bg')
+            soup = make_soup(html_content)
+            daily_update_section = soup.select_one('.area .side .r .bg') or soup.select_one('.side .bg')
             if not daily_update_section:
                 daily_update_section = soup.find(class_='bg')
         
@@ -150,25 +158,17 @@ class DailyUpdateCrawler:
                 return match.group(1)
         return ''
     
+    def snapshot_path(self, filename="crawler_daily_update.json"):
+        """每日更新数据文件路径"""
+        return os.path.join(os.path.dirname(__file__), '..','..','..', 'data', filename)
+    
     def save_data(self, data, filename=None):
         """保存数据到JSON文件 - 更新固定文件"""
         if filename is None:
             filename = "crawler_daily_update.json"
         
-        # 确保输出目录存在 - 直接保存到 anime-site/data
-        output_dir = os.path.join(os.path.dirname(__file__), '..','..','..', 'data')
-        os.makedirs(output_dir, exist_ok=True)
-        
-        file_path = os.path.join(output_dir, filename)
-        
-        # 检查文件是否存在，如果存在则读取现有数据
-        existing_data = {}
-        if os.path.exists(file_path):
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    existing_data = json.load(f)
-            except (json.JSONDecodeError, FileNotFoundError):
-                existing_data = {}
+        # 直接保存到 anime-site/data
+        file_path = self.snapshot_path(filename)
         
         # 更新数据
         updated_data = {
@@ -177,19 +177,41 @@ class DailyUpdateCrawler:
             'weekly_updates': data
         }
         
-        # 写入更新后的数据
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(updated_data, f, ensure_ascii=False, indent=2)
+        # 原子写入，Next.js读取时不会读到写了一半的文件
+        snapshot = write_snapshot(file_path, updated_data)
         
-        print(f"数据已更新到: {file_path}")
+        print(f"数据已更新到: {file_path} (版本 {snapshot['version']}, {snapshot['bytes']} 字节)")
         return file_path
     
     def run(self):
         """运行爬虫"""
         print("开始爬取每日更新数据...")
         
-        # 获取页面内容
-        html_content = self.fetch_page(self.base_url)
+        # 获取页面内容（条件请求，首页未变化时沿用已有数据文件）
+        snapshot_path = self.snapshot_path()
+        try:
+            response = self.client.get_conditional(
+                self.base_url,
+                headers=self.headers,
+                revalidate=os.path.exists(snapshot_path),
+                cache_key='daily_update'
+            )
+        except Exception as e:
+            print(f"获取页面时出错: {e}")
+            return None
+        
+        if not response.changed:
+            print("首页未变化，跳过解析")
+            return snapshot_path
+        
+        file_path = self.update_from_html(response.text)
+        # 解析并保存成功后才保存验证信息，否则下次请求会误判首页未变化
+        if file_path:
+            response.commit()
+        return file_path
+    
+    def update_from_html(self, html_content):
+        """解析已获取的首页HTML，保存数据文件并更新每周更新表，返回数据文件路径"""
         if not html_content:
             return None
         
@@ -199,6 +221,7 @@ class DailyUpdateCrawler:
         if daily_data:
             # 保存数据
             file_path = self.save_data(daily_data)
+            get_store().replace_weekly_schedule(daily_data)
             
             # 打印统计信息
             total_animes = sum(len(animes) for animes in daily_data.values())
@@ -212,6 +235,34 @@ class DailyUpdateCrawler:
             print("未能获取到有效的每日更新数据")
             return None
 
+def load_weekly_updates(file_path: str = DAILY_UPDATE_PATH):
+    """读取已保存的每周更新，返回统一格式的响应字典，没有数据时返回None"""
+    snapshot = read_snapshot(file_path)
+    if not snapshot or not snapshot.get('weekly_updates'):
+        return None
+    weekly_updates = snapshot['weekly_updates']
+    return {
+        'success': True,
+        'data': weekly_updates,
+        'total_count': sum(len(animes) for animes in weekly_updates.values()),
+        'updated_at': snapshot.get('updated_at'),
+        'source_url': snapshot.get('source_url'),
+        'timestamp': datetime.now().isoformat()
+    }
+
+def get_weekly_updates():
+    """爬取每周更新的API接口函数（首页未变化时沿用已有数据文件）"""
+    file_path = DailyUpdateCrawler().run()
+    result = load_weekly_updates(file_path) if file_path else None
+    if result is None:
+        return {
+            'success': False,
+            'error': '未能获取到有效的每日更新数据',
+            'data': {},
+            'timestamp': datetime.now().isoformat()
+        }
+    return result
+
 if __name__ == "__main__":
     crawler = DailyUpdateCrawler()
     crawler.run()
\ No newline at end of file
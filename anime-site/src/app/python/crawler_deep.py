@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+樱花动漫完整目录深度爬取
+遍历完整动漫列表中每部动漫的详情页，抓取分集列表写入目录存储。
+每完成一部动漫，由专用的写入线程先写入目录存储，再向检查点文件（JSON-lines，只追加）写一行，
+抓取和解析不必等待磁盘；写入线程把已积压的结果（最多 DEEP_CRAWL_BATCH 部）合并为一个目录存储事务，
+检查点每行立即写入操作系统，每 DEEP_CRAWL_BATCH 行 fsync 一次。
+进程崩溃或被中断后再次运行会跳过检查点中已成功的动漫，从中断处继续；失败的动漫在续爬时重试。
+
+用法:
+    python crawler_deep.py              # 从检查点继续
+    python crawler_deep.py --restart    # 清空检查点重新开始
+    python crawler_deep.py 100          # 本次最多爬取100部
+"""
+
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from catalogue_store import get_store
+from crawler_all_anime import AllAnimeCrawler
+from crawler_catalogue import CATALOGUE_PATH, DATA_DIR, _detail_page_url, fetch_details
+from http_client import CRAWLER_CONFIG
+from json_codec import dumps, loads, print_json, strip_pretty_flag
+from snapshot import read_snapshot
+
+CHECKPOINT_PATH = os.path.join(DATA_DIR, 'deep_crawl_checkpoint.jsonl')
+
+# 同一进程内只允许一个深度爬取任务（共用一个检查点文件）
+_running = threading.Lock()
+
+class DeepCrawlCheckpoint:
+    """只追加的检查点文件，每行一条记录：
+        {"type": "start", ...}                                   开始一轮爬取
+        {"type": "series", "detail_url": ..., "success": ...}    一部动漫完成
+        {"type": "complete", ...}                                本轮全部完成
+    崩溃时最后一行可能不完整，读取时忽略
+    """
+
+    def __init__(self, path: str = CHECKPOINT_PATH, sync_every: Optional[int] = None):
+        """
+        Args:
+            path: 检查点文件路径
+            sync_every: 每写入多少条 series 记录 fsync 一次，默认 DEEP_CRAWL_BATCH
+        """
+        self.path = path
+        self.sync_every = max(1, sync_every or CRAWLER_CONFIG['DEEP_CRAWL_BATCH'])
+        self._file = None
+        self._unsynced = 0
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict:
+        """读取检查点，返回 {'done': 已成功的detail_url集合, 'failed': {detail_url: 错误}, 'complete': 是否已全部完成}"""
+        state = {'done': set(), 'failed': {}, 'complete': False, 'started_at': None}
+        try:
+            with open(self.path, 'rb') as f:
+                lines = f.readlines()
+        except OSError:
+            return state
+
+        for line in lines:
+            try:
+                record = loads(line)
+            except ValueError:
+                continue
+            if record.get('type') == 'start':
+                state['started_at'] = record.get('started_at')
+            elif record.get('type') == 'series':
+                url = record['detail_url']
+                if record.get('success'):
+                    state['done'].add(url)
+                    state['failed'].pop(url, None)
+                else:
+                    state['failed'][url] = record.get('error')
+            elif record.get('type') == 'complete':
+                state['complete'] = True
+        return state
+
+    def _append(self, record: Dict, sync: bool = False):
+        """追加一行并写入操作系统（进程崩溃不会丢失），累计 sync_every 行或 sync=True 时 fsync"""
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'a', encoding='utf-8')
+            self._file.write(dumps(record) + '\n')
+            self._file.flush()
+            self._unsynced += 1
+            if sync or self._unsynced >= self.sync_every:
+                os.fsync(self._file.fileno())
+                self._unsynced = 0
+
+    def sync(self):
+        """把已写入的记录刷新到磁盘"""
+        with self._lock:
+            if self._file is not None and self._unsynced:
+                os.fsync(self._file.fileno())
+                self._unsynced = 0
+
+    def close(self):
+        self.sync()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def start(self, total: int, restart: bool):
+        """开始新一轮（restart为True时清空旧检查点）"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        if restart:
+            self.close()
+            with self._lock:
+                open(self.path, 'w').close()
+        self._append({'type': 'start', 'total': total, 'started_at': datetime.now().isoformat()}, sync=True)
+
+    def mark(self, detail_url: str, success: bool, episodes: int = 0, error: Optional[str] = None):
+        self._append({
+            'type': 'series', 'detail_url': detail_url, 'success': success,
+            'episodes': episodes, 'error': error, 'at': datetime.now().isoformat()
+        })
+
+    def complete(self):
+        self._append({'type': 'complete', 'finished_at': datetime.now().isoformat()}, sync=True)
+
+class DeepCrawlWriter:
+    """专用写入线程：按完成顺序先写目录存储再写检查点，保证检查点中标记成功的动漫已经入库"""
+
+    def __init__(self, store, checkpoint: DeepCrawlCheckpoint):
+        self.store = store
+        self.checkpoint = checkpoint
+        self._queue: 'queue.Queue' = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='deep-crawl-writer', daemon=True)
+        self._thread.start()
+
+    def put(self, anime: Dict, detail: Dict):
+        self._queue.put((anime, detail))
+
+    def _write(self, batch: List[tuple]):
+        self.store.record_series_details([
+            (
+                _detail_page_url(anime['detail_url']),
+                {'title': detail['title'] or anime.get('title'), 'cover_image': detail['cover_image']},
+                detail['episodes']
+            )
+            for anime, detail in batch if detail.get('error') is None
+        ])
+        for anime, detail in batch:
+            error = detail.get('error')
+            self.checkpoint.mark(anime['detail_url'], error is None, detail.get('total_episodes', 0), error)
+
+    def _run(self):
+        batch_size = self.checkpoint.sync_every
+        while True:
+            item = self._queue.get()
+            batch = []
+            # 合并已积压的结果，一批只提交一次目录存储事务
+            while item is not None:
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    # 未写入检查点的动漫在续爬时会重新抓取
+                    print(f"写入深度爬取结果失败: {e}", file=sys.stderr)
+            if item is None:
+                return
+
+    def close(self):
+        """等待队列中的结果全部写完并刷新检查点"""
+        self._queue.put(None)
+        self._thread.join()
+        self.checkpoint.sync()
+
+def load_catalogue() -> List[Dict]:
+    """完整动漫列表：优先使用 catalogue_sync 保存的目录，没有时在线爬取"""
+    catalogue = read_snapshot(CATALOGUE_PATH)
+    if catalogue and catalogue.get('data'):
+        return catalogue['data']
+    return AllAnimeCrawler().crawl_all_anime(delay=0)
+
+def deep_crawl(restart: bool = False, limit: Optional[int] = None,
+               on_series: Optional[Callable[[Dict], None]] = None,
+               checkpoint: Optional[DeepCrawlCheckpoint] = None) -> Dict:
+    """深度爬取完整目录中每部动漫的分集
+
+    Args:
+        restart: 忽略并清空检查点，从头开始
+        limit: 本次最多爬取的动漫数（None为全部剩余）
+        on_series: 可选回调，每完成一部动漫立即调用，参数为进度记录
+        checkpoint: 检查点，默认 data/deep_crawl_checkpoint.jsonl
+
+    Returns:
+        本次运行的统计
+    """
+    if not _running.acquire(blocking=False):
+        return {'success': False, 'error': '已有深度爬取任务在运行', 'timestamp': datetime.now().isoformat()}
+
+    try:
+        checkpoint = checkpoint or DeepCrawlCheckpoint()
+        started = time.time()
+        try:
+            catalogue = load_catalogue()
+        except Exception as e:
+            return {'success': False, 'error': f'获取动漫列表失败: {e}', 'timestamp': datetime.now().isoformat()}
+
+        # 同一部动漫可能在多个分类中出现
+        animes = list({anime['detail_url']: anime for anime in catalogue if anime.get('detail_url')}.values())
+
+        state = checkpoint.load()
+        # 上一轮已全部完成时开始新一轮
+        restart = restart or state['complete']
+        done = set() if restart else state['done'] & {anime['detail_url'] for anime in animes}
+        pending = [anime for anime in animes if anime['detail_url'] not in done]
+        if limit is not None:
+            pending = pending[:max(0, int(limit))]
+        checkpoint.start(len(animes), restart)
+
+        writer = DeepCrawlWriter(get_store(), checkpoint)
+        stats = {'crawled': 0, 'failed': 0, 'episodes': 0}
+        stats_lock = threading.Lock()
+
+        def on_detail(anime: Dict, detail: Dict):
+            error = detail.get('error')
+            writer.put(anime, detail)
+
+            with stats_lock:
+                stats['failed' if error else 'crawled'] += 1
+                stats['episodes'] += detail.get('total_episodes', 0)
+                progress = {
+                    'detail_url': anime['detail_url'],
+                    'title': detail.get('title') or anime.get('title'),
+                    'success': error is None,
+                    'episodes': detail.get('total_episodes', 0),
+                    'error': error,
+                    'progress': len(done) + stats['crawled'] + stats['failed'],
+                    'total': len(animes)
+                }
+            if on_series:
+                on_series(progress)
+
+        # 分批提交，在途请求数不超过批大小，每部完成后立即写检查点
+        batch_size = CRAWLER_CONFIG['DEEP_CRAWL_BATCH']
+        try:
+            for offset in range(0, len(pending), batch_size):
+                fetch_details(pending[offset:offset + batch_size], on_detail=on_detail)
+        finally:
+            writer.close()
+
+        remaining = len(animes) - len(done) - stats['crawled']
+        if remaining == 0:
+            checkpoint.complete()
+
+        return {
+            'success': True,
+            'total_series': len(animes),
+            'resumed_from': len(done),
+            'crawled': stats['crawled'],
+            'failed': stats['failed'],
+            'episodes': stats['episodes'],
+            'remaining': remaining,
+            'complete': remaining == 0,
+            'duration_seconds': round(time.time() - started, 1),
+            'timestamp': datetime.now().isoformat()
+        }
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+        _running.release()
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding='utf-8')
+    args = strip_pretty_flag(sys.argv[1:])
+    restart = '--restart' in args
+    numbers = [arg for arg in args if arg.isdigit()]
+    result = deep_crawl(
+        restart=restart,
+        limit=int(numbers[0]) if numbers else None,
+        on_series=lambda progress: print(dumps(progress), file=sys.stderr)
+    )
+    print_json(result)
@@ -8,10 +8,30 @@
 import requests
 from bs4 import BeautifulSoup
 import re
-import json
 from urllib.parse import urljoin
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from http_client import get_client, CRAWLER_CONFIG
+from html_parser import make_soup, TagStrainer
+from stream_output import emit_record, summarize
+from json_codec import dumps, print_json, strip_pretty_flag
+from async_crawler import async_engine_enabled, get_engine
+
+# 详情页只需要构建的区域：标题、封面、简介、评分、详细信息和分集列表
+DETAIL_STRAINER = TagStrainer(
+    names=('h1', 'title'),
+    classes=('thumb', 'info', 'score', 'sinfo', 'movurl'),
+    ids=('main0',),
+    meta_names=('description',)
+)
+
+# 播放页只需要构建可能包含视频地址的标签
+PLAY_STRAINER = TagStrainer(
+    names=('video', 'iframe', 'script'),
+    attrs_present=('data-video',)
+)
 
 class EpisodesCrawler:
     """分集URL爬虫类"""
@@ -24,6 +44,7 @@ class EpisodesCrawler:
             'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
             'Connection': 'keep-alive',
         }
+        self.client = get_client()
     
     def crawl_episodes(self, anime_url: str) -> List[Dict]:
         """爬取动漫分集信息
@@ -38,32 +59,30 @@ class EpisodesCrawler:
             raise ValueError("无效的动漫页面URL")
         
         try:
-            response = requests.get(anime_url, headers=self.headers, timeout=30)
+            response = self.client.get(anime_url, headers=self.headers)
             response.raise_for_status()
             response.encoding = 'utf-8'
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 提取动漫标题
-            anime_title = self._extract_anime_title(soup)
-            
-            # 提取封面图片URL
-            cover_image = self._extract_cover_image(soup)
-            
-            # 提取分集信息
-            episodes = self._extract_episodes(soup)
-            
-            # 添加动漫标题和封面图片到每个分集
-            for episode in episodes:
-                episode['anime_title'] = anime_title
-                episode['anime_url'] = anime_url
-                episode['cover_image'] = cover_image
-            
-            return episodes
+            return self._episodes_from_page(response.text, anime_url)
             
         except requests.RequestException as e:
             raise Exception(f"网络请求失败: {str(e)}")
     
+    def _episodes_from_page(self, html: str, anime_url: str) -> List[Dict]:
+        """从详情页解析分集列表，每个分集附带动漫标题、详情页URL和封面"""
+        page = self._parse_detail_page(html, with_details=False)
+        anime_title = page['title']
+        cover_image = page['cover_image']
+        episodes = page['episodes']
+        
+        # 添加动漫标题和封面图片到每个分集
+        for episode in episodes:
+            episode['anime_title'] = anime_title
+            episode['anime_url'] = anime_url
+            episode['cover_image'] = cover_image
+        
+        return episodes
+    
     def _validate_url(self, url: str) -> bool:
         """验证URL格式"""
         if not url:
@@ -175,8 +194,13 @@ class EpisodesCrawler:
             return url
         return url
 
-    def _extract_cover_image(self, soup: BeautifulSoup) -> str:
-        """提取封面图片URL（基于实际HTML结构）"""
+    def _extract_cover_image(self, soup: BeautifulSoup, anime_title: Optional[str] = None) -> str:
+        """提取封面图片URL（基于实际HTML结构）
+        
+        Args:
+            soup: 页面
+            anime_title: 已提取的动漫标题，避免重复提取
+        """
         # 优先查找class="thumb"中的图片
         thumb_div = soup.find('div', class_='thumb')
         if thumb_div:
@@ -185,7 +209,8 @@ class EpisodesCrawler:
                 return self._normalize_image_url(img['src'])
         
         # 备用方案：查找动漫标题相关的图片
-        anime_title = self._extract_anime_title(soup)
+        if anime_title is None:
+            anime_title = self._extract_anime_title(soup)
         if anime_title and anime_title != "未知动漫":
             img_with_alt = soup.find('img', {'alt': anime_title})
             if img_with_alt and img_with_alt.get('src'):
@@ -243,90 +268,196 @@ class EpisodesCrawler:
         episodes.sort(key=lambda x: x['episode'])
         return episodes
 
+    def _parse_detail_page(self, html: str, with_details: bool = True) -> Dict:
+        """解析详情页
+        
+        先只构建 DETAIL_STRAINER 中的区域并提取，标题只提取一次；
+        只有分集列表容器或thumb封面缺失、需要全页兜底查找时才完整解析页面。
+        
+        Args:
+            html: 详情页内容
+            with_details: 是否提取简介和详细信息
+            
+        Returns:
+            {'title', 'cover_image', 'episodes'}，with_details时另含 'description', 'details'
+        """
+        soup = make_soup(html, parse_only=DETAIL_STRAINER)
+        full_soup = None
+        
+        anime_title = self._extract_anime_title(soup)
+        
+        # thumb区域有封面时直接使用，否则在完整页面中按标题和通用规则查找
+        cover_image = ''
+        if soup.find('div', class_='thumb'):
+            cover_image = self._extract_cover_image(soup, anime_title)
+        if not cover_image:
+            full_soup = make_soup(html)
+            cover_image = self._extract_cover_image(full_soup, anime_title)
+        
+        # 没有分集列表容器时需要在整个页面中查找分集链接
+        if soup.find('div', class_='movurl') or soup.find('div', id='main0'):
+            episodes = self._extract_episodes(soup)
+        else:
+            full_soup = full_soup or make_soup(html)
+            episodes = self._extract_episodes(full_soup)
+        
+        page = {
+            'title': anime_title,
+            'cover_image': cover_image,
+            'episodes': episodes
+        }
+        if with_details:
+            page['description'] = self._extract_description(soup)
+            page['details'] = self._extract_anime_details(soup)
+        return page
+
     def _extract_real_video_url(self, episode_url: str) -> str:
-        """提取真实视频播放地址"""
+        """提取真实视频播放地址，失败时返回原始页面URL"""
         try:
-            response = requests.get(episode_url, headers=self.headers, timeout=30)
-            response.raise_for_status()
-            response.encoding = 'utf-8'
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 查找视频源
-            # 方式1: 查找video标签
-            video_tags = soup.find_all('video')
-            for video in video_tags:
-                src = video.get('src') 
-                if not src:
-                    source = video.find('source')
-                    if source:
-                        src = source.get('src')
-                if src:
-                    return self._normalize_image_url(src)
-            
-            # 方式2: 查找iframe中的视频源
-            iframes = soup.find_all('iframe')
-            for iframe in iframes:
-                src = iframe.get('src')
-                if src and any(keyword in src.lower() for keyword in ['player', 'video', 'play']):
-                    return src
-            
-            # 方式3: 查找JavaScript中的视频URL
-            scripts = soup.find_all('script')
-            for script in scripts:
-                if script.string:
-                    # 查找m3u8链接
-                    m3u8_matches = re.findall(r'["\'](https?://[^"\']*\.m3u8[^"\']*)["\']', script.string)
-                    if m3u8_matches:
-                        return m3u8_matches[0]
-                    
-                    # 查找mp4链接
-                    mp4_matches = re.findall(r'["\'](https?://[^"\']*\.mp4[^"\']*)["\']', script.string)
-                    if mp4_matches:
-                        return mp4_matches[0]
-            
-            # 方式4: 查找data-video属性
-            video_divs = soup.find_all(attrs={'data-video': True})
-            for div in video_divs:
-                video_url = div.get('data-video')
-                if video_url:
-                    return self._normalize_image_url(video_url)
-            
-            return episode_url  # 返回原始页面URL作为备用
-            
+            return self._fetch_real_video_url(episode_url)
         except Exception as e:
             print(f"提取视频URL失败: {e}")
             return episode_url
 
-    def crawl_complete_anime_info(self, anime_url: str) -> Dict:
-        """爬取完整动漫信息"""
+    def _fetch_real_video_url(self, episode_url: str) -> str:
+        """请求分集页面并解析真实视频播放地址，网络错误直接抛出"""
+        response = self.client.get(episode_url, headers=self.headers)
+        response.raise_for_status()
+        response.encoding = 'utf-8'
+        
+        return self._parse_play_page(episode_url, response.text)
+    
+    def _parse_play_page(self, episode_url: str, html: str) -> str:
+        soup = make_soup(html, parse_only=PLAY_STRAINER)
+        return self._parse_real_video_url(soup, episode_url)
+
+    def _parse_real_video_url(self, soup: BeautifulSoup, episode_url: str) -> str:
+        """从分集页面中解析真实视频播放地址"""
+        # 查找视频源
+        # 方式1: 查找video标签
+        video_tags = soup.find_all('video')
+        for video in video_tags:
+            src = video.get('src') 
+            if not src:
+                source = video.find('source')
+                if source:
+                    src = source.get('src')
+            if src:
+                return self._normalize_image_url(src)
+        
+        # 方式2: 查找iframe中的视频源
+        iframes = soup.find_all('iframe')
+        for iframe in iframes:
+            src = iframe.get('src')
+            if src and any(keyword in src.lower() for keyword in ['player', 'video', 'play']):
+                return src
+        
+        # 方式3: 查找JavaScript中的视频URL
+        scripts = soup.find_all('script')
+        for script in scripts:
+            if script.string:
+                # 查找m3u8链接
+                m3u8_matches = re.findall(r'["\'](https?://[^"\']*\.m3u8[^"\']*)["\']', script.string)
+                if m3u8_matches:
+                    return m3u8_matches[0]
+                
+                # 查找mp4链接
+                mp4_matches = re.findall(r'["\'](https?://[^"\']*\.mp4[^"\']*)["\']', script.string)
+                if mp4_matches:
+                    return mp4_matches[0]
+        
+        # 方式4: 查找data-video属性
+        video_divs = soup.find_all(attrs={'data-video': True})
+        for div in video_divs:
+            video_url = div.get('data-video')
+            if video_url:
+                return self._normalize_image_url(video_url)
+        
+        return episode_url  # 返回原始页面URL作为备用
+
+    def _resolve_video_urls(self, episodes: List[Dict], max_workers: Optional[int] = None,
+                            on_episode: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """并发解析所有分集的真实视频地址
+        
+        启用异步引擎时所有分集在同一个事件循环中请求，否则使用线程池，并发数受
+        CRAWLER_CONFIG['MAX_CONCURRENT'] 限制。结果直接写入原分集（顺序不变）；
+        单集解析失败时video_url回退为分集页面URL并记录video_error，不影响其他分集。
+        
+        Args:
+            episodes: 分集信息列表，解析结果直接写入每个分集
+            max_workers: 最大并发数，默认使用 MAX_CONCURRENT
+            on_episode: 可选回调，每解析完一集立即调用（按完成顺序）
+            
+        Returns:
+            解析失败的分集列表 [{'episode': 集数, 'url': 页面URL, 'error': 错误信息}]
+        """
+        if not episodes:
+            return []
+        
+        failures = []
+        
+        def finish(episode: Dict, video_url: Optional[str], error: Optional[BaseException]):
+            if error is None:
+                episode['video_url'] = video_url
+            else:
+                episode['video_url'] = episode['url']
+                episode['video_error'] = str(error)
+                failures.append({
+                    'episode': episode['episode'],
+                    'url': episode['url'],
+                    'error': str(error)
+                })
+            if on_episode:
+                on_episode(episode)
+        
+        if async_engine_enabled():
+            # 所有分集页面在异步引擎中同时请求
+            get_engine().fetch_all(
+                [episode['url'] for episode in episodes], self._parse_play_page,
+                on_result=lambda index, video_url, error: finish(episodes[index], video_url, error),
+                headers=self.headers
+            )
+        else:
+            max_workers = max_workers or CRAWLER_CONFIG['MAX_CONCURRENT']
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(episodes))) as executor:
+                futures = {executor.submit(self._fetch_real_video_url, episode['url']): episode for episode in episodes}
+                
+                for future in as_completed(futures):
+                    error = future.exception()
+                    finish(futures[future], None if error else future.result(), error)
+        
+        failures.sort(key=lambda failure: failure['episode'])
+        return failures
+
+    def crawl_complete_anime_info(self, anime_url: str, on_episode: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """爬取完整动漫信息
+        
+        Args:
+            anime_url: 动漫详情页URL
+            on_episode: 可选回调，每解析完一集的视频地址立即调用
+        """
         if not self._validate_url(anime_url):
             raise ValueError("无效的动漫页面URL")
         
         try:
-            response = requests.get(anime_url, headers=self.headers, timeout=30)
+            response = self.client.get(anime_url, headers=self.headers)
             response.raise_for_status()
             response.encoding = 'utf-8'
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 提取基础信息
-            anime_title = self._extract_anime_title(soup)
-            cover_image = self._extract_cover_image(soup)
-            description = self._extract_description(soup)
-            
-            # 提取详细信息
-            anime_details = self._extract_anime_details(soup)
+            page = self._parse_detail_page(response.text)
+            anime_title = page['title']
+            cover_image = page['cover_image']
+            description = page['description']
+            anime_details = page['details']
+            episodes = page['episodes']
             
-            # 提取分集信息
-            episodes = self._extract_episodes(soup)
-            
-            # 为每个分集提取真实视频URL
             for episode in episodes:
-                episode['video_url'] = self._extract_real_video_url(episode['url'])
                 episode['anime_title'] = anime_title
                 episode['cover_image'] = cover_image
             
+            # 并发提取每个分集的真实视频URL
+            failed_episodes = self._resolve_video_urls(episodes, on_episode=on_episode)
+            
             return {
                 'success': True,
                 'anime_info': {
@@ -337,6 +468,7 @@ class EpisodesCrawler:
                 },
                 'episodes': episodes,
                 'total_episodes': len(episodes),
+                'failed_episodes': failed_episodes,
                 'crawl_time': datetime.now().isoformat()
             }
             
@@ -350,31 +482,42 @@ class EpisodesCrawler:
                 'crawl_time': datetime.now().isoformat()
             }
 
-def get_anime_episodes(anime_url: str) -> Dict:
+def build_anime_url(anime_id: str) -> str:
+    """根据动漫ID构建详情页URL（支持 '6594' 或 'show/6594.html' 两种形式）"""
+    if anime_id.startswith('show/'):
+        return f"http://www.iyinghua.com/{anime_id}"
+    return f"http://www.iyinghua.com/show/{anime_id}.html"
+
+def get_anime_episodes(anime_url: str, on_episode: Optional[Callable[[Dict], None]] = None) -> Dict:
     """获取动漫分集的API接口函数（兼容旧接口）"""
     crawler = EpisodesCrawler()
-    return crawler.crawl_complete_anime_info(anime_url)
+    return crawler.crawl_complete_anime_info(anime_url, on_episode=on_episode)
 
 if __name__ == "__main__":
     # 从命令行参数获取动漫ID
     import sys
-    if len(sys.argv) != 2:
-        print(json.dumps({
+    args = [arg for arg in strip_pretty_flag(sys.argv[1:]) if arg != '--stream']
+    stream = '--stream' in sys.argv[1:]
+    if len(args) != 1:
+        print(dumps({
             'success': False,
-            'error': 'Usage: python crawler_episodes.py <anime_id>'
+            'error': 'Usage: python crawler_episodes.py <anime_id> [--stream] [--pretty]'
         }))
         sys.exit(1)
     
-    anime_id = sys.argv[1]
+    anime_id = args[0]
     
     # 构建完整的动漫URL
-    if anime_id.startswith('show/'):
-        anime_url = f"http://www.iyinghua.com/{anime_id}"
-    else:
-        anime_url = f"http://www.iyinghua.com/show/{anime_id}.html"
+    anime_url = build_anime_url(anime_id)
     
-    result = get_anime_episodes(anime_url)
     # 强制使用UTF-8编码输出
-    import sys
     sys.stdout.reconfigure(encoding='utf-8')
-    print(json.dumps(result, ensure_ascii=False, indent=2))
\ No newline at end of file
+    
+    if stream:
+        # 流式输出：每解析完一集输出一行，最后输出汇总；其他print输出转到stderr
+        out, sys.stdout = sys.stdout, sys.stderr
+        result = get_anime_episodes(anime_url, on_episode=lambda episode: emit_record('item', episode, out))
+        emit_record('summary', summarize('episodes', result), out)
+    else:
+        result = get_anime_episodes(anime_url)
+        print_json(result)
\ No newline at end of file
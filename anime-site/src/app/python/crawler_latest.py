@@ -6,13 +6,19 @@
 """
 
 import requests
-from bs4 import BeautifulSoup
-import json
 import re
 import os
 from typing import List, Dict, Optional
 from datetime import datetime
 
+from http_client import get_client
+from html_parser import make_soup
+from json_codec import print_json, strip_pretty_flag
+from snapshot import read_snapshot, snapshot_version, write_snapshot
+
+# 固定文件名
+LATEST_UPDATES_PATH = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'data', 'latest_updates.json')
+
 class LatestCrawler:
     """最新更新爬虫类"""
     
@@ -25,21 +31,33 @@ class LatestCrawler:
             'Accept-Language': 'zh-CN,zh;q=0.8,zh-TW;q=0.7,zh-HK;q=0.5,en-US;q=0.3,en;q=0.2',
             'Connection': 'keep-alive',
         }
+        self.client = get_client()
+        self.not_modified = False
+        self.response = None
         self.latest_updates_selector = ".area .img ul li, .news-list li, .update-list li"
     
-    def crawl_latest_updates(self, limit: int = 50) -> List[Dict]:
+    def crawl_latest_updates(self, limit: int = 50, previous: Optional[List[Dict]] = None) -> List[Dict]:
         """爬取最新更新内容
         
         Args:
             limit: 最大返回结果数
+            previous: 上次的解析结果，首页未变化时直接返回，跳过解析
             
         Returns:
             最新更新动漫列表
         """
         try:
-            response = requests.get(self.base_url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            response.encoding = 'utf-8'
+            response = self.client.get_conditional(
+                self.base_url,
+                headers=self.headers,
+                revalidate=previous is not None,
+                cache_key='latest'
+            )
+            
+            self.response = response
+            self.not_modified = not response.changed
+            if self.not_modified:
+                return previous[:limit]
             
             return self._parse_latest_updates(response.text, limit)
             
@@ -48,7 +66,7 @@ class LatestCrawler:
     
     def _parse_latest_updates(self, html: str, limit: int) -> List[Dict]:
         """解析最新更新内容"""
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = make_soup(html)
         updates = []
         
         # 查找所有可能的更新区域
@@ -164,34 +182,11 @@ def get_latest_updates(limit: int = 50) -> Dict:
     crawler = LatestCrawler()
     
     try:
-        updates = crawler.crawl_latest_updates(limit)
-        
-        result = {
-            'success': True,
-            'total_count': len(updates),
-            'data': updates,
-            'timestamp': datetime.now().isoformat(),
-            'source_url': crawler.base_url
-        }
-        
-        # 保存为JSON文件
-        try:
-            # 确保data目录存在
-            data_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'data')
-            os.makedirs(data_dir, exist_ok=True)
-            
-            # 固定文件名
-            filepath = os.path.join(data_dir, 'latest_updates.json')
-            
-            # 保存文件
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(result, f, ensure_ascii=False, indent=2)
-            
-            result['file_path'] = filepath
-            
-        except Exception as e:
-            result['file_save_error'] = str(e)
-        
+        updates = crawler.crawl_latest_updates(limit, load_previous_updates(limit))
+        result = save_latest_updates(updates, limit, crawler.not_modified, crawler.base_url)
+        # 解析出结果且快照写入成功后才保存验证信息，否则下次请求会误判首页未变化
+        if updates and 'file_save_error' not in result:
+            crawler.response.commit()
         return result
         
     except Exception as e:
@@ -203,15 +198,52 @@ def get_latest_updates(limit: int = 50) -> Dict:
             'timestamp': datetime.now().isoformat()
         }
 
+def save_latest_updates(updates: List[Dict], limit: int, not_modified: bool = False,
+                        source_url: str = "http://www.iyinghua.com") -> Dict:
+    """组装最新更新的响应字典，内容有变化时原子写入JSON快照（首页未变化时沿用已有文件）"""
+    filepath = LATEST_UPDATES_PATH
+    result = {
+        'success': True,
+        'total_count': len(updates),
+        'data': updates,
+        'limit': limit,
+        'not_modified': not_modified,
+        'timestamp': datetime.now().isoformat(),
+        'source_url': source_url
+    }
+    
+    if not_modified:
+        result['file_path'] = filepath
+        result['snapshot_version'] = snapshot_version(filepath)
+        return result
+    
+    try:
+        snapshot = write_snapshot(filepath, result)
+        result['file_path'] = filepath
+        result['snapshot_version'] = snapshot['version']
+        
+    except Exception as e:
+        result['file_save_error'] = str(e)
+    
+    return result
+
+def load_previous_updates(limit: int) -> Optional[List[Dict]]:
+    """读取上次保存的最新更新，仅当其覆盖本次请求的数量时才可复用"""
+    previous = read_snapshot(LATEST_UPDATES_PATH)
+    if not previous or not previous.get('success') or previous.get('limit', 0) < limit:
+        return None
+    return previous.get('data')
+
 if __name__ == "__main__":
     # 测试函数
     import sys
+    args = strip_pretty_flag(sys.argv[1:])
     limit = 50  # 默认获取50条
-    if len(sys.argv) > 1:
+    if args:
         try:
-            limit = int(sys.argv[1])
+            limit = int(args[0])
         except ValueError:
             limit = 50
     
     result = get_latest_updates(limit=limit)
-    print(json.dumps(result, ensure_ascii=False, indent=2))
\ No newline at end of file
+    print_json(result)
\ No newline at end of file
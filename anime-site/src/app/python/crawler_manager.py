@@ -5,16 +5,57 @@
 整合所有优化后的爬虫功能，提供统一的API接口
 """
 
-import json
 import sys
-from typing import Dict, Any
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Any, Optional
 
 # 导入所有优化后的爬虫
 from crawler_search import search_anime
 from crawler_all_anime import get_all_anime
-from crawler_episodes import get_anime_episodes
-from crawler_latest import get_latest_updates
-from crawler_video import get_video_url
+from crawler_episodes import get_anime_episodes, build_anime_url
+from crawler_latest import LATEST_UPDATES_PATH, get_latest_updates
+from crawler_daily_update import DAILY_UPDATE_PATH, get_weekly_updates, load_weekly_updates
+from crawler_video import get_video_url, get_video_urls, build_episode_url, parse_episode_url
+from crawler_catalogue import sync_all_anime
+from crawler_deep import deep_crawl
+from crawler_cache import CrawlerCache, normalize_url
+from catalogue_store import get_store
+from search_index import SearchIndex
+from single_flight import SingleFlight
+from stale_snapshot import StaleSnapshot
+from home_refresher import HomeFeedRefresher, refresh_home_feeds
+from stream_output import emit_record, result_items, summarize
+from http_client import CRAWLER_CONFIG
+import json_codec
+
+# 有副作用（写入目录文件）的爬虫类型，不使用缓存
+# video_batch 按单集复用 video 类型的缓存，不整体缓存；catalogue 直接查询目录存储；
+# latest / weekly 由 data/*.json 快照按 stale-while-revalidate 提供
+UNCACHED_TYPES = {'catalogue_sync', 'video_batch', 'catalogue', 'deep_crawl', 'latest', 'weekly'}
+
+# 以快照提供的首页数据类型
+SNAPSHOT_TYPES = {'latest', 'weekly'}
+
+# 最新更新快照至少保存的条数，较小的limit直接截取快照
+LATEST_SNAPSHOT_LIMIT = 50
+
+# 首页数据快照由同一次首页抓取刷新
+HOME_FEED_TYPES = {'latest', 'weekly'}
+
+# 不发起网络请求、不记录爬取的类型
+QUERY_TYPES = {'catalogue'}
+
+# 在爬取过程中逐条产出结果的类型，其余类型在爬取完成后逐条回放
+LIVE_STREAM_TYPES = {'episodes', 'video_batch', 'deep_crawl'}
+
+# 批量解析一次最多处理的集数
+MAX_BATCH_SIZE = 200
+
+# 预取失败的集数（通常是还没更新的下一集）在这段时间内不再尝试(秒)
+PREFETCH_RETRY_AFTER = 600
 
 class CrawlerManager:
     """爬虫统一管理器"""
@@ -25,15 +66,46 @@ class CrawlerManager:
             'all_anime': get_all_anime,
             'episodes': get_anime_episodes,
             'latest': get_latest_updates,
-            'video': get_video_url
+            'video': get_video_url,
+            'video_batch': get_video_urls,
+            'catalogue_sync': sync_all_anime,
+            'deep_crawl': deep_crawl,
+            'weekly': get_weekly_updates,
+            'catalogue': self.query_catalogue
         }
+        self.cache = CrawlerCache()
+        self.store = get_store()
+        self.search_index = SearchIndex(self.store)
+        self.flights = SingleFlight()
+        self.snapshots = {
+            'latest': StaleSnapshot(
+                LATEST_UPDATES_PATH, CRAWLER_CONFIG['SNAPSHOT_SOFT_TTL']['latest'],
+                CRAWLER_CONFIG['SNAPSHOT_HARD_TTL']['latest'], self.flights
+            ),
+            'weekly': StaleSnapshot(
+                DAILY_UPDATE_PATH, CRAWLER_CONFIG['SNAPSHOT_SOFT_TTL']['weekly'],
+                CRAWLER_CONFIG['SNAPSHOT_HARD_TTL']['weekly'], self.flights, load=load_weekly_updates
+            ),
+        }
+        # 首页定时刷新，只在常驻模式下开启
+        self.home_refresher = HomeFeedRefresher(lambda: self.refresh_home(LATEST_SNAPSHOT_LIMIT))
+        
+        # 下一集预取，只在常驻模式下开启（单次命令行调用退出时后台任务会丢失）
+        self.prefetch_count = 0
+        self._prefetch_executor = None
+        self._prefetching = set()
+        self._prefetch_failed: Dict[str, float] = {}
+        self._prefetch_lock = threading.Lock()
     
-    def run_crawler(self, crawler_type: str, **kwargs) -> Dict[str, Any]:
+    def run_crawler(self, crawler_type: str, on_partial: Optional[Callable[[Dict], None]] = None,
+                    **kwargs) -> Dict[str, Any]:
         """运行指定类型的爬虫
         
         Args:
-            crawler_type: 爬虫类型 ('search', 'all_anime', 'episodes', 'latest', 'video')
-            **kwargs: 爬虫特定参数
+            crawler_type: 爬虫类型 ('search', 'all_anime', 'episodes', 'latest', 'weekly', 'video', 'video_batch',
+                          'catalogue_sync', 'catalogue', 'deep_crawl')
+            on_partial: 可选回调，支持的爬虫类型每得到一条结果就立即回调
+            **kwargs: 爬虫特定参数，refresh=True时跳过缓存
             
         Returns:
             统一格式的响应字典
@@ -48,21 +120,45 @@ class CrawlerManager:
         
         try:
             crawler_func = self.crawlers[crawler_type]
+            params = self._normalize_params(crawler_type, kwargs)
             
-            # 根据爬虫类型处理参数
-            if crawler_type == 'search':
-                result = crawler_func(kwargs.get('keyword', ''))
-            elif crawler_type == 'all_anime':
-                result = crawler_func()
-            elif crawler_type == 'episodes':
-                result = crawler_func(kwargs.get('url', ''))
-            elif crawler_type == 'latest':
-                result = crawler_func(kwargs.get('limit', 50))
-            elif crawler_type == 'video':
-                result = crawler_func(kwargs.get('url', ''))
-            else:
-                result = {'success': False, 'error': '未知错误'}
+            # 搜索优先查询本地索引，本地结果少于 LOCAL_SEARCH_MIN_RESULTS 条时仍在线搜索
+            # （本地目录不完整时少量本地命中不能代表全部结果），在线搜索失败时再返回本地结果
+            local = None
+            if crawler_type == 'search' and not kwargs.get('refresh'):
+                local = self._search_local(params['keyword'])
+                if local is not None and local['total_count'] >= CRAWLER_CONFIG['LOCAL_SEARCH_MIN_RESULTS']:
+                    self._replay_items(crawler_type, local, on_partial)
+                    return local
             
+            # 优先读取缓存，refresh=True时强制重新爬取
+            use_cache = crawler_type not in UNCACHED_TYPES
+            if use_cache and not kwargs.get('refresh'):
+                cached = self.cache.get(crawler_type, params)
+                if cached is not None:
+                    self._replay_items(crawler_type, cached, on_partial)
+                    if crawler_type == 'video' and cached.get('success'):
+                        self._schedule_prefetch(params['url'])
+                    return cached
+            
+            if crawler_type in QUERY_TYPES:
+                return crawler_func(**params)
+            
+            # 首页数据先返回已有快照，过期时再刷新
+            if crawler_type in SNAPSHOT_TYPES and not kwargs.get('refresh'):
+                result = self._serve_snapshot(crawler_type, crawler_func, params)
+                self._replay_items(crawler_type, result, on_partial)
+                return result
+            
+            # 相同参数的并发请求合并为一次爬取
+            result, _ = self.flights.do(
+                self.cache.make_key(crawler_type, params),
+                lambda publish: self._crawl(crawler_type, crawler_func, params, kwargs, publish),
+                on_partial
+            )
+            if local is not None and not result.get('success'):
+                self._replay_items(crawler_type, local, on_partial)
+                return {**local, 'live_error': result.get('error')}
             return result
             
         except Exception as e:
@@ -72,6 +168,274 @@ class CrawlerManager:
                 'data': None
             }
     
+    def _crawl(self, crawler_type: str, crawler_func: Callable, params: Dict[str, Any], kwargs: Dict[str, Any],
+               on_partial: Optional[Callable[[Dict], None]]) -> Dict[str, Any]:
+        """实际执行一次爬取，并写入缓存和目录存储"""
+        use_cache = crawler_type not in UNCACHED_TYPES
+        started_at = datetime.now()
+        
+        # 根据爬虫类型处理参数
+        if crawler_type == 'search':
+            result = crawler_func(params['keyword'])
+        elif crawler_type == 'all_anime':
+            result = crawler_func()
+        elif crawler_type == 'episodes':
+            result = crawler_func(params['url'], on_episode=on_partial)
+        elif crawler_type == 'video':
+            result = crawler_func(params['url'])
+        elif crawler_type == 'latest':
+            result = crawler_func(params['limit'])
+        elif crawler_type == 'video_batch':
+            result = self._run_video_batch(params['urls'], kwargs.get('refresh'), on_partial)
+        elif crawler_type == 'catalogue_sync':
+            result = crawler_func(params['with_details'])
+        elif crawler_type == 'deep_crawl':
+            result = crawler_func(params['restart'], params['limit'], on_series=on_partial)
+        elif crawler_type == 'weekly':
+            result = crawler_func()
+        else:
+            result = {'success': False, 'error': '未知错误'}
+        
+        if crawler_type not in LIVE_STREAM_TYPES:
+            self._replay_items(crawler_type, result, on_partial)
+        
+        # 只缓存成功的结果
+        if use_cache and result.get('success'):
+            self.cache.set(crawler_type, params, result)
+        
+        # 写入目录存储并记录本次爬取
+        self.store.ingest(crawler_type, params, result)
+        duration_ms = int((datetime.now() - started_at).total_seconds() * 1000)
+        self.store.record_run(crawler_type, params, result, started_at.isoformat(), duration_ms)
+        
+        if crawler_type == 'video' and result.get('success'):
+            self._schedule_prefetch(params['url'])
+        
+        return result
+    
+    def _serve_snapshot(self, crawler_type: str, crawler_func: Callable, params: Dict[str, Any]) -> Dict[str, Any]:
+        """按 stale-while-revalidate 返回首页数据快照"""
+        if crawler_type == 'latest':
+            limit = params['limit']
+            refresh_params = {'limit': max(limit, LATEST_SNAPSHOT_LIMIT)}
+            # 快照条数不够时按没有快照处理
+            usable = lambda snapshot: snapshot.get('success') and snapshot.get('limit', 0) >= limit
+        else:
+            refresh_params = params
+            usable = None
+        
+        if crawler_type in HOME_FEED_TYPES:
+            # 一次首页抓取同时刷新所有首页数据
+            limit = refresh_params.get('limit', LATEST_SNAPSHOT_LIMIT)
+            refresh = lambda: self._home_feed(crawler_type, limit)
+        else:
+            refresh = lambda: self._crawl(crawler_type, crawler_func, refresh_params, {}, None)
+        
+        result = self.snapshots[crawler_type].get(self.cache.make_key(crawler_type, refresh_params), refresh, usable)
+        if crawler_type == 'latest' and isinstance(result.get('data'), list):
+            result['data'] = result['data'][:params['limit']]
+            result['total_count'] = len(result['data'])
+            result['limit'] = params['limit']
+        return result
+    
+    def refresh_home(self, limit: int = LATEST_SNAPSHOT_LIMIT) -> Dict[str, Any]:
+        """抓取一次首页，更新最新更新和每周更新快照（并发调用合并为一次抓取）"""
+        def run(publish):
+            started_at = datetime.now()
+            result = refresh_home_feeds(limit)
+            duration_ms = int((datetime.now() - started_at).total_seconds() * 1000)
+            self.store.record_run('home', {'limit': limit}, {
+                'success': result.get('success'),
+                'error': result.get('error'),
+                'total_count': (result.get('latest') or {}).get('total_count')
+            }, started_at.isoformat(), duration_ms)
+            for crawler_type in HOME_FEED_TYPES:
+                if (result.get(crawler_type) or {}).get('success'):
+                    self.snapshots[crawler_type].mark_validated()
+            return result
+        
+        result, _ = self.flights.do(self.cache.make_key('home', {'limit': limit}), run)
+        return result
+    
+    def _home_feed(self, crawler_type: str, limit: int) -> Dict[str, Any]:
+        """刷新首页并取出其中一种数据的响应"""
+        result = self.refresh_home(limit)
+        return result.get(crawler_type) or {'success': False, 'error': result.get('error'), 'data': None}
+    
+    def _search_local(self, keyword: str) -> Optional[Dict[str, Any]]:
+        """在本地索引中搜索，没有命中时返回None"""
+        results = self.search_index.search(keyword)
+        if not results:
+            return None
+        return {
+            'success': True,
+            'keyword': keyword,
+            'total_count': len(results),
+            'data': results,
+            'source': 'local',
+            'timestamp': datetime.now().isoformat()
+        }
+    
+    def enable_prefetch(self, count: Optional[int] = None):
+        """开启下一集预取：解析第k集后在后台解析第k+1~k+count集并写入缓存"""
+        self.prefetch_count = CRAWLER_CONFIG['PREFETCH_EPISODES'] if count is None else count
+        if self.prefetch_count > 0 and self._prefetch_executor is None:
+            self._prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='prefetch')
+    
+    def _schedule_prefetch(self, page_url: str):
+        """为播放页之后的若干集安排后台预取，已在预取中或近期失败的集数跳过"""
+        if self._prefetch_executor is None:
+            return
+        parsed = parse_episode_url(page_url)
+        if not parsed:
+            return
+        
+        anime_id, episode = parsed
+        last = episode + self.prefetch_count
+        # 已缓存分集列表时不超过总集数
+        series = self.cache.get('episodes', {'url': normalize_url(build_anime_url(anime_id))})
+        if series and series.get('total_episodes'):
+            last = min(last, series['total_episodes'])
+        
+        now = time.time()
+        with self._prefetch_lock:
+            self._prefetch_failed = {url: until for url, until in self._prefetch_failed.items() if until > now}
+            urls = [
+                url for url in (normalize_url(build_episode_url(anime_id, n)) for n in range(episode + 1, last + 1))
+                if url not in self._prefetching and url not in self._prefetch_failed
+            ]
+            self._prefetching.update(urls)
+        
+        if urls:
+            self._prefetch_executor.submit(self._prefetch, urls)
+    
+    def _prefetch(self, urls):
+        """后台解析视频地址，成功的结果由 _run_video_batch 写入 video 缓存"""
+        try:
+            result = self._run_video_batch(urls)
+            retry_at = time.time() + PREFETCH_RETRY_AFTER
+            with self._prefetch_lock:
+                for item in result['data']:
+                    if not item['success']:
+                        self._prefetch_failed[item['page_url']] = retry_at
+        except Exception as e:
+            print(f"预取视频地址失败: {e}", file=sys.stderr)
+        finally:
+            with self._prefetch_lock:
+                self._prefetching.difference_update(urls)
+    
+    @staticmethod
+    def _replay_items(crawler_type: str, result: Dict[str, Any], on_partial: Optional[Callable[[Dict], None]]):
+        """把已完成的结果列表逐条交给on_partial（缓存命中或不支持边爬边出的类型）"""
+        if on_partial:
+            for item in result_items(crawler_type, result):
+                on_partial(item)
+    
+    def _normalize_params(self, crawler_type: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """将爬虫参数标准化，同时作为调用参数和缓存键"""
+        if crawler_type == 'search':
+            return {'keyword': str(kwargs.get('keyword', '')).strip()}
+        if crawler_type == 'episodes':
+            url = kwargs.get('url') or ''
+            if not url and kwargs.get('anime_id'):
+                url = build_anime_url(str(kwargs['anime_id']))
+            return {'url': normalize_url(url)}
+        if crawler_type == 'video':
+            return {'url': normalize_url(kwargs.get('url') or '')}
+        if crawler_type == 'latest':
+            try:
+                return {'limit': int(kwargs.get('limit', 50))}
+            except (TypeError, ValueError):
+                return {'limit': 50}
+        if crawler_type == 'video_batch':
+            return {'urls': self._batch_urls(kwargs)}
+        if crawler_type == 'catalogue_sync':
+            return {'with_details': bool(kwargs.get('with_details', True))}
+        if crawler_type == 'deep_crawl':
+            limit = kwargs.get('limit')
+            return {'restart': bool(kwargs.get('restart', False)), 'limit': int(limit) if limit is not None else None}
+        if crawler_type == 'catalogue':
+            return {key: kwargs[key] for key in ('query', 'series_id', 'title', 'limit', 'crawler_type') if key in kwargs}
+        return {}
+    
+    def query_catalogue(self, query: str = 'series', series_id: str = '', title: str = '',
+                        limit: int = 20, crawler_type: Optional[str] = None) -> Dict[str, Any]:
+        """查询目录存储
+        
+        Args:
+            query: 'series'(按series_id) / 'search'(按title) / 'latest' / 'weekly' / 'runs'
+        """
+        limit = int(limit)
+        if query == 'series':
+            data = self.store.get_series(str(series_id))
+            if data is None:
+                return {'success': False, 'error': f'目录中没有该动漫: {series_id}', 'data': None}
+        elif query == 'search':
+            data = self.store.find_series(title, limit)
+        elif query == 'latest':
+            data = self.store.latest(limit)
+        elif query == 'weekly':
+            data = self.store.weekly_schedule()
+        elif query == 'runs':
+            data = self.store.recent_runs(crawler_type, limit)
+        else:
+            return {'success': False, 'error': f'不支持的查询: {query}', 'data': None}
+        
+        return {
+            'success': True,
+            'data': data,
+            'timestamp': datetime.now().isoformat()
+        }
+    
+    def _batch_urls(self, kwargs: Dict[str, Any]):
+        """批量解析的播放页列表：直接传入urls，或传入anime_id和集数范围start~end"""
+        urls = kwargs.get('urls')
+        if urls is None and kwargs.get('anime_id'):
+            start = int(kwargs.get('start', 1))
+            end = int(kwargs.get('end', start))
+            urls = [build_episode_url(str(kwargs['anime_id']), episode) for episode in range(start, end + 1)]
+        if not isinstance(urls, list) or not urls:
+            raise ValueError('需要urls列表，或anime_id和集数范围start/end')
+        if len(urls) > MAX_BATCH_SIZE:
+            raise ValueError(f'一次最多解析{MAX_BATCH_SIZE}集')
+        # 去重并保持顺序
+        return list(dict.fromkeys(normalize_url(str(url)) for url in urls))
+    
+    def _run_video_batch(self, urls, refresh: bool = False,
+                         on_partial: Optional[Callable[[Dict], None]] = None) -> Dict[str, Any]:
+        """批量解析视频URL，逐集读写 video 类型的缓存，缓存命中的集数最先返回"""
+        resolved = {}
+        if not refresh:
+            for url in urls:
+                cached = self.cache.get('video', {'url': url})
+                if cached is not None:
+                    resolved[url] = cached
+                    if on_partial:
+                        on_partial(cached)
+        
+        def on_result(result: Dict):
+            if result['success']:
+                self.cache.set('video', {'url': result['page_url']}, result)
+                self.store.record_videos([result])
+            if on_partial:
+                on_partial(result)
+        
+        missing = [url for url in urls if url not in resolved]
+        if missing:
+            fetched = get_video_urls(missing, on_result=on_result)
+            resolved.update(zip(missing, fetched['data']))
+        
+        data = [resolved[url] for url in urls]
+        failed = sum(1 for item in data if not item['success'])
+        return {
+            'success': failed < len(data),
+            'data': data,
+            'total': len(data),
+            'failed': failed,
+            'cached': len(urls) - len(missing),
+            'timestamp': datetime.now().isoformat()
+        }
+    
     def get_available_crawlers(self) -> Dict[str, str]:
         """获取可用的爬虫类型"""
         return {
@@ -79,22 +443,132 @@ class CrawlerManager:
             'all_anime': '获取完整动漫列表',
             'episodes': '获取动漫分集信息',
             'latest': '获取最新更新',
-            'video': '解析视频URL'
+            'weekly': '获取每周更新表',
+            'video': '解析视频URL',
+            'video_batch': '批量解析视频URL',
+            'catalogue_sync': '增量同步完整动漫列表',
+            'catalogue': '查询目录存储',
+            'deep_crawl': '深度爬取完整目录中每部动漫的分集（支持断点续爬）'
         }
+    
+    def handle_request(self, request: Dict[str, Any],
+                       emit: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """处理常驻模式下的单条请求
+        
+        Args:
+            request: {'id': 请求ID, 'type': 爬虫类型, 'params': 爬虫参数, 'stream': 是否流式}
+            emit: 流式请求用于在最终响应之前逐条写出 {'id': 请求ID, 'partial': 单条结果}
+            
+        Returns:
+            {'id': 请求ID, 'result': 爬虫响应字典}，流式请求的result不再包含已逐条写出的结果列表
+        """
+        request_id = request.get('id')
+        crawler_type = request.get('type', '')
+        
+        if crawler_type == 'ping':
+            return {'id': request_id, 'result': {'success': True, 'pong': True}}
+        
+        params = request.get('params') or {}
+        if not isinstance(params, dict):
+            return {
+                'id': request_id,
+                'result': {'success': False, 'error': 'params必须是对象', 'data': None}
+            }
+        
+        if not (emit and request.get('stream')):
+            return {'id': request_id, 'result': self.run_crawler(crawler_type, **params)}
+        
+        result = self.run_crawler(
+            crawler_type,
+            on_partial=lambda item: emit({'id': request_id, 'partial': item}),
+            **params
+        )
+        return {'id': request_id, 'result': summarize(crawler_type, result)}
+    
+    def serve(self, max_workers: int = 4):
+        """常驻模式：从stdin逐行读取JSON请求，向stdout逐行写出JSON响应
+        
+        进程在多次请求之间保持存活，模块只导入一次；请求在线程池中并发执行，
+        响应按完成顺序写出，调用方通过id匹配请求。
+        带 "stream": true 的请求在最终响应之前逐条写出 {'id', 'partial'} 形式的单条结果，
+        最终响应只包含汇总字段。
+        爬虫内部的print输出被重定向到stderr，避免污染协议通道。
+        """
+        out = sys.stdout
+        sys.stdout = sys.stderr
+        self.enable_prefetch()
+        for snapshot in self.snapshots.values():
+            snapshot.background = True
+        self.home_refresher.start()
+        write_lock = threading.Lock()
+        
+        def reply(response: Dict[str, Any]):
+            line = json_codec.dumps(response)
+            with write_lock:
+                out.write(line + '\n')
+                out.flush()
+        
+        def dispatch(request: Dict[str, Any]):
+            try:
+                response = self.handle_request(request, emit=reply)
+            except Exception as e:
+                response = {
+                    'id': request.get('id'),
+                    'result': {'success': False, 'error': str(e), 'data': None}
+                }
+            reply(response)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for line in sys.stdin:
+                line = line.strip()
+                if not line:
+                    continue
+                
+                try:
+                    request = json_codec.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError('请求必须是JSON对象')
+                except ValueError as e:
+                    reply({
+                        'id': None,
+                        'result': {'success': False, 'error': f'无效的请求: {e}', 'data': None}
+                    })
+                    continue
+                
+                executor.submit(dispatch, request)
 
 def main():
     """命令行接口"""
     if len(sys.argv) < 2:
         print("用法: python crawler_manager.py <crawler_type> [参数...]")
+        print("      python crawler_manager.py --serve [并发数]  (常驻模式，stdin/stdout JSON-lines协议)")
+        print("      python crawler_manager.py <crawler_type> [参数...] --stream  (逐条输出JSON-lines)")
+        print("      python crawler_manager.py <crawler_type> [参数...] --pretty  (缩进输出，默认紧凑)")
         print("可用爬虫类型:")
         manager = CrawlerManager()
         for crawler_type, description in manager.get_available_crawlers().items():
             print(f"  {crawler_type}: {description}")
         return
     
+    stream = '--stream' in sys.argv[2:]
+    pretty = json_codec.pretty_requested()
+    sys.argv = [arg for arg in json_codec.strip_pretty_flag(sys.argv) if arg != '--stream']
+    
     crawler_type = sys.argv[1]
     manager = CrawlerManager()
     
+    if crawler_type == '--serve':
+        max_workers = 4
+        if len(sys.argv) > 2:
+            try:
+                max_workers = max(1, int(sys.argv[2]))
+            except ValueError:
+                max_workers = 4
+        sys.stdout.reconfigure(encoding='utf-8')
+        sys.stdin.reconfigure(encoding='utf-8')
+        manager.serve(max_workers)
+        return
+    
     # 处理参数
     kwargs = {}
     if crawler_type == 'search' and len(sys.argv) > 2:
@@ -108,10 +582,41 @@ def main():
             kwargs['limit'] = 50
     elif crawler_type == 'video' and len(sys.argv) > 2:
         kwargs['url'] = sys.argv[2]
+    elif crawler_type == 'video_batch' and len(sys.argv) > 2:
+        # video_batch <url> [url...] 或 video_batch <anime_id> <start> <end>
+        if sys.argv[2].startswith('http'):
+            kwargs['urls'] = sys.argv[2:]
+        else:
+            kwargs['anime_id'] = sys.argv[2]
+            kwargs['start'] = sys.argv[3] if len(sys.argv) > 3 else 1
+            kwargs['end'] = sys.argv[4] if len(sys.argv) > 4 else kwargs['start']
+    elif crawler_type == 'catalogue_sync':
+        kwargs['with_details'] = '--no-details' not in sys.argv[2:]
+    elif crawler_type == 'deep_crawl':
+        # deep_crawl [数量] [--restart]
+        kwargs['restart'] = '--restart' in sys.argv[2:]
+        numbers = [arg for arg in sys.argv[2:] if arg.isdigit()]
+        if numbers:
+            kwargs['limit'] = int(numbers[0])
+    elif crawler_type == 'catalogue' and len(sys.argv) > 2:
+        # catalogue series <id> / catalogue search <标题> / catalogue latest|weekly|runs
+        kwargs['query'] = sys.argv[2]
+        if sys.argv[2] == 'series' and len(sys.argv) > 3:
+            kwargs['series_id'] = sys.argv[3]
+        elif sys.argv[2] == 'search':
+            kwargs['title'] = ' '.join(sys.argv[3:])
     
     # 运行爬虫
+    if stream:
+        # 爬虫内部的print输出转到stderr，stdout只输出JSON-lines记录
+        sys.stdout.reconfigure(encoding='utf-8')
+        out, sys.stdout = sys.stdout, sys.stderr
+        result = manager.run_crawler(crawler_type, on_partial=lambda item: emit_record('item', item, out), **kwargs)
+        emit_record('summary', summarize(crawler_type, result), out)
+        return
+    
     result = manager.run_crawler(crawler_type, **kwargs)
-    print(json.dumps(result, ensure_ascii=False, indent=2))
+    json_codec.print_json(result, pretty)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -6,12 +6,17 @@
 """
 
 import requests
-from bs4 import BeautifulSoup
-import json
 import urllib.parse
 from typing import List, Dict, Optional
 from datetime import datetime
 
+from http_client import get_client
+from html_parser import make_soup, TagStrainer
+from json_codec import print_json
+
+# 搜索结果页只需要构建结果列表
+RESULT_STRAINER = TagStrainer(classes=('lpic',))
+
 class SearchCrawler:
     """搜索爬虫类"""
     
@@ -23,6 +28,7 @@ class SearchCrawler:
             'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
             'Connection': 'keep-alive',
         }
+        self.client = get_client()
     
     def search(self, keyword: str, max_results: int = 50) -> List[Dict]:
         """搜索动漫
@@ -41,7 +47,7 @@ class SearchCrawler:
             encoded_keyword = urllib.parse.quote(keyword)
             search_url = f"{self.base_url}/search/{encoded_keyword}/"
             
-            response = requests.get(search_url, headers=self.headers, timeout=30)
+            response = self.client.get(search_url, headers=self.headers)
             response.raise_for_status()
             response.encoding = 'utf-8'
             
@@ -52,7 +58,7 @@ class SearchCrawler:
     
     def _parse_search_results(self, html_content: str, keyword: str, max_results: int) -> List[Dict]:
         """解析搜索结果"""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = make_soup(html_content, parse_only=RESULT_STRAINER)
         results = []
         
         # 查找搜索结果列表
@@ -150,4 +156,4 @@ def search_anime(keyword: str, max_results: int = 50) -> Dict:
 if __name__ == "__main__":
     # 测试函数
     result = search_anime("百妖谱")
-    print(json.dumps(result, ensure_ascii=False, indent=2))
\ No newline at end of file
+    print_json(result)
\ No newline at end of file
@@ -1,45 +1,130 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-import requests
-from bs4 import BeautifulSoup
 import json
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from http_client import get_client, CRAWLER_CONFIG
+from html_parser import make_soup
+from async_crawler import async_engine_enabled, get_engine
+
+PLAY_PAGE_URL = "http://www.iyinghua.com/v/{anime_id}-{episode}.html"
+
+def build_episode_url(anime_id: str, episode: int) -> str:
+    """根据动漫ID和集数构造播放页URL"""
+    return PLAY_PAGE_URL.format(anime_id=anime_id, episode=episode)
+
+def parse_episode_url(page_url: str) -> Optional[Tuple[str, int]]:
+    """从播放页URL中取出 (动漫ID, 集数)，不是播放页时返回None"""
+    match = re.search(r'/v/(\d+)-(\d+)\.html', page_url or '')
+    if not match:
+        return None
+    return match.group(1), int(match.group(2))
 
 def get_real_video_url(page_url: str) -> str:
-    """爬取真实视频URL并返回"""
+    """爬取真实视频URL并返回（用户在等待播放，超时不重试）"""
     try:
-        html = requests.get(page_url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=3).text
-        soup = BeautifulSoup(html, 'lxml')
+        html = get_client().get(page_url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=3, retries=0).text
+        return parse_video_base_url(html)
+    except Exception:
+        return ""
+
+def parse_video_base_url(html: str) -> str:
+    """从播放页面中解析视频基础URL"""
+    soup = make_soup(html)
+    
+    # 查找data-vid属性
+    vid = (soup.find('div', id='playbox') or {}).get('data-vid')
+    if not vid:
+        for div in soup.find_all('div', {'data-vid': True}):
+            if div.get('data-vid', '').startswith('http'):
+                vid = div['data-vid']
+                break
+    
+    if vid:
+        # 只提取干净的URL片段，不做任何拼接
+        # 去除/index.m3u8$mp4后缀，返回基础路径
+        base_path = vid.replace('/index.m3u8$mp4', '')
         
-        # 查找data-vid属性
-        vid = (soup.find('div', id='playbox') or {}).get('data-vid')
-        if not vid:
-            for div in soup.find_all('div', {'data-vid': True}):
-                if div.get('data-vid', '').startswith('http'):
-                    vid = div['data-vid']
-                    break
+        # 找到最后一个斜杠的位置，获取目录名
+        last_slash_index = base_path.rfind('/')
+        if last_slash_index != -1:
+            # 返回基础URL和目录名，让后端处理拼接
+            clean_base_url = base_path[:last_slash_index]  # 不包含最后一级目录
+            return clean_base_url
         
-        if vid:
-            # 只提取干净的URL片段，不做任何拼接
-            # 去除/index.m3u8$mp4后缀，返回基础路径
-            base_path = vid.replace('/index.m3u8$mp4', '')
-            
-            # 找到最后一个斜杠的位置，获取目录名
-            last_slash_index = base_path.rfind('/')
-            if last_slash_index != -1:
-                # 返回基础URL和目录名，让后端处理拼接
-                clean_base_url = base_path[:last_slash_index]  # 不包含最后一级目录
-                return clean_base_url
-            
-            # 如果没有斜杠，返回原始URL
-            return vid
-        return ""
-    except:
-        return ""
+        # 如果没有斜杠，返回原始URL
+        return vid
+    return ""
+
+def get_video_url(page_url: str) -> Dict:
+    """解析视频URL的API接口函数
+    
+    Args:
+        page_url: 播放页面URL
+        
+    Returns:
+        包含视频基础URL的响应字典
+    """
+    return _video_result(page_url, get_real_video_url(page_url))
+
+def _video_result(page_url: str, url: str) -> Dict:
+    return {
+        'success': bool(url),
+        'url': url,
+        'page_url': page_url,
+        'error': None if url else '未找到视频地址'
+    }
+
+def get_video_urls(page_urls: List[str], on_result: Optional[Callable[[Dict], None]] = None,
+                   max_workers: Optional[int] = None) -> Dict:
+    """并发解析多个播放页的视频URL
+
+    Args:
+        page_urls: 播放页面URL列表
+        on_result: 每解析完一个页面立即回调（按完成顺序），参数与 get_video_url 的返回值相同
+        max_workers: 线程池并发数，默认 MAX_CONCURRENT（启用异步引擎时不使用）
+
+    Returns:
+        data按输入顺序排列的响应字典
+    """
+    results: List[Optional[Dict]] = [None] * len(page_urls)
+
+    if page_urls and async_engine_enabled():
+        # 所有播放页在异步引擎中同时请求，请求失败与 get_real_video_url 一样视为未找到
+        def finish(index: int, url: Optional[str], error: Optional[BaseException]):
+            results[index] = _video_result(page_urls[index], url or '')
+            if on_result:
+                on_result(results[index])
+
+        get_engine().fetch_all(
+            page_urls, lambda page_url, html: parse_video_base_url(html), on_result=finish,
+            headers={'User-Agent': 'Mozilla/5.0'}, timeout=3, retries=0
+        )
+    elif page_urls:
+        max_workers = max_workers or CRAWLER_CONFIG['MAX_CONCURRENT']
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(page_urls))) as executor:
+            futures = {executor.submit(get_video_url, url): index for index, url in enumerate(page_urls)}
+            for future in as_completed(futures):
+                result = future.result()
+                results[futures[future]] = result
+                if on_result:
+                    on_result(result)
+
+    failed = sum(1 for result in results if not result['success'])
+    return {
+        'success': failed < len(results),
+        'data': results,
+        'total': len(results),
+        'failed': failed,
+        'timestamp': datetime.now().isoformat()
+    }
 
 if __name__ == "__main__":
     import os
-    import sys
     
     # 设置环境变量以支持UTF-8编码
     os.environ['PYTHONIOENCODING'] = 'utf-8'
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+樱花动漫首页数据定时刷新
+最新更新和每日更新（侧边栏 .tlist，即按星期分类的每周更新表）都来自同一个首页，
+原先各爬虫各自请求首页。这里每次只对首页发起一次条件请求，把同一份HTML交给所有首页解析器，
+分别写入 latest_updates.json、crawler_daily_update.json 和目录存储。
+常驻模式下由后台线程按 HOME_REFRESH_INTERVAL 定时执行，用户请求只读取快照，不等待这次抓取。
+
+用法:
+    python home_refresher.py            # 刷新一次
+    python home_refresher.py --loop     # 按配置的间隔持续刷新
+"""
+
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from catalogue_store import get_store
+from crawler_daily_update import DailyUpdateCrawler, load_weekly_updates
+from crawler_latest import LatestCrawler, load_previous_updates, save_latest_updates
+from http_client import CRAWLER_CONFIG
+from json_codec import print_json, strip_pretty_flag
+
+def refresh_home_feeds(limit: int = 50) -> Dict:
+    """抓取一次首页并更新所有首页数据
+
+    Args:
+        limit: 最新更新保存的条数
+
+    Returns:
+        {'success', 'not_modified', 'latest': 最新更新响应, 'weekly': 每周更新响应, 'timestamp'}
+    """
+    latest_crawler = LatestCrawler()
+    daily_crawler = DailyUpdateCrawler()
+    previous_latest = load_previous_updates(limit)
+    previous_weekly = load_weekly_updates()
+
+    try:
+        # 两份快照都在时才发条件请求，否则首页未变化也无法复用旧结果
+        response = latest_crawler.client.get_conditional(
+            latest_crawler.base_url,
+            headers=latest_crawler.headers,
+            revalidate=previous_latest is not None and previous_weekly is not None,
+            cache_key='home'
+        )
+    except Exception as e:
+        return {'success': False, 'error': f'获取首页失败: {e}', 'timestamp': datetime.now().isoformat()}
+
+    if not response.changed:
+        latest = save_latest_updates(previous_latest[:limit], limit, True, latest_crawler.base_url)
+        weekly = {**previous_weekly, 'not_modified': True}
+    else:
+        updates = latest_crawler._parse_latest_updates(response.text, limit)
+        latest = save_latest_updates(updates, limit, False, latest_crawler.base_url)
+        get_store().ingest('latest', {'limit': limit}, latest)
+
+        file_path = daily_crawler.update_from_html(response.text)
+        weekly = load_weekly_updates(file_path) if file_path else None
+        if weekly is None:
+            weekly = {
+                'success': False,
+                'error': '未能获取到有效的每日更新数据',
+                'data': {},
+                'timestamp': datetime.now().isoformat()
+            }
+        # 两份快照都更新成功后才保存验证信息，否则下次仍完整抓取并解析首页
+        if updates and 'file_save_error' not in latest and weekly['success']:
+            response.commit()
+
+    return {
+        'success': True,
+        'not_modified': not response.changed,
+        'latest': latest,
+        'weekly': weekly,
+        'timestamp': datetime.now().isoformat()
+    }
+
+class HomeFeedRefresher:
+    """后台线程按固定间隔刷新首页数据，启动时立即刷新一次"""
+
+    def __init__(self, refresh: Callable[[], Dict], interval: Optional[float] = None):
+        self.refresh = refresh
+        self.interval = CRAWLER_CONFIG['HOME_REFRESH_INTERVAL'] if interval is None else interval
+        self.last_result: Optional[Dict] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is not None or self.interval <= 0:
+            return
+        self._thread = threading.Thread(target=self._run, name='home-refresher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.last_result = self.refresh()
+                if not self.last_result.get('success'):
+                    print(f"首页数据刷新失败: {self.last_result.get('error')}")
+            except Exception as e:
+                print(f"首页数据刷新失败: {e}")
+            self._stop.wait(self.interval)
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding='utf-8')
+    args = strip_pretty_flag(sys.argv[1:])
+    if '--loop' in args:
+        refresher = HomeFeedRefresher(refresh_home_feeds)
+        refresher.start()
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            refresher.stop()
+    else:
+        print_json(refresh_home_feeds())
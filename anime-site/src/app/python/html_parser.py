@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+樱花动漫爬虫HTML解析后端
+所有爬虫通过 make_soup 创建BeautifulSoup对象，解析后端在此统一选择
+优先级: 环境变量 CRAWLER_HTML_PARSER > CRAWLER_CONFIG['HTML_PARSER'] > 'lxml'
+未安装的后端自动回退到标准库 html.parser
+"""
+
+import os
+from typing import Iterable, List, Optional
+
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer
+
+from http_client import CRAWLER_CONFIG
+
+# 按速度从快到慢排列
+SUPPORTED_BACKENDS = ['lxml', 'html.parser', 'html5lib']
+FALLBACK_BACKEND = 'html.parser'
+
+def available_backends() -> List[str]:
+    """获取当前环境中可用的解析后端"""
+    backends = []
+    for backend in SUPPORTED_BACKENDS:
+        try:
+            BeautifulSoup('', backend)
+        except FeatureNotFound:
+            continue
+        backends.append(backend)
+    return backends
+
+def _resolve_backend(name: Optional[str]) -> str:
+    """校验解析后端，不可用时回退到 html.parser"""
+    if name in available_backends():
+        return name
+    return FALLBACK_BACKEND
+
+_backend = _resolve_backend(os.getenv('CRAWLER_HTML_PARSER') or CRAWLER_CONFIG['HTML_PARSER'])
+
+def get_backend() -> str:
+    """获取当前使用的解析后端"""
+    return _backend
+
+def set_backend(name: str) -> str:
+    """切换解析后端（基准测试使用），返回实际生效的后端"""
+    global _backend
+    _backend = _resolve_backend(name)
+    return _backend
+
+class TagStrainer(SoupStrainer):
+    """按"标签名 或 class 或 id 或 属性存在"的任一条件筛选要构建的子树
+
+    SoupStrainer本身只能表达"且"的关系，这里改为"或"，
+    用于只构建页面中需要的几个区域。兼容bs4 4.12(search_tag)和4.13+(allow_tag_creation)。
+    """
+
+    def __init__(self, names: Iterable[str] = (), classes: Iterable[str] = (), ids: Iterable[str] = (),
+                 attrs_present: Iterable[str] = (), meta_names: Iterable[str] = ()):
+        super().__init__()
+        self.tag_names = frozenset(names)
+        self.classes = frozenset(classes)
+        self.ids = frozenset(ids)
+        self.attrs_present = frozenset(attrs_present)
+        self.meta_names = frozenset(meta_names)
+
+    @property
+    def includes_everything(self) -> bool:
+        return False
+
+    @property
+    def excludes_everything(self) -> bool:
+        return False
+
+    def _allow(self, name: str, attrs) -> bool:
+        if name in self.tag_names:
+            return True
+        attrs = attrs or {}
+        if name == 'meta' and attrs.get('name') in self.meta_names:
+            return True
+        if attrs.get('id') in self.ids:
+            return True
+        if any(attr in attrs for attr in self.attrs_present):
+            return True
+        class_value = attrs.get('class') or ''
+        class_names = class_value.split() if isinstance(class_value, str) else class_value
+        return any(class_name in self.classes for class_name in class_names)
+
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        return self._allow(name, attrs)
+
+    def allow_string_creation(self, string) -> bool:
+        # 被保留子树之外的顶层文本一律丢弃
+        return False
+
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        if hasattr(markup_name, 'attrs'):
+            return self._allow(markup_name.name, markup_name.attrs)
+        return self._allow(markup_name, dict(markup_attrs))
+
+def make_soup(html, parse_only=None) -> BeautifulSoup:
+    """使用当前解析后端解析HTML
+
+    Args:
+        html: 页面内容（str或bytes）
+        parse_only: 可选的SoupStrainer，只构建需要的子树
+
+    Returns:
+        BeautifulSoup对象
+    """
+    return BeautifulSoup(html, _backend, parse_only=parse_only)
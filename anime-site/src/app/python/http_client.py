@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+樱花动漫爬虫共享HTTP客户端
+所有爬虫复用同一个带连接池的Session，保持长连接，避免每次请求重新握手
+超时与重试参数读取自 crawler/config.py 的 CRAWLER_CONFIG
+支持基于ETag/Last-Modified/内容哈希的条件请求，页面未变化时跳过解析
+请求按站点限速，429/5xx/超时按指数退避+随机抖动重试，并遵守Retry-After
+"""
+
+import hashlib
+import importlib.util
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from rate_limiter import RateLimiter, backoff_delay, parse_retry_after
+
+# brotli为可选依赖，安装后（urllib3自动使用）才声明支持br压缩
+if importlib.util.find_spec('brotli') or importlib.util.find_spec('brotlicffi'):
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+else:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+# crawler/config.py 不可用时使用的默认配置
+DEFAULT_CONFIG = {
+    'REQUEST_DELAY': 1.0,
+    'MAX_RETRIES': 3,
+    'RETRY_DELAY': 2.0,
+    'RETRY_MAX_DELAY': 30.0,
+    'REQUEST_TIMEOUT': 10,
+    'USER_AGENT': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'MAX_CONCURRENT': 5,
+    'PREFETCH_EPISODES': 3,
+    'HTML_PARSER': 'lxml',
+    'POOL_CONNECTIONS': 10,
+    'POOL_MAXSIZE': 10,
+    'ASYNC_ENGINE': True,
+    'ASYNC_MAX_CONNECTIONS': 100,
+    'ASYNC_MAX_IN_FLIGHT': 200,
+    'PARSE_WORKERS': 0,
+    'PARSE_POOL_MIN_PAGES': 20,
+    'DEEP_CRAWL_BATCH': 50,
+    'LOCAL_SEARCH_MIN_RESULTS': 5,
+    'RATE_LIMIT_BURST': 5,
+    'RATE_LIMITS': {'iyinghua.com': 0.2},
+    'CACHE_ENABLED': True,
+    'CACHE_TTL': 3600,
+    'CACHE_TTL_BY_TYPE': {},
+    'SNAPSHOT_SOFT_TTL': {'latest': 300, 'weekly': 1800},
+    'SNAPSHOT_HARD_TTL': {'latest': 3600, 'weekly': 86400},
+    'HOME_REFRESH_INTERVAL': 300,
+    'CACHE_MEMORY_ENTRIES': 256,
+    'CACHE_DISK_ENTRIES': 5000
+}
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'crawler', 'config.py')
+VALIDATOR_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'data', 'crawler_cache.db')
+
+def load_crawler_config() -> Dict:
+    """加载 crawler/config.py 中的 CRAWLER_CONFIG，缺失的键使用默认值"""
+    config = dict(DEFAULT_CONFIG)
+    try:
+        spec = importlib.util.spec_from_file_location('crawler_config', CONFIG_PATH)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        config.update(getattr(module, 'CRAWLER_CONFIG', {}))
+        data_sources = getattr(module, 'DATA_SOURCES', None)
+        if data_sources:
+            # 数据源的rate_limit为同一站点两次请求的最小间隔(秒)
+            config['RATE_LIMITS'] = {
+                urlsplit(source['base_url']).hostname: source['rate_limit']
+                for source in data_sources.values()
+                if source.get('enabled', True) and 'rate_limit' in source
+            }
+    except (ImportError, OSError):
+        # 配置文件缺失或依赖(python-dotenv)未安装
+        pass
+    return config
+
+CRAWLER_CONFIG = load_crawler_config()
+
+class ValidatorStore:
+    """按URL保存ETag/Last-Modified和内容哈希，用于条件请求"""
+
+    def __init__(self, db_path: Optional[str] = VALIDATOR_DB_PATH):
+        self._memory: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._db = None
+
+        if db_path:
+            try:
+                os.makedirs(os.path.dirname(db_path), exist_ok=True)
+                self._db = sqlite3.connect(db_path, check_same_thread=False)
+                self._db.execute(
+                    'CREATE TABLE IF NOT EXISTS http_validators ('
+                    'key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, content_hash TEXT)'
+                )
+                self._db.commit()
+            except (OSError, sqlite3.Error):
+                # 磁盘不可写时只在内存中保存
+                self._db = None
+
+    def get(self, key: str) -> Optional[Dict]:
+        """读取验证信息"""
+        with self._lock:
+            if key in self._memory:
+                return dict(self._memory[key])
+            if self._db is None:
+                return None
+            try:
+                row = self._db.execute(
+                    'SELECT etag, last_modified, content_hash FROM http_validators WHERE key = ?', (key,)
+                ).fetchone()
+            except sqlite3.Error:
+                return None
+            if row is None:
+                return None
+            validators = {'etag': row[0], 'last_modified': row[1], 'content_hash': row[2]}
+            self._memory[key] = validators
+            return dict(validators)
+
+    def set(self, key: str, validators: Dict):
+        """保存验证信息"""
+        with self._lock:
+            self._memory[key] = dict(validators)
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO http_validators (key, etag, last_modified, content_hash) '
+                    'VALUES (?, ?, ?, ?)',
+                    (key, validators.get('etag'), validators.get('last_modified'), validators.get('content_hash'))
+                )
+                self._db.commit()
+            except sqlite3.Error:
+                pass
+
+class ConditionalResponse:
+    """条件请求结果，changed为False时text为None，调用方应直接复用上次的解析结果
+
+    changed为True时新的验证信息尚未保存，调用方解析并写入快照成功后调用 commit()；
+    失败时不调用，下次请求不会误判为未变化
+    """
+
+    def __init__(self, status_code: int, changed: bool, text: Optional[str] = None, content_hash: str = '',
+                 on_commit: Optional[Callable[[], None]] = None):
+        self.status_code = status_code
+        self.changed = changed
+        self.text = text
+        self.content_hash = content_hash
+        self._on_commit = on_commit
+
+    def commit(self):
+        """保存本次响应的验证信息"""
+        if self._on_commit is not None:
+            self._on_commit()
+            self._on_commit = None
+
+# 需要退避重试的状态码
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+# 表示源站过载的状态码，整个站点降速并暂停，其余错误只让当前请求等待
+OVERLOAD_STATUSES = frozenset([429, 503])
+
+class HttpClient:
+    """带连接池、按站点限速和自动重试的HTTP客户端"""
+
+    def __init__(self, config: Optional[Dict] = None, host_pool_sizes: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            config: 爬虫配置，默认使用 CRAWLER_CONFIG
+            host_pool_sizes: 按主机单独指定连接池大小，如 {'http://www.iyinghua.com': 20}
+        """
+        self.config = config or CRAWLER_CONFIG
+        self.timeout = self.config['REQUEST_TIMEOUT']
+        self.validators = ValidatorStore()
+        self.rate_limiter = RateLimiter(
+            self.config['REQUEST_DELAY'],
+            self.config['RATE_LIMITS'],
+            burst=self.config['RATE_LIMIT_BURST'],
+        )
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': self.config['USER_AGENT'],
+            'Accept-Encoding': ACCEPT_ENCODING,
+            'Connection': 'keep-alive',
+        })
+
+        default_adapter = self._build_adapter(self.config['POOL_MAXSIZE'])
+        self.session.mount('http://', default_adapter)
+        self.session.mount('https://', default_adapter)
+
+        for host_prefix, pool_size in (host_pool_sizes or {}).items():
+            self.session.mount(host_prefix, self._build_adapter(pool_size))
+
+    def _build_adapter(self, pool_maxsize: int) -> HTTPAdapter:
+        """创建连接池适配器（重试由 get 统一处理，以便和限速器配合）"""
+        return HTTPAdapter(
+            pool_connections=self.config['POOL_CONNECTIONS'],
+            pool_maxsize=pool_maxsize,
+        )
+
+    def _retry_delay(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """计算下次重试前的等待时间，优先使用源站给出的Retry-After"""
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                return min(retry_after, self.config['RETRY_MAX_DELAY'])
+        return backoff_delay(attempt, self.config['RETRY_DELAY'], self.config['RETRY_MAX_DELAY'])
+
+    def get(self, url: str, headers: Optional[Dict] = None, timeout: Optional[float] = None,
+            retries: Optional[int] = None, **kwargs) -> requests.Response:
+        """发送GET请求
+
+        每次尝试前从站点令牌桶取令牌；遇到429/5xx/超时/连接错误时退避后重试，
+        其中只有429/503会让整个站点降速并暂停（单次超时多半是客户端超时设得短，只让当前请求等待）。
+        最多重试 retries 次，重试耗尽后返回最后一次响应，或抛出最后一次异常。
+
+        Args:
+            url: 请求URL
+            headers: 额外请求头，覆盖Session默认值
+            timeout: 超时时间(秒)，默认使用 REQUEST_TIMEOUT
+            retries: 最多重试次数，默认 MAX_RETRIES；对延迟敏感的调用传0直接失败
+
+        Returns:
+            requests.Response
+        """
+        timeout = timeout if timeout is not None else self.timeout
+        max_retries = self.config['MAX_RETRIES'] if retries is None else retries
+
+        for attempt in range(max_retries + 1):
+            self.rate_limiter.acquire(url)
+            try:
+                response = self.session.get(url, headers=headers, timeout=timeout, **kwargs)
+            except (requests.Timeout, requests.ConnectionError):
+                if attempt == max_retries:
+                    raise
+                time.sleep(self._retry_delay(attempt))
+                continue
+
+            if response.status_code not in RETRY_STATUSES:
+                self.rate_limiter.succeeded(url)
+                return response
+            if attempt == max_retries:
+                return response
+
+            response.close()
+            delay = self._retry_delay(attempt, response)
+            if response.status_code in OVERLOAD_STATUSES:
+                self.rate_limiter.throttled(url, delay)
+            else:
+                time.sleep(delay)
+
+        return response
+
+    def get_conditional(self, url: str, headers: Optional[Dict] = None, timeout: Optional[float] = None,
+                        revalidate: bool = True, cache_key: str = '') -> ConditionalResponse:
+        """带ETag/Last-Modified的条件GET请求
+
+        源站返回304，或返回200但内容哈希与上次相同时，视为未变化。
+        不同调用方各自保存上次的解析结果，因此需要用cache_key区分验证信息，
+        避免一方更新了验证信息而另一方误判为未变化。
+
+        Args:
+            url: 请求URL
+            headers: 额外请求头
+            timeout: 超时时间(秒)
+            revalidate: 为False时发送普通请求（调用方没有可复用的旧结果），但仍记录验证信息
+            cache_key: 调用方标识
+
+        Returns:
+            ConditionalResponse，内容有变化时调用方处理成功后需调用其 commit()
+        """
+        key = f"{cache_key}|{url}"
+        previous = self.validators.get(key) if revalidate else None
+
+        request_headers = dict(headers or {})
+        if previous:
+            if previous.get('etag'):
+                request_headers['If-None-Match'] = previous['etag']
+            if previous.get('last_modified'):
+                request_headers['If-Modified-Since'] = previous['last_modified']
+
+        response = self.get(url, headers=request_headers, timeout=timeout)
+        if response.status_code == 304 and previous:
+            return ConditionalResponse(304, False, content_hash=previous.get('content_hash') or '')
+
+        response.raise_for_status()
+        response.encoding = 'utf-8'
+        content_hash = hashlib.sha256(response.content).hexdigest()
+
+        validators = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'content_hash': content_hash
+        }
+
+        if previous and previous.get('content_hash') == content_hash:
+            # 内容未变化，上次的解析结果仍然有效，可以直接更新验证信息
+            self.validators.set(key, validators)
+            return ConditionalResponse(response.status_code, False, content_hash=content_hash)
+
+        return ConditionalResponse(response.status_code, True, response.text, content_hash,
+                                   on_commit=lambda: self.validators.set(key, validators))
+
+    def close(self):
+        """关闭所有连接"""
+        self.session.close()
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+def get_client() -> HttpClient:
+    """获取进程内共享的HTTP客户端"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
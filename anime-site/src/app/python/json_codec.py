@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+爬虫统一JSON序列化
+按 orjson > ujson > 标准库 的顺序选择可用后端，环境变量 CRAWLER_JSON_BACKEND 可强制指定。
+默认输出紧凑JSON（供Next.js等程序读取）；命令行加 --pretty 或设置 CRAWLER_JSON_PRETTY=1 时缩进输出
+"""
+
+import json
+import os
+import sys
+from typing import Any, Callable, Dict, Tuple
+
+PRETTY_FLAG = '--pretty'
+
+def _stdlib_dumps(data: Any, pretty: bool) -> bytes:
+    if pretty:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _load_backends() -> Dict[str, Tuple[Callable[[Any, bool], bytes], Callable[[Any], Any]]]:
+    """可用后端：名称 -> (dumps(data, pretty) -> bytes, loads)，按优先级排列"""
+    backends = {}
+    try:
+        import orjson
+
+        def orjson_dumps(data: Any, pretty: bool) -> bytes:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+
+        backends['orjson'] = (orjson_dumps, orjson.loads)
+    except ImportError:
+        pass
+    try:
+        import ujson
+
+        def ujson_dumps(data: Any, pretty: bool) -> bytes:
+            return ujson.dumps(
+                data, ensure_ascii=False, escape_forward_slashes=False, indent=2 if pretty else 0
+            ).encode('utf-8')
+
+        backends['ujson'] = (ujson_dumps, ujson.loads)
+    except ImportError:
+        pass
+    backends['json'] = (_stdlib_dumps, json.loads)
+    return backends
+
+BACKENDS = _load_backends()
+
+def _select_backend() -> str:
+    forced = os.getenv('CRAWLER_JSON_BACKEND', '').strip().lower()
+    if forced in BACKENDS:
+        return forced
+    return next(iter(BACKENDS))
+
+_backend = _select_backend()
+
+def get_backend() -> str:
+    return _backend
+
+def set_backend(name: str):
+    """切换后端（基准测试用）"""
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f'不可用的JSON后端: {name}，可用: {", ".join(BACKENDS)}')
+    _backend = name
+
+def dumps_bytes(data: Any, pretty: bool = False) -> bytes:
+    """序列化为UTF-8字节，快速后端不支持的数据（如超出64位的整数）回退到标准库"""
+    try:
+        return BACKENDS[_backend][0](data, pretty)
+    except (TypeError, OverflowError):
+        if _backend == 'json':
+            raise
+        return _stdlib_dumps(data, pretty)
+
+def dumps(data: Any, pretty: bool = False) -> str:
+    return dumps_bytes(data, pretty).decode('utf-8')
+
+def loads(text):
+    """反序列化，解析失败时抛出 ValueError"""
+    return BACKENDS[_backend][1](text)
+
+def pretty_requested() -> bool:
+    return PRETTY_FLAG in sys.argv[1:] or os.getenv('CRAWLER_JSON_PRETTY', '').lower() in ('1', 'true', 'yes')
+
+def strip_pretty_flag(argv):
+    """去掉命令行中的 --pretty，避免被当作爬虫参数"""
+    return [arg for arg in argv if arg != PRETTY_FLAG]
+
+def print_json(data: Any, pretty: bool = None):
+    """命令行输出结果，默认紧凑，--pretty 时缩进"""
+    if pretty is None:
+        pretty = pretty_requested()
+    print(dumps(data, pretty))
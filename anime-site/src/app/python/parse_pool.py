@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+樱花动漫页面解析进程池
+请求是I/O密集的，而BeautifulSoup解析是CPU密集的且受GIL限制，完整目录爬取时数百个详情页的解析
+会串行在一个核上。这里把抓到的HTML字节交给 ProcessPoolExecutor 中的解析进程，
+进程内复用分集爬虫的解析逻辑，只返回精简后的字典，解析可以用满所有核心。
+
+页面数少于 PARSE_POOL_MIN_PAGES 或只有一个可用核心时直接在当前进程解析（进程启动和传输的开销不划算）。
+"""
+
+import asyncio
+import atexit
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Union
+
+from http_client import CRAWLER_CONFIG
+
+# ---------- 在解析进程中执行的函数（必须是模块级函数才能被pickle） ----------
+
+_crawler = None
+
+def _episodes_crawler():
+    """每个解析进程创建一次分集爬虫，只使用其解析方法"""
+    global _crawler
+    if _crawler is None:
+        from crawler_episodes import EpisodesCrawler
+        _crawler = EpisodesCrawler()
+    return _crawler
+
+def _text(html: Union[str, bytes]) -> str:
+    return html.decode('utf-8', errors='replace') if isinstance(html, bytes) else html
+
+def parse_detail_summary(url: str, html: Union[str, bytes]) -> Dict:
+    """解析详情页，只返回目录详情需要的字段：{'title', 'cover_image', 'episodes': [{'episode', 'title', 'url'}]}"""
+    page = _episodes_crawler()._parse_detail_page(_text(html), with_details=False)
+    return {
+        'title': page['title'],
+        'cover_image': page['cover_image'],
+        'episodes': [
+            {'episode': episode['episode'], 'title': episode['title'], 'url': episode['url']}
+            for episode in page['episodes']
+        ],
+    }
+
+def _init_worker():
+    """解析进程的标准输出指向标准错误
+
+    解析进程继承父进程的文件描述符1，常驻模式下它是与 crawler-worker.ts 通信的JSON-lines管道，
+    父进程中的 sys.stdout = sys.stderr 只替换了Python对象，子进程的任何输出都会污染协议通道
+    """
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+
+# ---------- 进程池 ----------
+
+def _worker_count() -> int:
+    configured = CRAWLER_CONFIG['PARSE_WORKERS']
+    return configured if configured > 0 else (os.cpu_count() or 1)
+
+class ParsePool:
+    """解析进程池，进程异常退出后自动回退为当前进程解析"""
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers or _worker_count()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._broken = False
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 1 and not self._broken
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        with self._lock:
+            if self._executor is None and self.enabled:
+                # spawn：父进程中有事件循环线程和SQLite连接，fork可能复制到不一致的锁状态
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker
+                )
+            return self._executor
+
+    def _mark_broken(self):
+        with self._lock:
+            self._broken = True
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        print("解析进程池异常，改为在当前进程中解析")
+
+    def parse(self, func: Callable[[str, Union[str, bytes]], Any], url: str, html: Union[str, bytes]) -> Any:
+        """在解析进程中执行 func(url, html)，阻塞等待结果"""
+        executor = self._get_executor()
+        if executor is not None:
+            try:
+                return executor.submit(func, url, html).result()
+            except BrokenProcessPool:
+                self._mark_broken()
+        return func(url, html)
+
+    async def parse_async(self, func: Callable[[str, Union[str, bytes]], Any], url: str,
+                          html: Union[str, bytes]) -> Any:
+        """在解析进程中执行 func(url, html)，等待期间事件循环继续处理其他请求"""
+        executor = self._get_executor()
+        if executor is not None:
+            try:
+                return await asyncio.wrap_future(executor.submit(func, url, html))
+            except BrokenProcessPool:
+                self._mark_broken()
+        return func(url, html)
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+_pool: Optional[ParsePool] = None
+_pool_lock = threading.Lock()
+
+def get_parse_pool(page_count: int) -> Optional[ParsePool]:
+    """页面数达到 PARSE_POOL_MIN_PAGES 且有多个核心时返回共享的解析进程池，否则返回None（当前进程解析）"""
+    global _pool
+    if page_count < CRAWLER_CONFIG['PARSE_POOL_MIN_PAGES']:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ParsePool()
+                atexit.register(_pool.close)
+    return _pool if _pool.enabled else None
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+樱花动漫爬虫按站点限速
+每个站点一个令牌桶，所有线程共享，保证并发抓取时对源站的请求速率不超过配置值
+源站返回429/503时降低该站点速率并整体暂停，之后随成功请求逐步恢复
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+def site_key(url: str) -> str:
+    """取URL的站点域名，www/m/tup等子域名共享同一个令牌桶"""
+    hostname = (urlsplit(url).hostname or '').lower()
+    labels = hostname.split('.')
+    return '.'.join(labels[-2:]) if len(labels) > 2 else hostname
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析Retry-After响应头（秒数或HTTP日期），返回需要等待的秒数"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """指数退避 + full jitter：在 [0, base_delay * 2^attempt] 内随机取值"""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+class TokenBucket:
+    """令牌桶，rate为每秒补充的令牌数，burst为桶容量"""
+
+    # 被限流后速率最低降到配置值的比例
+    MIN_RATE_RATIO = 0.1
+    # 每次成功请求恢复的速率比例
+    RECOVERY_RATIO = 0.05
+
+    def __init__(self, rate: float, burst: int):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def try_acquire(self) -> float:
+        """尝试取一个令牌，成功返回0，否则返回需要等待的秒数（供异步客户端非阻塞等待）"""
+        with self._lock:
+            now = time.monotonic()
+            if now < self.paused_until:
+                return self.paused_until - now
+            self._refill(now)
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self):
+        """取一个令牌，令牌不足或处于暂停期时阻塞等待"""
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """整个站点暂停一段时间，并清空已积累的令牌"""
+        with self._lock:
+            now = time.monotonic()
+            self.paused_until = max(self.paused_until, now + seconds)
+            self.tokens = 0.0
+            self.updated_at = self.paused_until
+
+    def slow_down(self):
+        """被限流时速率减半"""
+        with self._lock:
+            self.rate = max(self.max_rate * self.MIN_RATE_RATIO, self.rate / 2)
+
+    def speed_up(self):
+        """请求成功后逐步恢复到配置速率"""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * self.RECOVERY_RATIO)
+
+class RateLimiter:
+    """按站点划分的令牌桶集合"""
+
+    def __init__(self, default_interval: float, intervals: Optional[Dict[str, float]] = None, burst: int = 1):
+        """
+        Args:
+            default_interval: 未单独配置的站点两次请求的最小间隔(秒)
+            intervals: 按站点域名配置的请求间隔，如 {'iyinghua.com': 0.2}
+            burst: 允许的突发请求数
+        """
+        self.default_interval = default_interval
+        self.intervals = {site_key('//' + host): interval for host, interval in (intervals or {}).items()}
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url: str) -> Optional[TokenBucket]:
+        """获取URL所属站点的令牌桶，间隔为0的站点不限速"""
+        key = site_key(url)
+        with self._lock:
+            if key not in self._buckets:
+                interval = self.intervals.get(key, self.default_interval)
+                self._buckets[key] = TokenBucket(1.0 / interval, self.burst) if interval > 0 else None
+            return self._buckets[key]
+
+    def acquire(self, url: str):
+        bucket = self.bucket(url)
+        if bucket is not None:
+            bucket.acquire()
+
+    def try_acquire(self, url: str) -> float:
+        bucket = self.bucket(url)
+        return bucket.try_acquire() if bucket is not None else 0.0
+
+    def throttled(self, url: str, delay: float):
+        """源站限流或出错：降低速率并暂停该站点delay秒"""
+        bucket = self.bucket(url)
+        if bucket is not None:
+            bucket.slow_down()
+            bucket.pause(delay)
+
+    def succeeded(self, url: str):
+        bucket = self.bucket(url)
+        if bucket is not None:
+            bucket.speed_up()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地动漫搜索索引
+以目录存储中的动漫（完整列表、详情页、历史搜索结果写入的条目）建立倒排索引：
+  - 标题及类型/标签/地区按字符一元和二元切分（中文无需分词，英文同样适用）
+  - 标题的拼音首字母单独建索引，支持 "msj" 搜到 "牧神记"
+查询时取各个n-gram倒排表的交集，再以子串匹配校验并打分，整个过程不发起网络请求。
+目录存储有写入时下次查询前自动重建索引（深度爬取按批写入，每批只重建一次）
+"""
+
+import re
+import threading
+import unicodedata
+from typing import Dict, List, Optional, Set
+
+from catalogue_store import CatalogueStore, get_store
+from crawler_episodes import build_anime_url
+
+# pypinyin为可选依赖，未安装时用GB2312编码区间推算一级汉字的首字母
+try:
+    from pypinyin import Style, lazy_pinyin
+except ImportError:
+    lazy_pinyin = None
+
+# GB2312一级汉字按拼音排序，各首字母的起始区位码
+GB2312_INITIALS = (
+    (45217, 'a'), (45253, 'b'), (45761, 'c'), (46318, 'd'), (46826, 'e'), (47010, 'f'),
+    (47297, 'g'), (47614, 'h'), (48119, 'j'), (49062, 'k'), (49324, 'l'), (49896, 'm'),
+    (50371, 'n'), (50614, 'o'), (50622, 'p'), (50906, 'q'), (51387, 'r'), (51446, 's'),
+    (52218, 't'), (52698, 'w'), (52980, 'x'), (53689, 'y'), (54481, 'z'),
+)
+GB2312_LEVEL1_END = 55289
+
+# 拼音首字母n-gram的前缀，与文字n-gram区分
+INITIALS_PREFIX = '#'
+
+# 打分：标题完全匹配 > 标题前缀 > 标题包含 > 拼音首字母 > 类型/标签
+SCORE_TITLE_EXACT = 100
+SCORE_TITLE_PREFIX = 80
+SCORE_TITLE_CONTAINS = 60
+SCORE_INITIALS_PREFIX = 50
+SCORE_INITIALS_CONTAINS = 40
+SCORE_EXTRA = 10
+
+def normalize(text: str) -> str:
+    """全角转半角、转小写并去掉空白和标点"""
+    return re.sub(r'[\W_]+', '', unicodedata.normalize('NFKC', text or '').lower())
+
+def _char_initial(char: str) -> str:
+    if char.isascii():
+        return char if char.isalnum() else ''
+    try:
+        encoded = char.encode('gb2312')
+    except UnicodeEncodeError:
+        return ''
+    if len(encoded) != 2:
+        return ''
+    code = (encoded[0] << 8) + encoded[1]
+    if code < GB2312_INITIALS[0][0] or code > GB2312_LEVEL1_END:
+        return ''
+    initial = ''
+    for start, letter in GB2312_INITIALS:
+        if code < start:
+            break
+        initial = letter
+    return initial
+
+def pinyin_initials(text: str) -> str:
+    """标题的拼音首字母（英文和数字保留原字符）"""
+    text = normalize(text)
+    if lazy_pinyin is not None:
+        return ''.join(
+            syllable[0] for syllable in lazy_pinyin(text, style=Style.FIRST_LETTER, errors='default')
+            if syllable and syllable[0].isalnum()
+        ).lower()
+    return ''.join(_char_initial(char) for char in text)
+
+def ngrams(text: str) -> Set[str]:
+    """已规范化文本的一元和二元切分"""
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    return grams
+
+def query_grams(text: str) -> Set[str]:
+    """查询只需要二元（单字查询用一元），交集更小"""
+    if len(text) == 1:
+        return {text}
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+class SearchIndex:
+    """目录存储上的内存倒排索引"""
+
+    def __init__(self, store: Optional[CatalogueStore] = None):
+        self.store = store or get_store()
+        self._lock = threading.Lock()
+        self._version = None
+        self._docs: List[Dict] = []
+        self._postings: Dict[str, Set[int]] = {}
+
+    def _ensure_fresh(self):
+        version = self.store.series_version
+        if version == self._version:
+            return
+        with self._lock:
+            if version != self._version:
+                self._build(self.store.all_series())
+                self._version = version
+
+    def _build(self, series_list: List[Dict]):
+        docs = []
+        postings: Dict[str, Set[int]] = {}
+        for series in series_list:
+            title = normalize(series.get('title'))
+            if not title:
+                continue
+            extra = normalize(''.join(
+                (series.get('genres') or []) + (series.get('tags') or [])
+                + [series.get('region') or '', series.get('category') or '']
+            ))
+            initials = pinyin_initials(series['title'])
+
+            doc_id = len(docs)
+            docs.append({'series': series, 'title': title, 'initials': initials, 'extra': extra})
+            for gram in ngrams(title) | ngrams(extra):
+                postings.setdefault(gram, set()).add(doc_id)
+            for gram in ngrams(initials):
+                postings.setdefault(INITIALS_PREFIX + gram, set()).add(doc_id)
+        self._docs, self._postings = docs, postings
+
+    def _candidates(self, grams: Set[str], prefix: str = '') -> Set[int]:
+        result = None
+        # 从最短的倒排表开始求交集
+        for gram in sorted(grams, key=lambda g: len(self._postings.get(prefix + g, ()))):
+            posting = self._postings.get(prefix + gram)
+            if not posting:
+                return set()
+            result = set(posting) if result is None else result & posting
+            if not result:
+                break
+        return result or set()
+
+    @staticmethod
+    def _score(doc: Dict, query: str) -> int:
+        title = doc['title']
+        if title == query:
+            return SCORE_TITLE_EXACT
+        if title.startswith(query):
+            return SCORE_TITLE_PREFIX
+        if query in title:
+            return SCORE_TITLE_CONTAINS
+        if doc['initials'].startswith(query):
+            return SCORE_INITIALS_PREFIX
+        if query in doc['initials']:
+            return SCORE_INITIALS_CONTAINS
+        if query in doc['extra']:
+            return SCORE_EXTRA
+        return 0
+
+    def search(self, keyword: str, limit: int = 50) -> List[Dict]:
+        """查询本地索引，返回与在线搜索相同格式的结果"""
+        query = normalize(keyword)
+        if not query:
+            return []
+        self._ensure_fresh()
+
+        grams = query_grams(query)
+        candidates = self._candidates(grams)
+        if query.isascii():
+            candidates |= self._candidates(grams, INITIALS_PREFIX)
+
+        scored = []
+        for doc_id in candidates:
+            doc = self._docs[doc_id]
+            score = self._score(doc, query)
+            if score:
+                # 同分时最新更新中的靠前，其次标题短的（更接近查询）靠前
+                latest_rank = doc['series'].get('latest_rank') or float('inf')
+                scored.append((-score, latest_rank, len(doc['title']), doc_id))
+        scored.sort()
+        return [self._result(self._docs[entry[-1]]['series'], keyword) for entry in scored[:limit]]
+
+    @staticmethod
+    def _result(series: Dict, keyword: str) -> Dict:
+        return {
+            'cover_image': series.get('cover_image') or '',
+            'title': series['title'],
+            'detail_url': build_anime_url(series['id']),
+            'episodes': series.get('episode_info') or '',
+            'genres': series.get('genres') or [],
+            'description': series.get('description') or '',
+            'search_keyword': keyword,
+        }
+
+    def stats(self) -> Dict:
+        return {'documents': len(self._docs), 'terms': len(self._postings)}
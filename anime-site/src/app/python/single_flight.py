@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+樱花动漫爬虫请求合并（single-flight）
+同一时刻相同键（爬虫类型 + 标准化参数）的请求只执行一次爬取，后到的请求等待并共享同一个结果，
+新集数上线时大量访客同时打开同一部动漫，只会对源站发起一次抓取。
+流式请求中途加入时先补发已产生的部分结果，再实时接收后续部分结果。
+"""
+
+import copy
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+PartialCallback = Callable[[Dict], None]
+
+class _Subscriber:
+    """订阅者及其已收到的部分结果数"""
+
+    def __init__(self, callback: PartialCallback):
+        self.callback = callback
+        self.sent = 0
+        self.lock = threading.Lock()
+
+class Flight:
+    """一次进行中的爬取"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[Dict] = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+        self._partials: List[Dict] = []
+        self._subscribers: List[_Subscriber] = []
+        self._lock = threading.Lock()
+
+    def _deliver(self, subscriber: _Subscriber):
+        """按顺序补齐该订阅者尚未收到的部分结果（在 Flight 锁之外回调，慢订阅者不阻塞其他订阅者登记）"""
+        with subscriber.lock:
+            while subscriber.sent < len(self._partials):
+                item = self._partials[subscriber.sent]
+                subscriber.sent += 1
+                subscriber.callback(item)
+
+    def publish(self, item: Dict):
+        """记录一条部分结果并转发给所有订阅者"""
+        with self._lock:
+            self._partials.append(item)
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            self._deliver(subscriber)
+
+    def subscribe(self, callback: PartialCallback):
+        """补发已有的部分结果，之后的部分结果实时转发"""
+        subscriber = _Subscriber(callback)
+        with self._lock:
+            self._subscribers.append(subscriber)
+        self._deliver(subscriber)
+
+class SingleFlight:
+    """按键合并并发的相同请求"""
+
+    def __init__(self):
+        self._flights: Dict[str, Flight] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, func: Callable[[PartialCallback], Dict],
+           on_partial: Optional[PartialCallback] = None) -> Tuple[Dict, bool]:
+        """执行 func(publish)，已有相同键的请求在进行时等待其结果
+
+        Args:
+            key: 请求键
+            func: 实际爬取函数，参数为部分结果的发布函数
+            on_partial: 可选回调，接收部分结果
+
+        Returns:
+            (结果, 是否与其他请求共享)；共享的结果各自是副本，调用方可以修改
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Flight()
+            else:
+                flight.waiters += 1
+
+        # 已登记的 flight 在结束前会保留所有部分结果，订阅时补发，不会漏掉
+        if on_partial:
+            flight.subscribe(on_partial)
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result), True
+
+        try:
+            flight.result = func(flight.publish)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                shared = flight.waiters > 0
+            flight.done.set()
+        # 其他请求正在复制同一个结果，发起者也返回副本，避免调用方修改时被复制到一半
+        if shared:
+            return copy.deepcopy(flight.result), True
+        return flight.result, False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {key: flight.waiters for key, flight in self._flights.items()}
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+data/*.json 快照读写
+写入：紧凑序列化 -> 同目录临时文件 -> fsync -> os.replace 原子替换，
+读者（包括Next.js）要么读到旧文件，要么读到完整的新文件，不会读到写了一半的内容
+读取：按 (mtime, 大小) 作为版本号缓存解析结果，快照未变化时不重复解析
+"""
+
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from json_codec import dumps_bytes, loads
+
+def snapshot_version(path: str) -> Optional[str]:
+    """快照版本号：mtime纳秒-文件大小，文件不存在时返回None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return f'{stat.st_mtime_ns}-{stat.st_size}'
+
+def write_snapshot(path: str, data: Any) -> Dict[str, Any]:
+    """原子写入快照，返回 {'path', 'version', 'bytes'}"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    payload = dumps_bytes(data)
+
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    return {'path': path, 'version': snapshot_version(path), 'bytes': len(payload)}
+
+_cache: Dict[str, Tuple[str, Any]] = {}
+_cache_lock = threading.Lock()
+
+def read_snapshot(path: str, default: Any = None) -> Any:
+    """读取快照，版本未变化时直接返回上次的解析结果（调用方不应修改返回值）"""
+    version = snapshot_version(path)
+    if version is None:
+        return default
+
+    key = os.path.abspath(path)
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached and cached[0] == version:
+        return cached[1]
+
+    try:
+        with open(path, 'rb') as f:
+            data = loads(f.read())
+    except (OSError, ValueError):
+        return default
+
+    with _cache_lock:
+        _cache[key] = (version, data)
+    return data
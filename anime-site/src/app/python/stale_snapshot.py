@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+樱花动漫首页快照的 stale-while-revalidate 读取
+最新更新、每周更新这类首页数据以 data/*.json 快照保存，请求时：
+    快照年龄 < 软TTL            直接返回快照
+    软TTL <= 年龄 < 硬TTL        立即返回快照，同时在后台刷新（同一时间只有一个后台刷新）
+    年龄 >= 硬TTL 或没有快照     等待刷新完成；刷新失败但有旧快照时仍返回旧快照
+页面响应时间因此与源站响应时间解耦，只有快照过旧时才需要等待源站。
+快照年龄按文件修改时间和本进程最近一次成功刷新（包括首页未变化的条件请求）中较晚的一个计算。
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from single_flight import SingleFlight
+from snapshot import read_snapshot
+
+class StaleSnapshot:
+    """一个快照文件的 stale-while-revalidate 读取"""
+
+    def __init__(self, path: str, soft_ttl: float, hard_ttl: float, flights: SingleFlight,
+                 load: Optional[Callable[[], Optional[Dict]]] = None):
+        """
+        Args:
+            path: 快照文件路径
+            soft_ttl: 超过后返回快照并在后台刷新(秒)
+            hard_ttl: 超过后等待刷新完成(秒)
+            flights: 请求合并，后台刷新与同键的前台爬取共用一次请求
+            load: 读取快照并转换为响应字典，默认直接读取快照
+        """
+        self.path = path
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = max(hard_ttl, soft_ttl)
+        self.flights = flights
+        self.load = load or (lambda: read_snapshot(path))
+        # 单次命令行调用退出时后台线程会丢失，只在常驻模式下后台刷新
+        self.background = False
+        self._validated_at = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def age(self) -> Optional[float]:
+        """快照年龄(秒)，没有快照时返回None"""
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return None
+        return max(0.0, time.time() - max(mtime, self._validated_at))
+
+    def mark_validated(self):
+        """快照已由其他途径刷新或确认未变化"""
+        self._validated_at = time.time()
+
+    def _refresh(self, key: str, refresh: Callable[[], Dict]) -> Dict:
+        result, _ = self.flights.do(key, lambda publish: refresh())
+        if result.get('success'):
+            self.mark_validated()
+        return result
+
+    def _refresh_in_background(self, key: str, refresh: Callable[[], Dict]):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                result = self._refresh(key, refresh)
+                if not result.get('success'):
+                    print(f"后台刷新快照失败: {result.get('error')}")
+            except Exception as e:
+                print(f"后台刷新快照失败: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, name='snapshot-revalidate', daemon=True).start()
+
+    def get(self, key: str, refresh: Callable[[], Dict],
+            usable: Optional[Callable[[Dict], bool]] = None) -> Dict:
+        """按快照年龄返回快照或刷新结果
+
+        Args:
+            key: 刷新的请求合并键
+            refresh: 刷新函数，返回响应字典，成功时应已写入新快照
+            usable: 可选，判断快照能否满足本次请求，不满足时按没有快照处理
+
+        Returns:
+            响应字典，附带 cache_status（fresh / stale / refreshed）和 age_seconds
+        """
+        snapshot = self.load()
+        age = self.age()
+        if snapshot is not None and usable is not None and not usable(snapshot):
+            snapshot = None
+
+        if snapshot is None or age is None or age >= self.hard_ttl or (age >= self.soft_ttl and not self.background):
+            result = self._refresh(key, refresh)
+            if result.get('success'):
+                return {**result, 'cache_status': 'refreshed', 'age_seconds': 0}
+            if snapshot is None:
+                return result
+            # 源站不可用时宁可返回旧数据
+            return {**snapshot, 'cache_status': 'stale', 'age_seconds': round(age),
+                    'refresh_error': result.get('error')}
+
+        if age >= self.soft_ttl:
+            self._refresh_in_background(key, refresh)
+            return {**snapshot, 'cache_status': 'stale', 'age_seconds': round(age)}
+        return {**snapshot, 'cache_status': 'fresh', 'age_seconds': round(age)}
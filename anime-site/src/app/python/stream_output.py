@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+樱花动漫爬虫流式输出
+命令行 --stream 模式下每提取到一条结果立即输出一行紧凑JSON，最后输出一行汇总：
+    {"type": "item", "data": {...}}
+    {"type": "summary", "data": {...}}
+"""
+
+import sys
+import threading
+from typing import Dict, List, Optional, TextIO
+
+from json_codec import dumps
+
+# 各爬虫类型响应中的结果列表字段
+ITEM_KEYS = {
+    'search': 'data',
+    'all_anime': 'data',
+    'latest': 'data',
+    'episodes': 'episodes',
+    'video_batch': 'data',
+}
+
+_write_lock = threading.Lock()
+
+def emit_record(record_type: str, data: Dict, out: Optional[TextIO] = None):
+    """写出一行记录并立即刷新（多线程回调时加锁保证整行写出）"""
+    out = out or sys.stdout
+    line = dumps({'type': record_type, 'data': data})
+    with _write_lock:
+        out.write(line + '\n')
+        out.flush()
+
+def result_items(crawler_type: str, result: Dict) -> List[Dict]:
+    """取出响应中的结果列表，不支持流式的类型返回空列表"""
+    key = ITEM_KEYS.get(crawler_type)
+    items = result.get(key) if key else None
+    return items if isinstance(items, list) else []
+
+def summarize(crawler_type: str, result: Dict) -> Dict:
+    """去掉结果列表（已逐条输出），只保留汇总字段"""
+    key = ITEM_KEYS.get(crawler_type)
+    if not key or not isinstance(result.get(key), list):
+        return result
+    summary = {k: v for k, v in result.items() if k != key}
+    summary['streamed'] = len(result[key])
+    return summary
@@ -53,7 +53,7 @@ export function DailyAnimeSidebar({ className }: DailyAnimeSidebarProps) {
 
   const loadDailyUpdates = async () => {
     try {
-      const response = await fetch('/crawler_daily_update.json')
+      const response = await fetch('/api/weekly-update')
       if (!response.ok) {
         throw new Error('无法加载数据')
       }
@@ -1,7 +1,7 @@
 import Image from 'next/image';
 import Link from 'next/link';
-import fs from 'fs';
 import path from 'path';
+import { readSnapshot } from '@/lib/snapshot';
 
 interface AnimeCard {
   id: string;
@@ -26,10 +26,9 @@ interface CrawlerData {
 async function getLatestAnimeData(): Promise<AnimeCard[]> {
   try {
     const dataPath = path.join(process.cwd(), 'data', 'latest_updates.json');
-    const fileContents = fs.readFileSync(dataPath, 'utf8');
-    const data: CrawlerData = JSON.parse(fileContents);
+    const data = readSnapshot<CrawlerData>(dataPath);
     
-    if (!data.success || !data.data) {
+    if (!data || !data.success || !data.data) {
       throw new Error('Invalid data format');
     }
 
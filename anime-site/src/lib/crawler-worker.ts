@@ -0,0 +1,193 @@
+import { spawn, ChildProcessWithoutNullStreams } from 'child_process';
+import path from 'path';
+
+// 常驻Python爬虫进程（crawler_manager.py --serve）
+// 进程只启动一次，之后每个请求只需通过stdin写入一行JSON，
+// 避免每次HTTP请求都重新启动解释器并导入requests/bs4/lxml
+
+export type CrawlerType = 'search' | 'all_anime' | 'episodes' | 'latest' | 'weekly' | 'video' | 'video_batch'
+  | 'catalogue_sync' | 'catalogue' | 'deep_crawl';
+
+// eslint-disable-next-line @typescript-eslint/no-explicit-any
+export type CrawlerResult = Record<string, any>;
+
+interface PendingRequest {
+  resolve: (result: CrawlerResult) => void;
+  reject: (error: Error) => void;
+  onPartial?: (item: CrawlerResult) => void;
+  timer: NodeJS.Timeout;
+}
+
+// 流式请求在最终的result之前会先收到若干条partial（每条一个结果）
+interface WorkerResponse {
+  id: number | null;
+  result?: CrawlerResult;
+  partial?: CrawlerResult;
+}
+
+const DEFAULT_TIMEOUT = 60000;
+const WORKER_CONCURRENCY = process.env.CRAWLER_WORKER_CONCURRENCY || '4';
+
+class CrawlerWorker {
+  private process: ChildProcessWithoutNullStreams | null = null;
+  private pending = new Map<number, PendingRequest>();
+  // 进行中的非流式请求，相同类型、参数和超时的并发调用共用一个Promise
+  private inFlight = new Map<string, Promise<CrawlerResult>>();
+  private nextId = 1;
+  private buffer = '';
+
+  private start(): ChildProcessWithoutNullStreams {
+    const pythonDir = path.join(process.cwd(), 'src', 'app', 'python');
+    const pythonExecutable = process.platform === 'win32' ? 'python' : 'python3';
+
+    const child = spawn(
+      pythonExecutable,
+      ['-X', 'utf8', path.join(pythonDir, 'crawler_manager.py'), '--serve', WORKER_CONCURRENCY],
+      {
+        cwd: pythonDir,
+        env: { ...process.env, PYTHONIOENCODING: 'utf-8' }
+      }
+    );
+
+    child.stdout.setEncoding('utf8');
+    child.stdout.on('data', (chunk: string) => this.onData(chunk));
+
+    child.stderr.setEncoding('utf8');
+    child.stderr.on('data', (chunk: string) => {
+      console.error('[crawler-worker]', chunk.trimEnd());
+    });
+
+    child.stdin.on('error', (error) => {
+      console.error('[crawler-worker] 写入请求失败:', error.message);
+    });
+
+    child.on('exit', (code) => {
+      if (this.process === child) {
+        this.process = null;
+        this.buffer = '';
+        this.failAll(new Error(`爬虫进程已退出 (code ${code})`));
+      }
+    });
+
+    child.on('error', (error) => {
+      if (this.process === child) {
+        this.process = null;
+        this.buffer = '';
+        this.failAll(error);
+      }
+    });
+
+    return child;
+  }
+
+  private onData(chunk: string) {
+    this.buffer += chunk;
+
+    let newlineIndex = this.buffer.indexOf('\n');
+    while (newlineIndex !== -1) {
+      const line = this.buffer.slice(0, newlineIndex).trim();
+      this.buffer = this.buffer.slice(newlineIndex + 1);
+      if (line) {
+        this.onLine(line);
+      }
+      newlineIndex = this.buffer.indexOf('\n');
+    }
+  }
+
+  private onLine(line: string) {
+    let response: WorkerResponse;
+    try {
+      response = JSON.parse(line);
+    } catch {
+      console.error('[crawler-worker] 无法解析的输出:', line);
+      return;
+    }
+
+    if (response.id === null || !this.pending.has(response.id)) {
+      return;
+    }
+
+    const request = this.pending.get(response.id)!;
+    if (response.partial !== undefined) {
+      // 调用方回调的异常不能影响同一数据块中其他请求的处理
+      try {
+        request.onPartial?.(response.partial);
+      } catch (error) {
+        console.error('[crawler-worker] onPartial回调出错:', error);
+      }
+      return;
+    }
+
+    this.pending.delete(response.id);
+    clearTimeout(request.timer);
+    request.resolve(response.result ?? {});
+  }
+
+  private failAll(error: Error) {
+    for (const request of this.pending.values()) {
+      clearTimeout(request.timer);
+      request.reject(error);
+    }
+    this.pending.clear();
+  }
+
+  // 向常驻进程发送一次爬虫请求，onPartial在最终结果之前接收逐条返回的部分结果
+  // 非流式请求在Node侧合并，流式请求由Python侧合并（后加入的请求会先补发已有的部分结果）
+  run(
+    type: CrawlerType,
+    params: Record<string, unknown> = {},
+    timeout = DEFAULT_TIMEOUT,
+    onPartial?: (item: CrawlerResult) => void
+  ): Promise<CrawlerResult> {
+    if (onPartial) {
+      return this.send(type, params, timeout, onPartial);
+    }
+
+    // 超时不同的调用各自发送（Python侧仍会合并为一次爬取），避免按先到调用方的超时提前失败或等得更久
+    const key = `${type}:${timeout}:${JSON.stringify(params)}`;
+    const existing = this.inFlight.get(key);
+    if (existing) {
+      return existing;
+    }
+
+    const promise = this.send(type, params, timeout).finally(() => {
+      this.inFlight.delete(key);
+    });
+    this.inFlight.set(key, promise);
+    return promise;
+  }
+
+  private send(
+    type: CrawlerType,
+    params: Record<string, unknown>,
+    timeout: number,
+    onPartial?: (item: CrawlerResult) => void
+  ): Promise<CrawlerResult> {
+    if (!this.process) {
+      this.process = this.start();
+    }
+
+    const child = this.process;
+    const id = this.nextId++;
+
+    return new Promise((resolve, reject) => {
+      const timer = setTimeout(() => {
+        this.pending.delete(id);
+        reject(new Error(`爬虫请求超时 (${type})`));
+      }, timeout);
+
+      this.pending.set(id, { resolve, reject, onPartial, timer });
+      // 传入onPartial时请求流式输出，最终result只包含汇总字段
+      child.stdin.write(JSON.stringify({ id, type, params, stream: Boolean(onPartial) }) + '\n');
+    });
+  }
+}
+
+// 在开发模式热更新时复用同一个进程
+const globalForWorker = globalThis as unknown as { crawlerWorker?: CrawlerWorker };
+
+export const crawlerWorker = globalForWorker.crawlerWorker ?? new CrawlerWorker();
+
+if (process.env.NODE_ENV !== 'production') {
+  globalForWorker.crawlerWorker = crawlerWorker;
+}
@@ -0,0 +1,38 @@
+import fs from 'fs';
+
+// 读取Python爬虫原子写入的 data/*.json 快照
+// 以 mtime-大小 作为版本号缓存解析结果，快照未变化时不重复解析
+
+interface CachedSnapshot {
+  version: string;
+  data: unknown;
+}
+
+const cache = new Map<string, CachedSnapshot>();
+
+export function snapshotVersion(filePath: string): string | null {
+  try {
+    const stat = fs.statSync(filePath, { bigint: true });
+    return `${stat.mtimeNs}-${stat.size}`;
+  } catch {
+    return null;
+  }
+}
+
+// 返回值为共享缓存，调用方不应修改
+export function readSnapshot<T>(filePath: string): T | null {
+  const version = snapshotVersion(filePath);
+  if (version === null) {
+    cache.delete(filePath);
+    return null;
+  }
+
+  const cached = cache.get(filePath);
+  if (cached && cached.version === version) {
+    return cached.data as T;
+  }
+
+  const data = JSON.parse(fs.readFileSync(filePath, 'utf8')) as T;
+  cache.set(filePath, { version, data });
+  return data;
+}
@@ -0,0 +1,20 @@
+// 由爬虫返回的视频基础路径拼接最终的播放地址
+
+export interface PlayUrl {
+  videoUrl: string;
+  episode: string;
+}
+
+// pageUrl形如 http://www.iyinghua.com/v/6594-3.html，集数取自URL
+export function buildPlayUrl(baseUrl: string, pageUrl: string): PlayUrl {
+  const episodeMatch = pageUrl.match(/\/v\/(\d+)-(\d+)\.html/);
+  const episodeNum = episodeMatch ? parseInt(episodeMatch[2]) : 1;
+
+  // 格式化为两位数，如01, 02, 12等
+  const episode = episodeNum.toString().padStart(2, '0');
+
+  return {
+    videoUrl: `https://tup.iyinghua.com/?vid=${baseUrl}/第${episode}集/index.m3u8$mp4`,
+    episode
+  };
+}
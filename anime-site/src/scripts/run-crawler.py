@@ -7,12 +7,14 @@
 
 import sys
 import os
-import json
 import subprocess
 from pathlib import Path
 
 # 添加爬虫脚本路径
 sys.path.append(str(Path(__file__).parent.parent.parent))
+sys.path.append(str(Path(__file__).parent.parent / "app" / "python"))
+
+from json_codec import loads, print_json
 
 def run_latest_update_crawler():
     """运行最新更新爬虫"""
@@ -48,8 +50,8 @@ def run_latest_update_crawler():
         
         # 读取最新生成的文件
         latest_file = max(json_files, key=lambda x: x.stat().st_mtime)
-        with open(latest_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(latest_file, 'rb') as f:
+            data = loads(f.read())
         
         return data
         
@@ -62,10 +64,10 @@ def run_latest_update_crawler():
 def main():
     """主函数 - 处理命令行参数"""
     if len(sys.argv) < 2:
-        print(json.dumps({
+        print_json({
             "success": False,
             "error": "请指定爬虫类型: latest_update, search, complete_list, episodes, video_parser"
-        }))
+        })
         return
     
     crawler_type = sys.argv[1]
@@ -87,7 +89,7 @@ def main():
     else:
         result = {"success": False, "error": f"未知的爬虫类型: {crawler_type}"}
     
-    print(json.dumps(result, ensure_ascii=False))
+    print_json(result)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
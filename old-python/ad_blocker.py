@@ -8,22 +8,26 @@
 import requests
 import re
 import json
-import time
 from urllib.parse import urljoin, urlparse
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException
 from bs4 import BeautifulSoup
 
+from driver_pool import get_pool
+from page_ready import wait_for_video
+
+# 广告拦截浏览器额外的启动参数
+AD_BLOCK_ARGUMENTS = ('--disable-extensions-except', '--disable-extensions', '--disable-plugins')
+
 class YinghuaAdBlocker:
     """樱花动漫广告拦截器"""
     
     def __init__(self, headless=True):
         self.headless = headless
         self.driver = None
+        self._lease = None
         self.ad_patterns = [
             # 你提供的具体广告格式
             {
@@ -49,35 +53,22 @@ class YinghuaAdBlocker:
         ]
     
     def init_driver(self):
-        """初始化浏览器驱动"""
+        """从驱动池借出浏览器"""
         try:
-            from webdriver_manager.chrome import ChromeDriverManager
-            from selenium.webdriver.chrome.service import Service
-            
-            chrome_options = Options()
-            if self.headless:
-                chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1920,1080')
-            chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            
-            # 添加广告拦截功能
-            chrome_options.add_argument('--disable-extensions-except')
-            chrome_options.add_argument('--disable-extensions')
-            chrome_options.add_argument('--disable-plugins')
-            
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            self._lease = get_pool(self.headless, AD_BLOCK_ARGUMENTS).acquire()
+            self.driver = self._lease.driver
             return True
         except Exception as e:
             print(f"初始化驱动失败: {e}")
             return False
     
+    def release_driver(self):
+        """将浏览器归还驱动池"""
+        if self._lease:
+            get_pool(self.headless, AD_BLOCK_ARGUMENTS).release(self._lease)
+        self._lease = None
+        self.driver = None
+    
     def block_specific_ads(self):
         """拦截你提供的具体广告"""
         
@@ -146,8 +137,8 @@ class YinghuaAdBlocker:
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
             )
             
-            # 等待视频加载
-            time.sleep(3)
+            # 等待视频地址出现，出现即返回
+            wait_for_video(self.driver)
             
             # 执行广告拦截
             self.block_specific_ads()
@@ -174,8 +165,7 @@ class YinghuaAdBlocker:
                 'clean_m3u8': None
             }
         finally:
-            if self.driver:
-                self.driver.quit()
+            self.release_driver()
     
     def _extract_pure_m3u8(self, page_source):
         """从清理后的页面提取纯净m3u8"""
@@ -8,7 +8,6 @@
 import requests
 import re
 import json
-import time
 from urllib.parse import urljoin, urlparse, parse_qs
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -20,6 +19,8 @@ from bs4 import BeautifulSoup
 import subprocess
 import os
 
+from page_ready import wait_for_video
+
 class AdFreeVideoExtractor:
     """无广告视频链接提取器"""
     
@@ -107,11 +108,11 @@ class AdFreeVideoExtractor:
                 try:
                     script = f"""
                     var elements = document.querySelectorAll('*');
-                    for (var i = 0; i < elements.length; i++) {
-                        if (elements[i].outerHTML && elements[i].outerHTML.includes('{pattern}')) {
+                    for (var i = 0; i < elements.length; i++) {{
+                        if (elements[i].outerHTML && elements[i].outerHTML.includes('{pattern}')) {{
                             elements[i].remove();
-                        }
-                    }
+                        }}
+                    }}
                     """
                     self.driver.execute_script(script)
                 except:
@@ -152,8 +153,8 @@ class AdFreeVideoExtractor:
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
             )
             
-            # 等待视频元素加载
-            time.sleep(3)
+            # 等待视频地址出现，出现即返回
+            wait_for_video(self.driver)
             
             # 移除广告
             self.remove_ads_from_page()
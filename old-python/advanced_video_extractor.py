@@ -12,13 +12,14 @@ import base64
 import time
 import hashlib
 from urllib.parse import urljoin, urlparse, parse_qs
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException
 from bs4 import BeautifulSoup
+
+from driver_pool import get_pool
+from page_ready import wait_for_video
 import subprocess
 import os
 
@@ -28,6 +29,7 @@ class AdvancedYinghuaExtractor:
     def __init__(self, headless=True):
         self.headless = headless
         self.driver = None
+        self._lease = None
         self.session = requests.Session()
         
         # 设置请求头
@@ -42,30 +44,22 @@ class AdvancedYinghuaExtractor:
         })
     
     def init_driver(self):
-        """初始化浏览器驱动"""
+        """从驱动池借出浏览器"""
         try:
-            from webdriver_manager.chrome import ChromeDriverManager
-            from selenium.webdriver.chrome.service import Service
-            
-            chrome_options = Options()
-            if self.headless:
-                chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1920,1080')
-            chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            self._lease = get_pool(self.headless).acquire()
+            self.driver = self._lease.driver
             return True
         except Exception as e:
             print(f"初始化驱动失败: {e}")
             return False
     
+    def release_driver(self):
+        """将浏览器归还驱动池"""
+        if self._lease:
+            get_pool(self.headless).release(self._lease)
+        self._lease = None
+        self.driver = None
+    
     def extract_real_video_links(self, page_url):
         """
         提取真实视频链接（包括加密源）
@@ -88,8 +82,8 @@ class AdvancedYinghuaExtractor:
                 EC.presence_of_element_located((By.TAG_NAME, "video"))
             )
             
-            # 等待额外时间让动态内容加载
-            time.sleep(3)
+            # 等待视频地址出现，出现即返回
+            wait_for_video(self.driver)
             
             # 获取页面源代码
             page_source = self.driver.page_source
@@ -123,8 +117,7 @@ class AdvancedYinghuaExtractor:
                 'sources': []
             }
         finally:
-            if self.driver:
-                self.driver.quit()
+            self.release_driver()
     
     def _extract_video_data(self, page_url):
         """提取视频元数据"""
@@ -404,7 +397,9 @@ class AdvancedYinghuaExtractor:
                 return info
             
             self.driver.get(anime_url)
-            time.sleep(3)
+            WebDriverWait(self.driver, 15).until(
+                lambda driver: driver.execute_script("return document.readyState") == "complete"
+            )
             
             soup = BeautifulSoup(self.driver.page_source, 'html.parser')
             
@@ -436,8 +431,7 @@ class AdvancedYinghuaExtractor:
         except Exception as e:
             print(f"提取系列信息失败: {e}")
         finally:
-            if self.driver:
-                self.driver.quit()
+            self.release_driver()
         
         return info
 
@@ -9,22 +9,21 @@
 import requests
 import re
 import json
-import time
 import os
 from urllib.parse import urljoin, urlparse
-from selenium import webdriver
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
 from bs4 import BeautifulSoup
 
+from driver_pool import get_pool
+from page_ready import wait_for_video
+
 class CleanVideoExtractor:
     """樱花动漫纯净视频提取器"""
     
     def __init__(self, headless=True):
         self.headless = headless
         self.driver = None
+        self._lease = None
         self.session = requests.Session()
         
         # 设置请求头
@@ -58,30 +57,22 @@ class CleanVideoExtractor:
         }
     
     def init_driver(self):
-        """初始化浏览器驱动"""
+        """从驱动池借出浏览器"""
         try:
-            from webdriver_manager.chrome import ChromeDriverManager
-            from selenium.webdriver.chrome.service import Service
-            
-            chrome_options = Options()
-            if self.headless:
-                chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1920,1080')
-            chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            self._lease = get_pool(self.headless).acquire()
+            self.driver = self._lease.driver
             return True
         except Exception as e:
             print(f"初始化驱动失败: {e}")
             return False
     
+    def release_driver(self):
+        """将浏览器归还驱动池"""
+        if self._lease:
+            get_pool(self.headless).release(self._lease)
+        self._lease = None
+        self.driver = None
+    
     def remove_specific_ads(self):
         """移除你提供的具体广告"""
         
@@ -166,16 +157,8 @@ class CleanVideoExtractor:
                 lambda driver: driver.execute_script("return document.readyState") == "complete"
             )
             
-            # 等待视频元素
-            try:
-                WebDriverWait(self.driver, 15).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "video"))
-                )
-            except:
-                pass
-            
-            # 等待额外时间确保动态内容加载
-            time.sleep(5)
+            # 等待视频地址出现，出现即返回
+            wait_for_video(self.driver)
             
             # 执行广告移除
             self.remove_specific_ads()
@@ -205,8 +188,7 @@ class CleanVideoExtractor:
                 'pure_m3u8': []
             }
         finally:
-            if self.driver:
-                self.driver.quit()
+            self.release_driver()
     
     def _extract_clean_m3u8_links(self, page_source):
         """从清理后的页面提取m3u8链接"""
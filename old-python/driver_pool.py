@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Selenium浏览器驱动池
+预先启动固定数量的无头Chrome并复用，避免每次解析都执行
+ChromeDriverManager().install() 和启动浏览器（通常需要数秒）
+
+- 借出前做健康检查，已崩溃的浏览器自动替换
+- 每个浏览器处理 max_pages 个页面后回收重建，防止内存持续增长
+- 池满时借出请求最多等待 checkout_timeout 秒，浏览器归还或被回收（释放名额）时立即唤醒，
+  超时抛出 DriverPoolTimeout
+
+用法:
+    from driver_pool import get_pool
+
+    with get_pool().driver() as driver:
+        driver.get(page_url)
+        html = driver.page_source
+"""
+
+import atexit
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+# 可通过环境变量调整
+POOL_SIZE = int(os.getenv('DRIVER_POOL_SIZE', '2'))
+MAX_PAGES = int(os.getenv('DRIVER_MAX_PAGES', '50'))
+CHECKOUT_TIMEOUT = float(os.getenv('DRIVER_CHECKOUT_TIMEOUT', '30'))
+
+class DriverPoolTimeout(Exception):
+    """等待可用浏览器超时"""
+
+@lru_cache(maxsize=1)
+def _chromedriver_path():
+    """chromedriver路径只解析一次（install()每次都会检查版本）"""
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+def create_driver(headless=True, extra_arguments=()):
+    """启动一个配置好的Chrome浏览器"""
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--window-size=1920,1080')
+    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    for argument in extra_arguments:
+        chrome_options.add_argument(argument)
+
+    service = Service(_chromedriver_path())
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    return driver
+
+class _PooledDriver:
+    """池中的浏览器及其使用计数"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.created_at = time.time()
+
+class DriverPool:
+    """有上限的浏览器驱动池"""
+
+    def __init__(self, size=POOL_SIZE, max_pages=MAX_PAGES, checkout_timeout=CHECKOUT_TIMEOUT,
+                 headless=True, extra_arguments=()):
+        self.size = size
+        self.max_pages = max_pages
+        self.checkout_timeout = checkout_timeout
+        self.headless = headless
+        self.extra_arguments = tuple(extra_arguments)
+
+        # 空闲浏览器（后进先出）；归还浏览器或释放名额时通知等待者
+        self._idle = []
+        self._available = threading.Condition()
+        self._created = 0
+        self._closed = False
+
+    def warm_up(self, count=None):
+        """预先启动浏览器，默认填满整个池"""
+        count = self.size if count is None else min(count, self.size)
+        started = 0
+        while started < count:
+            entry = self._launch()
+            if entry is None:
+                break
+            self._put_idle(entry)
+            started += 1
+        return started
+
+    def _reserve(self):
+        """占用一个启动名额，调用方需持有锁"""
+        if self._closed or self._created >= self.size:
+            return False
+        self._created += 1
+        return True
+
+    def _start(self):
+        """在已占用的名额上启动浏览器，失败时释放名额"""
+        try:
+            return _PooledDriver(create_driver(self.headless, self.extra_arguments))
+        except Exception:
+            self._release_slot()
+            raise
+
+    def _launch(self):
+        """在未达上限时启动一个新浏览器，达到上限返回None"""
+        with self._available:
+            if not self._reserve():
+                return None
+        return self._start()
+
+    def _release_slot(self):
+        with self._available:
+            self._created -= 1
+            self._available.notify()
+
+    def _put_idle(self, entry):
+        with self._available:
+            self._idle.append(entry)
+            self._available.notify()
+
+    def _discard(self, entry):
+        """关闭浏览器并释放名额（唤醒一个等待者去启动新浏览器）"""
+        try:
+            entry.driver.quit()
+        except Exception:
+            pass
+        self._release_slot()
+
+    @staticmethod
+    def _is_healthy(entry):
+        """浏览器进程和会话是否仍然可用"""
+        try:
+            entry.driver.execute_script('return 1')
+            return True
+        except Exception:
+            return False
+
+    def acquire(self, timeout=None):
+        """借出一个健康的浏览器
+
+        Raises:
+            DriverPoolTimeout: 超过等待时间仍没有可用浏览器
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            with self._available:
+                while True:
+                    if self._idle:
+                        entry = self._idle.pop()
+                        break
+                    if self._reserve():
+                        entry = None
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise DriverPoolTimeout(f"等待浏览器超时 ({timeout}秒)")
+                    self._available.wait(remaining)
+
+            if entry is None:
+                return self._start()
+            if self._is_healthy(entry):
+                return entry
+            self._discard(entry)
+
+    def release(self, entry, discard=False):
+        """归还浏览器，达到页面上限或池已关闭时回收"""
+        entry.pages += 1
+        if discard or self._closed or entry.pages >= self.max_pages:
+            self._discard(entry)
+            return
+
+        try:
+            # 清理上一个页面的状态，避免影响下一次解析
+            entry.driver.delete_all_cookies()
+            entry.driver.get('about:blank')
+        except Exception:
+            self._discard(entry)
+            return
+
+        self._put_idle(entry)
+
+    @contextmanager
+    def driver(self, timeout=None):
+        """借出浏览器的上下文管理器，退出时自动归还"""
+        entry = self.acquire(timeout)
+        try:
+            yield entry.driver
+        finally:
+            self.release(entry)
+
+    def stats(self):
+        """池的当前状态"""
+        return {
+            'size': self.size,
+            'created': self._created,
+            'idle': len(self._idle),
+            'max_pages': self.max_pages
+        }
+
+    def close(self):
+        """关闭池中所有空闲浏览器，借出中的浏览器在归还时关闭"""
+        with self._available:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for entry in idle:
+            self._discard(entry)
+
+# 按浏览器配置区分的共享池
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_pool(headless=True, extra_arguments=()):
+    """获取指定浏览器配置的共享驱动池"""
+    key = (headless, tuple(extra_arguments))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = DriverPool(headless=headless, extra_arguments=extra_arguments)
+            _pools[key] = pool
+        return pool
+
+@atexit.register
+def close_all_pools():
+    """进程退出时关闭所有浏览器"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+播放页就绪检测
+代替页面加载后固定的 time.sleep，轮询页面直到能观察到视频地址：
+  1. 播放器容器的 data-vid 属性
+  2. <video> / <source> 元素的 src
+  3. 浏览器已发起的 .m3u8 / .mp4 网络请求（Resource Timing）
+  4. 内联脚本中出现的 m3u8 地址
+任一信号出现立即返回，最长等待 VIDEO_READY_TIMEOUT 秒
+"""
+
+import os
+import time
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+VIDEO_READY_TIMEOUT = float(os.getenv('VIDEO_READY_TIMEOUT', '5'))
+POLL_INTERVAL = 0.2
+
+# 在页面中执行的探测脚本，返回 [信号类型, 地址] 或 null
+_PROBE_SCRIPT = r"""
+var holder = document.querySelector('[data-vid]');
+if (holder && holder.getAttribute('data-vid')) {
+    return ['data-vid', holder.getAttribute('data-vid')];
+}
+var media = document.querySelectorAll('video, video source');
+for (var i = 0; i < media.length; i++) {
+    var src = media[i].currentSrc || media[i].src;
+    if (src && src.indexOf('blob:') !== 0) {
+        return ['video', src];
+    }
+}
+var resources = performance.getEntriesByType('resource');
+for (var j = 0; j < resources.length; j++) {
+    if (/\.(m3u8|mp4)(\?|$)/i.test(resources[j].name)) {
+        return ['network', resources[j].name];
+    }
+}
+var scripts = document.scripts;
+for (var k = 0; k < scripts.length; k++) {
+    var match = scripts[k].text.match(/https?:\/\/[^"'\s]+\.m3u8[^"'\s]*/);
+    if (match) {
+        return ['script', match[0]];
+    }
+}
+return null;
+"""
+
+def _probe(driver):
+    try:
+        return driver.execute_script(_PROBE_SCRIPT)
+    except WebDriverException:
+        # 页面跳转过程中脚本可能执行失败，下次轮询再试
+        return None
+
+def wait_for_video(driver, timeout=None, poll_interval=POLL_INTERVAL):
+    """等待播放页出现视频地址
+
+    Args:
+        driver: 已打开播放页的浏览器
+        timeout: 最长等待秒数，默认 VIDEO_READY_TIMEOUT
+        poll_interval: 轮询间隔(秒)
+
+    Returns:
+        dict: {'ready': 是否检测到, 'signal': 信号类型, 'url': 检测到的地址, 'waited': 等待秒数}
+        超时不抛异常，调用方照常读取 page_source
+    """
+    timeout = VIDEO_READY_TIMEOUT if timeout is None else timeout
+    start = time.monotonic()
+    try:
+        signal, url = WebDriverWait(driver, timeout, poll_frequency=poll_interval).until(_probe)
+    except TimeoutException:
+        return {'ready': False, 'signal': None, 'url': None, 'waited': time.monotonic() - start}
+    return {'ready': True, 'signal': signal, 'url': url, 'waited': time.monotonic() - start}
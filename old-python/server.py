@@ -7,18 +7,14 @@ from flask_cors import CORS
 import requests
 import re
 import json
-import time
 import os
 from urllib.parse import urljoin, urlparse
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+import threading
 import logging
 
+from driver_pool import get_pool
+from video_resolver import VideoResolver
+
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -37,31 +33,13 @@ class SakuraVideoParser:
             'Accept': '*/*',
             'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8'
         })
-
-    def get_driver(self):
-        """获取Selenium驱动"""
-        chrome_options = Options()
-        chrome_options.add_argument('--headless')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--window-size=1920,1080')
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        
-        return driver
+        self.resolver = VideoResolver(self.session)
 
     def parse_video_url(self, page_url):
         """解析樱花动漫页面获取真实视频URL"""
         
         logger.info(f"开始解析页面: {page_url}")
         
-        driver = None
         try:
             # 如果是测试URL，直接返回测试视频
             if 'w3schools.com' in page_url or 'sample-videos.com' in page_url or 'test' in page_url.lower():
@@ -72,45 +50,24 @@ class SakuraVideoParser:
                     'pageUrl': page_url,
                     'title': '测试视频 - 樱花动漫'
                 }
-                
-            driver = self.get_driver()
-            driver.set_page_load_timeout(15)
-            driver.get(page_url)
-            
-            # 等待页面加载
-            WebDriverWait(driver, 15).until(
-                lambda driver: driver.execute_script("return document.readyState") == "complete"
-            )
             
-            # 等待视频元素或播放器
-            try:
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "video"))
-                )
-            except:
-                pass
+            # 先用普通请求解析，失败后才使用驱动池中的浏览器
+            resolved = self.resolver.resolve(page_url)
             
-            # 等待额外时间确保动态内容加载
-            time.sleep(3)
-            
-            # 获取页面源代码
-            page_source = driver.page_source
-            
-            # 提取视频链接
-            video_url = self.extract_video_url(page_source, page_url)
-            
-            if video_url:
-                # 获取总集数信息
-                total_episodes = self.get_total_episodes(page_source)
+            if resolved['success']:
+                logger.info(f"解析成功: {resolved['tier']}级")
+                page_source = resolved['html']
                 
                 return {
                     'success': True,
-                    'videoUrl': video_url,
-                    'totalEpisodes': max(total_episodes, 1),
+                    'videoUrl': self.wrap_video_url(resolved['video_url']),
+                    'totalEpisodes': max(self.get_total_episodes(page_source), 1),
                     'pageUrl': page_url,
-                    'title': self.get_video_title(page_source)
+                    'title': self.get_video_title(page_source),
+                    'tier': resolved['tier']
                 }
             else:
+                logger.warning(f"解析失败: {resolved['error']}")
                 # 如果无法解析，返回测试视频
                 return {
                     'success': True,
@@ -130,9 +87,18 @@ class SakuraVideoParser:
                 'pageUrl': page_url,
                 'title': '测试视频 - 樱花动漫（网络问题，使用测试视频）'
             }
-        finally:
-            if driver:
-                driver.quit()
+
+    def wrap_video_url(self, video_url):
+        """m3u8地址包装为tup播放器地址，已是tup地址的保持不变
+        
+        页面 data-vid 自带 $mp4 播放器类型后缀；浏览器抓到的地址没有后缀时补上，
+        与 src/lib/video-url.ts 的 buildPlayUrl 生成的地址一致
+        """
+        if video_url.startswith('https://tup.iyinghua.com/') or video_url.startswith('http://tup.iyinghua.com/'):
+            return video_url
+        if '$' not in video_url:
+            video_url += '$mp4'
+        return f"https://tup.iyinghua.com/?vid={video_url}"
 
     def extract_video_url(self, html_content, page_url):
         """从HTML内容中提取视频URL - 后端完整处理"""
@@ -296,8 +262,11 @@ def parse_video():
                 'total_episodes': 1
             }), 400
         
-        # 解析视频 - 后端完全处理
-        result = parser.extract_video_url('', url)
+        # 解析视频 - 后端完全处理（静态解析优先，必要时才使用浏览器）
+        resolved = parser.resolver.resolve(url)
+        result = parser.extract_video_url(resolved['html'], url)
+        if resolved['success']:
+            result['video_url'] = parser.wrap_video_url(resolved['video_url'])
         
         if result.get('video_url'):
             return jsonify({
@@ -337,7 +306,9 @@ def health_check():
     """健康检查接口"""
     return jsonify({
         'status': 'ok',
-        'message': '樱花动漫解析服务运行正常'
+        'message': '樱花动漫解析服务运行正常',
+        'driver_pool': get_pool().stats(),
+        'resolver_tiers': parser.resolver.stats()
     })
 
 @app.route('/')
@@ -355,4 +326,8 @@ if __name__ == '__main__':
     print("📍 访问 http://localhost:5000 查看API文档")
     print("📍 前端页面: web_player.html")
     
+    # debug模式下重载器会启动两个进程，只在实际处理请求的子进程中预热浏览器
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        threading.Thread(target=get_pool().warm_up, daemon=True).start()
+    
     app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
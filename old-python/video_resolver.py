@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+樱花动漫视频地址分级解析
+按代价从低到高依次尝试，前一级成功就不再继续：
+  1. static  - 普通GET请求，读取播放器容器的 data-vid 属性（毫秒级）
+  2. script  - 在同一份HTML的内联脚本中正则匹配m3u8地址（不额外请求）
+  3. browser - 从驱动池借出无头Chrome渲染页面后再解析（秒级）
+
+每个站点记录各级的成功次数；某站点连续多次只能靠浏览器解析时，
+直接从浏览器级开始，并定期重新尝试低代价的级别以便站点恢复后及时切回
+"""
+
+import re
+import threading
+from urllib.parse import urlparse
+
+import requests
+from bs4 import BeautifulSoup
+
+TIERS = ('static', 'script', 'browser')
+
+# 连续多少次只能靠浏览器解析后跳过前两级
+BROWSER_ONLY_THRESHOLD = 5
+# 跳过前两级时，每隔多少次仍然先尝试一次前两级
+RECHECK_INTERVAL = 10
+
+_SCRIPT_PATTERNS = [
+    re.compile(r'["\']vid["\']:\s*["\'](https?://[^"\']+\.m3u8[^"\']*)["\']'),
+    re.compile(r'["\'](https?://[^"\']*bf8bf\.com[^"\']*\.m3u8[^"\']*)["\']'),
+    re.compile(r'["\'](https?://[^"\']*\.m3u8[^"\']*)["\']'),
+]
+
+def parse_static(html):
+    """第1级：读取 data-vid 属性（保留 $mp4 之类的播放器类型后缀）"""
+    soup = BeautifulSoup(html, 'html.parser')
+    playbox = soup.find('div', id='playbox')
+    if playbox and playbox.get('data-vid', '').startswith('http'):
+        return playbox['data-vid']
+    for tag in soup.find_all(attrs={'data-vid': True}):
+        if tag['data-vid'].startswith('http'):
+            return tag['data-vid']
+    return None
+
+def parse_script(html):
+    """第2级：在页面脚本中匹配m3u8地址"""
+    for pattern in _SCRIPT_PATTERNS:
+        match = pattern.search(html)
+        if match:
+            return match.group(1)
+    return None
+
+class VideoResolver:
+    """分级视频地址解析器"""
+
+    def __init__(self, session=None, browser_timeout=15):
+        self.session = session or requests.Session()
+        self.browser_timeout = browser_timeout
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _host_stats(self, host):
+        """调用方需持有锁"""
+        if host not in self._stats:
+            self._stats[host] = {
+                'tiers': {tier: 0 for tier in TIERS},
+                'failures': 0,
+                'browser_streak': 0,
+                'skipped_static': 0
+            }
+        return self._stats[host]
+
+    def _skip_static_tiers(self, host):
+        """该站点是否应直接使用浏览器"""
+        with self._lock:
+            stats = self._host_stats(host)
+            if stats['browser_streak'] < BROWSER_ONLY_THRESHOLD:
+                return False
+            stats['skipped_static'] += 1
+            return stats['skipped_static'] % RECHECK_INTERVAL != 0
+
+    def _record(self, host, tier):
+        with self._lock:
+            stats = self._host_stats(host)
+            if tier is None:
+                stats['failures'] += 1
+                return
+            stats['tiers'][tier] += 1
+            if tier == 'browser':
+                stats['browser_streak'] += 1
+            else:
+                stats['browser_streak'] = 0
+                stats['skipped_static'] = 0
+
+    def stats(self):
+        """各站点的分级命中统计"""
+        with self._lock:
+            return {
+                host: {'tiers': dict(stats['tiers']), 'failures': stats['failures'],
+                       'browser_only': stats['browser_streak'] >= BROWSER_ONLY_THRESHOLD}
+                for host, stats in self._stats.items()
+            }
+
+    def _fetch(self, page_url):
+        response = self.session.get(page_url, timeout=10)
+        response.raise_for_status()
+        response.encoding = 'utf-8'
+        return response.text
+
+    def _render(self, page_url):
+        """第3级：用驱动池中的浏览器渲染页面"""
+        # 只有用到浏览器时才导入selenium
+        from driver_pool import get_pool
+        from page_ready import wait_for_video
+
+        with get_pool().driver() as driver:
+            driver.set_page_load_timeout(self.browser_timeout)
+            driver.get(page_url)
+            ready = wait_for_video(driver)
+            return driver.page_source, ready
+
+    def resolve(self, page_url, allow_browser=True):
+        """解析播放页的视频地址
+
+        Args:
+            page_url: 播放页URL
+            allow_browser: 前两级失败时是否使用浏览器
+
+        Returns:
+            dict: {'success', 'video_url', 'tier', 'html', 'page_url', 'error'}
+            html 为最后一次取得的页面内容，供调用方提取标题等信息
+        """
+        host = urlparse(page_url).netloc
+        html = ''
+        error = None
+
+        if not (allow_browser and self._skip_static_tiers(host)):
+            try:
+                html = self._fetch(page_url)
+            except requests.RequestException as e:
+                error = str(e)
+            else:
+                for tier, parse in (('static', parse_static), ('script', parse_script)):
+                    video_url = parse(html)
+                    if video_url:
+                        self._record(host, tier)
+                        return self._result(page_url, video_url, tier, html)
+
+        if allow_browser:
+            try:
+                html, ready = self._render(page_url)
+            except Exception as e:
+                error = str(e)
+            else:
+                video_url = parse_static(html) or parse_script(html) or ready['url']
+                if video_url:
+                    self._record(host, 'browser')
+                    return self._result(page_url, video_url, 'browser', html)
+
+        self._record(host, None)
+        result = self._result(page_url, None, None, html)
+        result['error'] = error or '未找到视频地址'
+        return result
+
+    @staticmethod
+    def _result(page_url, video_url, tier, html):
+        return {
+            'success': bool(video_url),
+            'video_url': video_url,
+            'tier': tier,
+            'html': html,
+            'page_url': page_url,
+            'error': None
+        }
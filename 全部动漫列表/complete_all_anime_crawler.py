@@ -4,14 +4,26 @@
 樱花动漫完整动漫列表爬虫
 爬取 http://m.iyinghua.com/all/ 页面的所有分类动漫数据
 包含A-Z和全部分类，共27个分类
+
+用法:
+    python complete_all_anime_crawler.py                # 完整爬取，生成带时间戳的文件
+    python complete_all_anime_crawler.py --incremental  # 与上次目录对比，只输出新增/变化/删除的条目
 """
 
 import requests
 from bs4 import BeautifulSoup
 import json
+import os
+import sys
 import time
 from urllib.parse import urljoin
 
+# 增量模式下保存的最新目录
+CATALOGUE_FILE = "complete_all_anime_list.json"
+
+# 判断条目是否变化的字段（full_text/raw_html包含序号，排序变化时会误判）
+COMPARE_FIELDS = ('title', 'episode_info', 'episode_url', 'category')
+
 def crawl_complete_all_anime():
     """爬取完整的所有分类动漫列表"""
     base_url = "http://m.iyinghua.com"
@@ -143,6 +155,46 @@ def save_to_json(data, filename="complete_all_anime_list.json"):
     except Exception as e:
         print(f"保存文件时出错: {e}")
 
+def diff_anime_data(previous, current):
+    """按detail_url对比新旧目录，返回新增/变化/删除的条目"""
+    previous_by_url = {anime['detail_url']: anime for anime in previous if anime.get('detail_url')}
+    current_by_url = {anime['detail_url']: anime for anime in current if anime.get('detail_url')}
+    
+    added = [anime for url, anime in current_by_url.items() if url not in previous_by_url]
+    removed = [anime for url, anime in previous_by_url.items() if url not in current_by_url]
+    changed = [
+        anime for url, anime in current_by_url.items()
+        if url in previous_by_url
+        and any(previous_by_url[url].get(field) != anime.get(field) for field in COMPARE_FIELDS)
+    ]
+    
+    return {'added': added, 'changed': changed, 'removed': removed}
+
+def incremental_sync(anime_data):
+    """增量同步：与上次目录对比，只保存变化部分，并更新目录文件"""
+    previous = []
+    if os.path.exists(CATALOGUE_FILE):
+        try:
+            with open(CATALOGUE_FILE, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"读取上次目录失败，按首次同步处理: {e}")
+    
+    delta = diff_anime_data(previous, anime_data)
+    print(f"新增 {len(delta['added'])} 个，变化 {len(delta['changed'])} 个，删除 {len(delta['removed'])} 个")
+    
+    if not any(delta.values()) and previous:
+        print("目录没有变化")
+        return delta
+    
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    with open(f"complete_all_anime_delta_{timestamp}.json", 'w', encoding='utf-8') as f:
+        json.dump(delta, f, ensure_ascii=False, indent=2)
+    print(f"变化已保存到: complete_all_anime_delta_{timestamp}.json")
+    
+    save_to_json(anime_data, CATALOGUE_FILE)
+    return delta
+
 def analyze_data(data):
     """分析数据"""
     if not data:
@@ -176,7 +228,9 @@ def main():
     
     anime_data = crawl_complete_all_anime()
     
-    if anime_data:
+    if anime_data and '--incremental' in sys.argv[1:]:
+        incremental_sync(anime_data)
+    elif anime_data:
         # 保存到JSON文件
         timestamp = time.strftime("%Y%m%d_%H%M%S")
         filename = f"complete_all_anime_list_{timestamp}.json"
@@ -10,6 +10,8 @@ from bs4 import BeautifulSoup
 import json
 import time
 import re
+import os
+import hashlib
 from typing import List, Dict, Optional
 from datetime import datetime
 
@@ -26,6 +28,8 @@ class LatestUpdateCrawler:
             'Upgrade-Insecure-Requests': '1',
         }
         self.latest_updates_selector = "body .area div .img ul li"
+        # 条件请求状态：ETag/Last-Modified/内容哈希以及上次的爬取结果
+        self.state_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.latest_update_state.json')
         
     def fetch_page(self, url: str) -> Optional[str]:
         """获取页面内容"""
@@ -38,6 +42,54 @@ class LatestUpdateCrawler:
             print(f"获取页面失败: {e}")
             return None
     
+    def load_state(self) -> Dict:
+        """读取上次的条件请求状态"""
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def save_state(self, state: Dict) -> None:
+        """保存条件请求状态"""
+        try:
+            with open(self.state_file, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False)
+        except OSError as e:
+            print(f"保存状态失败: {e}")
+    
+    def fetch_page_if_changed(self, url: str, state: Dict) -> Optional[Dict]:
+        """条件请求页面内容
+        
+        Returns:
+            {'changed': bool, 'html': 页面内容, 'etag', 'last_modified', 'content_hash'}，失败返回None
+        """
+        headers = dict(self.headers)
+        if state.get('result'):
+            if state.get('etag'):
+                headers['If-None-Match'] = state['etag']
+            if state.get('last_modified'):
+                headers['If-Modified-Since'] = state['last_modified']
+        
+        try:
+            response = requests.get(url, headers=headers, timeout=10)
+            if response.status_code == 304 and state.get('result'):
+                return {'changed': False, 'html': None}
+            response.raise_for_status()
+            response.encoding = 'utf-8'
+        except requests.RequestException as e:
+            print(f"获取页面失败: {e}")
+            return None
+        
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        return {
+            'changed': not (state.get('result') and state.get('content_hash') == content_hash),
+            'html': response.text,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'content_hash': content_hash
+        }
+    
     def parse_latest_updates(self, html: str) -> List[Dict[str, str]]:
         """解析最新更新内容"""
         soup = BeautifulSoup(html, 'html.parser')
@@ -95,8 +147,9 @@ class LatestUpdateCrawler:
         """爬取最新更新"""
         print("开始爬取樱花动漫最新更新...")
         
-        html = self.fetch_page(self.base_url)
-        if not html:
+        state = self.load_state()
+        page = self.fetch_page_if_changed(self.base_url, state)
+        if not page or (page['changed'] and not page['html']):
             return {
                 'success': False,
                 'error': '无法获取页面内容',
@@ -104,7 +157,14 @@ class LatestUpdateCrawler:
                 'timestamp': datetime.now().isoformat()
             }
         
-        updates = self.parse_latest_updates(html)
+        # 首页未变化（304或内容哈希相同），直接复用上次结果，跳过解析
+        if not page['changed']:
+            print("首页未变化，沿用上次结果")
+            result = dict(state['result'])
+            result['not_modified'] = True
+            return result
+        
+        updates = self.parse_latest_updates(page['html'])
         
         result = {
             'success': True,
@@ -114,6 +174,15 @@ class LatestUpdateCrawler:
             'source_url': self.base_url
         }
         
+        # 没有解析到数据时不保存验证信息，否则下次首页未变化时会一直沿用空结果
+        if updates:
+            self.save_state({
+                'etag': page['etag'],
+                'last_modified': page['last_modified'],
+                'content_hash': page['content_hash'],
+                'result': result
+            })
+
         return result
     
     def save_to_json(self, data: Dict[str, any], filename: str = None) -> str:
@@ -164,8 +233,8 @@ def main():
         # 打印摘要
         crawler.print_summary(result)
         
-        # 保存数据
-        if result['success']:
+        # 保存数据（首页未变化时不重复生成文件）
+        if result['success'] and not result.get('not_modified'):
             crawler.save_to_json(result)
         
         return result